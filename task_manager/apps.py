@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class TaskManagerConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'task_manager'
+
+    def ready(self):
+        from task_manager.signals import (
+            connect_team_cache,
+            connect_usage_counters,
+        )
+        connect_usage_counters()
+        connect_team_cache()
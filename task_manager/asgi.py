@@ -3,6 +3,11 @@ ASGI config for task_manager project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with an ASGI server (e.g. ``uvicorn task_manager.asgi:application``)
+to use live notifications: the Server-Sent Events stream and long poll in
+task_manager.notifications are async views that hold no worker while they
+wait. Enable them with NOTIFICATION_LIVE_UPDATES.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
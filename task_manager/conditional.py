@@ -0,0 +1,119 @@
+"""
+Conditional GET for list pages.
+
+A list page of a team (or of the user's own rows) gets an ETag built
+from a cheap fingerprint of its rows (the row count, latest change and
+counter totals of the whole scope) and from everything else the page
+depends on: the user and their role, the language, the query string,
+the team cache generations (see team_cache.py), the unread notification
+count and the CSRF cookie. A reload that sends the ETag back in
+If-None-Match is then answered with 304 Not Modified before the list is
+queried or rendered.
+
+Pages are marked ``Cache-Control: private, no-cache``: browsers keep
+them but revalidate on every use, the service worker's network-first
+navigations included. Pages with pending flash messages are always
+rendered.
+
+No Last-Modified is sent: the latest change of the rows misses
+deletions, label and executor changes, renames and everything else the
+ETag covers, so If-Modified-Since alone would answer 304 for pages that
+changed.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.middleware.csrf import get_token
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+
+from task_manager.notifications.unread import get_request_unread_count
+from task_manager.team_cache import get_generation, request_scope, user_scope
+
+
+def csrf_secret(request):
+    """
+    The CSRF secret of request, which the tokens of its forms are made
+    from. Taken after get_token(), which makes a secret (and sets the
+    cookie) on the first visit, so the next visit, sending the cookie,
+    gets the same secret.
+    """
+    get_token(request)
+    return request.META['CSRF_COOKIE']
+
+
+class ConditionalListMixin:
+    """
+    Answer conditional GETs of a list view with 304 when its validators
+    match. Views set owner_field, the field holding the owner of rows
+    outside a team, modified_field, a timestamp bumped on every change
+    of a row (None if there is none), and counter_fields, counters shown
+    in the list that change without bumping modified_field.
+    """
+    owner_field = None
+    modified_field = None
+    counter_fields = ()
+
+    def get_scope_queryset(self):
+        """All rows of the active team, or the user's own rows."""
+        team = getattr(self.request, 'active_team', None)
+        if team:
+            return self.model.objects.filter(team=team)
+        return self.model.objects.filter(**{
+            self.owner_field: self.request.user,
+            'team__isnull': True,
+        })
+
+    def get_fingerprint(self):
+        """
+        Row count, latest change (last, if there is a modified_field) and
+        counter totals of the scope, in one aggregate query.
+        """
+        aggregates = {'count': Count('pk')}
+        if self.modified_field:
+            aggregates['last'] = Max(self.modified_field)
+        for field in self.counter_fields:
+            aggregates[field] = Sum(field)
+        return self.get_scope_queryset().order_by().aggregate(**aggregates)
+
+    def get_validator_parts(self):
+        """What the page depends on besides its rows."""
+        request = self.request
+        scope = request_scope(request)
+        return [
+            settings.VERSION,
+            request.user.pk,
+            getattr(request, 'active_team_role', None),
+            get_language(),
+            sorted(request.GET.lists()),
+            scope,
+            get_generation(scope),
+            get_generation(user_scope(request.user.pk)),
+            get_request_unread_count(request),
+            csrf_secret(request),
+        ]
+
+    def get_etag(self):
+        """ETag of the page."""
+        parts = [
+            sorted(self.get_fingerprint().items()),
+            *self.get_validator_parts(),
+        ]
+        digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+        return quote_etag(digest)
+
+    def get(self, request, *args, **kwargs):
+        if get_messages(request):
+            return super().get(request, *args, **kwargs)
+
+        etag = self.get_etag()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            response.headers['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -2,14 +2,23 @@ import hashlib
 import os
 
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+from task_manager.conditional import csrf_secret
 from task_manager.teams.models import TeamMembership
+from task_manager.team_cache import get_generation, user_scope
 from task_manager.limit_service import LimitService
 from task_manager.limits import FREE_PLAN
 
 
 def team_context(request):
-    context = {'VERSION': settings.VERSION}
+    context = {
+        'VERSION': settings.VERSION,
+        'FRAGMENT_CACHE_TIMEOUT': settings.FRAGMENT_CACHE_TIMEOUT,
+        # Fragments with forms are cached per CSRF secret (see base.html)
+        'csrf_secret': SimpleLazyObject(lambda: csrf_secret(request)),
+    }
     if request.user.is_authenticated:
+        # Unevaluated queryset: the query runs only if a template uses it
         user_teams = TeamMembership.objects.filter(
             user=request.user,
             status='active'
@@ -18,56 +27,73 @@ def team_context(request):
         context['user_teams'] = user_teams
         context['active_team'] = getattr(request, 'active_team', None)
         context['is_team_mode'] = bool(context['active_team'])
+        # Bumped by changes of the user's teams and memberships
+        context['user_cache_generation'] = SimpleLazyObject(
+            lambda: get_generation(user_scope(request.user.pk))
+        )
 
     return context
 
 
+def _get_static_version(manifest_path):
+    try:
+        mtime = os.path.getmtime(manifest_path)
+        return hashlib.md5(str(mtime).encode(),
+                           usedforsecurity=False).hexdigest()[:8]
+    except OSError:
+        return 'dev'
+
+
 def static_version(request):
     """
     Generate version based on staticfiles.json.
     Changes automatically on each collectstatic.
+
+    The manifest is only stat()ed when a template reads STATIC_VERSION.
     """
     manifest_path = os.path.join(settings.STATIC_ROOT, 'staticfiles.json')
+    return {
+        'STATIC_VERSION': SimpleLazyObject(
+            lambda: _get_static_version(manifest_path)
+        ),
+    }
+
+
+def _get_usage(user):
+    """Usage summary with the used percentage of each resource."""
     try:
-        mtime = os.path.getmtime(manifest_path)
-        version = hashlib.md5(str(mtime).encode(),
-                              usedforsecurity=False).hexdigest()[:8]
-    except OSError:
-        version = 'dev'
+        usage = LimitService(user).get_usage_summary()
+    except Exception:
+        return {}
 
-    return {'STATIC_VERSION': version}
+    # Calculate percentage for each resource
+    for key in usage:
+        current = usage[key]['current']
+        maximum = usage[key]['max']
+        if maximum > 0:
+            usage[key]['percent'] = min(100, int(current / maximum * 100))
+        else:
+            usage[key]['percent'] = 0
+    return usage
 
 
 def limits_context(request):
     """
     Provides usage statistics and upgrade hints to all templates.
+
+    Usage is loaded on first read, so pages without the usage bar
+    do not query it.
     """
     if not request.user.is_authenticated:
         return {}
 
-    try:
-        service = LimitService(request.user)
-        usage = service.get_usage_summary()
-
-        # Calculate percentage for each resource
-        for key in usage:
-            current = usage[key]['current']
-            maximum = usage[key]['max']
-            if maximum > 0:
-                usage[key]['percent'] = min(100, int(current / maximum * 100))
-            else:
-                usage[key]['percent'] = 0
+    usage = SimpleLazyObject(lambda: _get_usage(request.user))
 
+    return {
+        'usage': usage,
         # Check if any resource is >= 80% used
-        show_upgrade_hint = any(
-            usage[key]['percent'] >= 80
-            for key in usage
-        )
-
-        return {
-            'usage': usage,
-            'show_upgrade_hint': show_upgrade_hint,
-            'free_plan_limits': FREE_PLAN,
-        }
-    except Exception:
-        return {}
+        'show_upgrade_hint': SimpleLazyObject(lambda: any(
+            data['percent'] >= 80 for data in usage.values()
+        )),
+        'free_plan_limits': FREE_PLAN,
+    }
@@ -5,8 +5,10 @@ from task_manager.user.models import User
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 
+from task_manager import usage
 
-class Label(models.Model):
+
+class Label(usage.UsageCountedModel):
     id = models.AutoField(primary_key=True)
     uuid = models.UUIDField(
         default=uuid.uuid4,
@@ -43,5 +45,14 @@ class Label(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    USAGE_FIELDS = ('team_id', 'creator_id')
+
+    def get_usage_keys(self):
+        if self.team_id:
+            return usage.usage_keys(('team', self.team_id, usage.TEAM_LABELS))
+        return usage.usage_keys(
+            ('user', self.creator_id, usage.PERSONAL_LABELS)
+        )
+
     def __str__(self):
         return self.name
@@ -1,5 +1,6 @@
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
+from task_manager.conditional import ConditionalListMixin
 from task_manager.permissions import CustomPermissions
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
@@ -9,11 +10,15 @@ from .models import Label
 from task_manager.labels.forms import LabelForm
 from django.shortcuts import redirect
 from task_manager.limit_service import LimitService
+from task_manager.team_cache import cached_list, request_scope
 
 
-class LabelsListView(CustomPermissions, ListView):
+class LabelsListView(CustomPermissions, ConditionalListMixin, ListView):
     model = Label
     template_name = 'labels/labels_list.html'
+    # The labels are a cached list, not a queryset
+    context_object_name = 'label_list'
+    owner_field = 'creator'
 
     def get_queryset(self):
         user = self.request.user
@@ -22,13 +27,14 @@ class LabelsListView(CustomPermissions, ListView):
 
         if team:
             # show team's labels
-            return Label.objects.filter(team=team).select_related('creator')
+            labels = Label.objects.filter(team=team).select_related('creator')
         else:
             # show labels for individual mode
-            return Label.objects.filter(
+            labels = Label.objects.filter(
                 creator=user,
                 team__isnull=True
             ).select_related('creator')
+        return cached_list(request_scope(self.request), 'labels', labels)
 
 
 class LabelsCreateView(SuccessMessageMixin, CreateView):
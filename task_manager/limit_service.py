@@ -2,12 +2,14 @@
 Limit checking service for TaskMan.
 
 Provides methods to check if user can create various resources
-based on their subscription plan limits.
+based on their subscription plan limits. Current usage is read from the
+materialized UsageCounter table (see usage.py) instead of counting rows.
 """
 from dataclasses import dataclass
 
 from django.utils.translation import gettext_lazy as _
 
+from task_manager import usage
 from task_manager.limits import get_user_limits
 
 
@@ -57,196 +59,111 @@ class LimitService:
             'max': max_value
         }
 
-    def can_create_team(self) -> LimitCheckResult:
-        from task_manager.teams.models import TeamMembership
+    def _user_usage(self, *resources) -> dict:
+        """Stored usage counters of the user (one indexed read)."""
+        return self._usage(user=self.user, resource__in=resources)
 
-        current = TeamMembership.objects.filter(
-            user=self.user,
-            role='admin'
-        ).count()
-        max_teams = self.limits.max_teams
+    def _team_usage(self, team, *resources) -> dict:
+        """Stored usage counters of the team (one indexed read)."""
+        return self._usage(team=team, resource__in=resources)
 
-        allowed = current < max_teams
-        message = ""
-        if not allowed:
-            message = self._get_limit_message('teams', max_teams)
+    def _usage(self, **lookup) -> dict:
+        from task_manager.models import UsageCounter
 
-        return LimitCheckResult(
-            allowed=allowed,
-            current=current,
-            maximum=max_teams,
-            message=message
+        counts = dict(
+            UsageCounter.objects.filter(**lookup)
+            .values_list('resource', 'count')
         )
+        return {
+            resource: counts.get(resource, 0)
+            for resource in lookup['resource__in']
+        }
 
-    def can_add_team_member(self, team) -> LimitCheckResult:
-        current = team.memberships.filter(status='active').count()
-        max_members = self.limits.max_team_members
-
-        allowed = current < max_members
+    def _check(self, resource_key: str, current: int,
+               maximum: int) -> LimitCheckResult:
+        allowed = current < maximum
         message = ""
         if not allowed:
-            message = self._get_limit_message('team_members', max_members)
+            message = self._get_limit_message(resource_key, maximum)
 
         return LimitCheckResult(
             allowed=allowed,
             current=current,
-            maximum=max_members,
+            maximum=maximum,
             message=message
         )
 
-    def can_create_task(self) -> LimitCheckResult:
-        from task_manager.tasks.models import Task
+    def can_create_team(self) -> LimitCheckResult:
+        # Teams where the user is admin
+        current = self._user_usage(usage.TEAMS)[usage.TEAMS]
+        return self._check('teams', current, self.limits.max_teams)
+
+    def can_add_team_member(self, team) -> LimitCheckResult:
+        # Active members only
+        current = self._team_usage(
+            team, usage.TEAM_MEMBERS
+        )[usage.TEAM_MEMBERS]
+        return self._check(
+            'team_members', current, self.limits.max_team_members
+        )
 
+    def can_create_task(self) -> LimitCheckResult:
         # Count only tasks where user is the author
         # (both personal and team tasks)
         # Tasks are attributed to the author only to avoid double-counting
         # when multiple users are members of the same team
-        current = Task.objects.filter(author=self.user).count()
-        max_tasks = self.limits.max_tasks_total
-
-        allowed = current < max_tasks
-        message = ""
-        if not allowed:
-            message = self._get_limit_message('tasks', max_tasks)
-
-        return LimitCheckResult(
-            allowed=allowed,
-            current=current,
-            maximum=max_tasks,
-            message=message
-        )
+        current = self._user_usage(usage.TASKS)[usage.TASKS]
+        return self._check('tasks', current, self.limits.max_tasks_total)
 
     def can_create_personal_status(self) -> LimitCheckResult:
-        from task_manager.statuses.models import Status
-
-        current = Status.objects.filter(
-            creator=self.user,
-            team__isnull=True
-        ).count()
-        max_statuses = self.limits.max_personal_statuses
-
-        allowed = current < max_statuses
-        message = ""
-        if not allowed:
-            message = self._get_limit_message('personal_statuses', max_statuses)
-
-        return LimitCheckResult(
-            allowed=allowed,
-            current=current,
-            maximum=max_statuses,
-            message=message
+        current = self._user_usage(
+            usage.PERSONAL_STATUSES
+        )[usage.PERSONAL_STATUSES]
+        return self._check(
+            'personal_statuses', current, self.limits.max_personal_statuses
         )
 
     def can_create_team_status(self, team) -> LimitCheckResult:
-        from task_manager.statuses.models import Status
-
-        current = Status.objects.filter(team=team).count()
-        max_statuses = self.limits.max_team_statuses
-
-        allowed = current < max_statuses
-        message = ""
-        if not allowed:
-            message = self._get_limit_message('team_statuses', max_statuses)
-
-        return LimitCheckResult(
-            allowed=allowed,
-            current=current,
-            maximum=max_statuses,
-            message=message
+        current = self._team_usage(
+            team, usage.TEAM_STATUSES
+        )[usage.TEAM_STATUSES]
+        return self._check(
+            'team_statuses', current, self.limits.max_team_statuses
         )
 
     def can_create_personal_label(self) -> LimitCheckResult:
-        from task_manager.labels.models import Label
-
-        current = Label.objects.filter(
-            creator=self.user,
-            team__isnull=True
-        ).count()
-        max_labels = self.limits.max_personal_labels
-
-        allowed = current < max_labels
-        message = ""
-        if not allowed:
-            message = self._get_limit_message('personal_labels', max_labels)
-
-        return LimitCheckResult(
-            allowed=allowed,
-            current=current,
-            maximum=max_labels,
-            message=message
+        current = self._user_usage(
+            usage.PERSONAL_LABELS
+        )[usage.PERSONAL_LABELS]
+        return self._check(
+            'personal_labels', current, self.limits.max_personal_labels
         )
 
     def can_create_team_label(self, team) -> LimitCheckResult:
-        from task_manager.labels.models import Label
-
-        current = Label.objects.filter(team=team).count()
-        max_labels = self.limits.max_team_labels
-
-        allowed = current < max_labels
-        message = ""
-        if not allowed:
-            message = self._get_limit_message('team_labels', max_labels)
-
-        return LimitCheckResult(
-            allowed=allowed,
-            current=current,
-            maximum=max_labels,
-            message=message
+        current = self._team_usage(team, usage.TEAM_LABELS)[usage.TEAM_LABELS]
+        return self._check(
+            'team_labels', current, self.limits.max_team_labels
         )
 
     def can_create_personal_note(self) -> LimitCheckResult:
-        from task_manager.notes.models import Note
-
-        current = Note.objects.filter(
-            author=self.user,
-            team__isnull=True
-        ).count()
-        max_notes = self.limits.max_personal_notes
-
-        allowed = current < max_notes
-        message = ""
-        if not allowed:
-            message = self._get_limit_message('personal_notes', max_notes)
-
-        return LimitCheckResult(
-            allowed=allowed,
-            current=current,
-            maximum=max_notes,
-            message=message
+        current = self._user_usage(
+            usage.PERSONAL_NOTES
+        )[usage.PERSONAL_NOTES]
+        return self._check(
+            'personal_notes', current, self.limits.max_personal_notes
         )
 
     def can_create_team_note(self, team) -> LimitCheckResult:
-        from task_manager.notes.models import Note
-
-        current = Note.objects.filter(team=team).count()
-        max_notes = self.limits.max_team_notes
-
-        allowed = current < max_notes
-        message = ""
-        if not allowed:
-            message = self._get_limit_message('team_notes', max_notes)
-
-        return LimitCheckResult(
-            allowed=allowed,
-            current=current,
-            maximum=max_notes,
-            message=message
+        current = self._team_usage(team, usage.TEAM_NOTES)[usage.TEAM_NOTES]
+        return self._check(
+            'team_notes', current, self.limits.max_team_notes
         )
 
     def can_add_checklist_item(self, task) -> LimitCheckResult:
-        current = task.checklist_items.count()
-        max_items = self.limits.max_checklist_items
-
-        allowed = current < max_items
-        message = ""
-        if not allowed:
-            message = self._get_limit_message('checklist_items', max_items)
-
-        return LimitCheckResult(
-            allowed=allowed,
-            current=current,
-            maximum=max_items,
-            message=message
+        # Per-task limit, read from the task's materialized counter
+        current = task.checklist_total
+        return self._check(
+            'checklist_items', current, self.limits.max_checklist_items
         )
 
     def get_usage_summary(self) -> dict:
@@ -259,38 +176,15 @@ class LimitService:
         Note: Tasks are counted only where user is the author.
         This prevents double-counting when multiple users share a team.
         """
-        from task_manager.tasks.models import Task
-        from task_manager.teams.models import TeamMembership
-        from task_manager.statuses.models import Status
-        from task_manager.labels.models import Label
-        from task_manager.notes.models import Note
-
-        # Teams: count where user is admin
-        teams_count = TeamMembership.objects.filter(
-            user=self.user,
-            role='admin'
-        ).count()
-
-        # Tasks: count only where user is author (personal + team)
-        tasks_count = Task.objects.filter(author=self.user).count()
-
-        # Personal statuses
-        statuses_count = Status.objects.filter(
-            creator=self.user,
-            team__isnull=True
-        ).count()
-
-        # Personal labels
-        labels_count = Label.objects.filter(
-            creator=self.user,
-            team__isnull=True
-        ).count()
-
-        # Personal notes
-        notes_count = Note.objects.filter(
-            author=self.user,
-            team__isnull=True
-        ).count()
+        counts = self._user_usage(
+            usage.TASKS, usage.TEAMS, usage.PERSONAL_STATUSES,
+            usage.PERSONAL_LABELS, usage.PERSONAL_NOTES,
+        )
+        tasks_count = counts[usage.TASKS]
+        teams_count = counts[usage.TEAMS]
+        statuses_count = counts[usage.PERSONAL_STATUSES]
+        labels_count = counts[usage.PERSONAL_LABELS]
+        notes_count = counts[usage.PERSONAL_NOTES]
 
         return {
             'tasks': {
@@ -322,30 +216,21 @@ class LimitService:
         Returns dict with keys: members, tasks, statuses, labels, notes.
         Each value is {'current': int, 'max': int, 'percent': int}.
         """
-        from task_manager.tasks.models import Task
-        from task_manager.statuses.models import Status
-        from task_manager.labels.models import Label
-        from task_manager.notes.models import Note
-
         def calc_percent(current, max_val):
             if max_val <= 0:
                 return 0
             return min(int((current / max_val) * 100), 100)
 
+        counts = self._team_usage(
+            team, usage.TEAM_MEMBERS, usage.TASKS, usage.TEAM_STATUSES,
+            usage.TEAM_LABELS, usage.TEAM_NOTES,
+        )
         # Team members (active only)
-        members_count = team.memberships.filter(status='active').count()
-
-        # Tasks in team
-        tasks_count = Task.objects.filter(team=team).count()
-
-        # Team statuses
-        statuses_count = Status.objects.filter(team=team).count()
-
-        # Team labels
-        labels_count = Label.objects.filter(team=team).count()
-
-        # Team notes
-        notes_count = Note.objects.filter(team=team).count()
+        members_count = counts[usage.TEAM_MEMBERS]
+        tasks_count = counts[usage.TASKS]
+        statuses_count = counts[usage.TEAM_STATUSES]
+        labels_count = counts[usage.TEAM_LABELS]
+        notes_count = counts[usage.TEAM_NOTES]
 
         return {
             'members': {
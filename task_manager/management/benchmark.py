@@ -0,0 +1,121 @@
+"""
+Helpers shared by the ``benchmark_*`` management commands.
+
+The benchmarks seed a large team inside a transaction that is always
+rolled back, so they can be run against any database without leaving
+data behind.
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task, ChecklistItem
+from task_manager.teams.models import Team, TeamMembership
+from task_manager.user.models import User
+
+
+BATCH_SIZE = 5000
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded data at the end of the benchmark."""
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is rolled back afterwards."""
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def median_time(func, repeat):
+    """Median wall time of calling ``func`` ``repeat`` times."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def seed_team(task_count, members=20, seed=42):
+    """
+    Create a team with members, statuses, labels and ``task_count`` tasks.
+
+    Every task gets two executors and two labels, every third task a
+    three item checklist. Returns ``(team, users, labels)``; the first
+    user is the team admin.
+    """
+    rng = random.Random(seed)
+    owner = User.objects.create_user(username='benchmark_owner')
+    team = Team.objects.create(name='Benchmark team')
+    users = [owner] + [
+        User.objects.create_user(username=f'benchmark_user_{i}')
+        for i in range(members - 1)
+    ]
+    TeamMembership.objects.bulk_create([
+        TeamMembership(
+            user=member, team=team, status='active',
+            role='admin' if member == owner else 'member',
+        )
+        for member in users
+    ])
+    statuses = Status.objects.bulk_create([
+        Status(name=f'Status {i}', team=team, creator=owner)
+        for i in range(5)
+    ])
+    labels = Label.objects.bulk_create([
+        Label(name=f'Label {i}', team=team, creator=owner)
+        for i in range(10)
+    ])
+
+    tasks = Task.objects.bulk_create(
+        [
+            Task(
+                name=f'Task {i}',
+                description='Benchmark task',
+                team=team,
+                author=rng.choice(users),
+                status=rng.choice(statuses),
+            )
+            for i in range(task_count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    Executors = Task.executors.through
+    Labels = Task.labels.through
+    Executors.objects.bulk_create(
+        [
+            Executors(task_id=task.pk, user_id=member.pk)
+            for task in tasks
+            for member in rng.sample(users, 2)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    Labels.objects.bulk_create(
+        [
+            Labels(task_id=task.pk, label_id=label.pk)
+            for task in tasks
+            for label in rng.sample(labels, 2)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    ChecklistItem.objects.bulk_create(
+        [
+            ChecklistItem(task=task, text='Step', position=position)
+            for task in tasks[::3]
+            for position in range(3)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return team, users, labels
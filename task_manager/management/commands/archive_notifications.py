@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from task_manager.notifications import partitions
+from task_manager.notifications.models import (
+    Notification,
+    NotificationArchive,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Move notifications older than --days to the archive table and '
+        'drop archived ones older than --retention-days. Partitioned '
+        'tables move and drop whole months.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.NOTIFICATION_ARCHIVE_AFTER_DAYS,
+            help='Archive notifications older than this many days '
+                 '(default: NOTIFICATION_ARCHIVE_AFTER_DAYS, 180).',
+        )
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=settings.NOTIFICATION_ARCHIVE_RETENTION_DAYS,
+            help='Drop archived notifications older than this many days '
+                 '(default: NOTIFICATION_ARCHIVE_RETENTION_DAYS; 0 keeps '
+                 'them).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows moved or deleted per batch on unpartitioned tables '
+                 '(default: 1000).',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        self.options = options
+        self._archive(now - timedelta(days=options['days']))
+        if options['retention_days']:
+            self._drop(now - timedelta(days=options['retention_days']))
+
+    def _archive(self, before):
+        if partitions.is_partitioned(Notification):
+            moved = partitions.archive_partitions(before)
+            self._write(f'Archived {len(moved)} monthly partition(s).')
+        else:
+            moved = partitions.archive_rows(
+                before, self.options['batch_size']
+            )
+            self._write(f'Archived {moved} notification(s).')
+
+    def _drop(self, before):
+        if partitions.is_partitioned(NotificationArchive):
+            dropped = partitions.drop_archive_partitions(before)
+            self._write(
+                f'Dropped {len(dropped)} archived monthly partition(s).'
+            )
+        else:
+            deleted = partitions.delete_archived_rows(
+                before, self.options['batch_size']
+            )
+            self._write(f'Deleted {deleted} archived notification(s).')
+
+    def _write(self, message):
+        if self.options['verbosity'] > 1:
+            self.stdout.write(message)
@@ -0,0 +1,118 @@
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from task_manager.management.benchmark import (
+    median_time,
+    rolled_back,
+    seed_team,
+)
+from task_manager.tasks.filters import TaskFilter
+from task_manager.tasks.models import Task
+from task_manager.tasks.pagination import get_ordering
+
+
+PAGE_SIZE = 50
+
+
+def legacy_filter(qs, params, user):
+    """The JOIN + DISTINCT filtering TaskFilter used before EXISTS."""
+    for field in ('executors', 'labels'):
+        if field not in params:
+            continue
+        condition = Q(**{f'{field}__in': params[field]})
+        if f'{field}_exclude' in params:
+            qs = qs.exclude(condition)
+        else:
+            qs = qs.filter(condition)
+    if 'my_tasks' in params:
+        qs = qs.filter(Q(author=user) | Q(executors=user))
+    if 'has_checklist' in params:
+        qs = qs.filter(checklist_items__isnull=False)
+    return qs.distinct()
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a large team in a rolled back transaction and compare task '
+        'list filtering with JOIN + DISTINCT against EXISTS subqueries.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tasks',
+            type=int,
+            default=100000,
+            help='Number of tasks to seed (default: 100000).',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per query, the median is reported (default: 5).',
+        )
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        with rolled_back():
+            self._run(options['tasks'])
+
+    def _run(self, task_count):
+        started = time.perf_counter()
+        team, users, labels = seed_team(task_count)
+        self.stdout.write(
+            f'Seeded {task_count} tasks in '
+            f'{time.perf_counter() - started:.1f}s.'
+        )
+
+        user = users[0]
+        request = SimpleNamespace(user=user, active_team=team)
+        base = Task.objects.filter(team=team).select_related(
+            'status', 'author', 'updated_by'
+        ).order_by(*get_ordering('-created_at'))
+
+        scenarios = {
+            'executors': {'executors': [users[1].pk]},
+            'labels': {'labels': [labels[0].pk, labels[1].pk]},
+            'labels exclude': {
+                'labels': [labels[0].pk], 'labels_exclude': 'on',
+            },
+            'my tasks': {'my_tasks': 'on'},
+            'has checklist': {'has_checklist': 'on'},
+            'combined': {
+                'executors': [users[1].pk, users[2].pk],
+                'labels': [labels[0].pk, labels[1].pk],
+                'has_checklist': 'on',
+            },
+        }
+
+        self.stdout.write(
+            f'{"filter":<16}{"join+distinct":>16}{"exists":>12}'
+            f'{"speedup":>10}'
+        )
+        for name, params in scenarios.items():
+            legacy = legacy_filter(base, params, user)
+            current = TaskFilter(params, queryset=base, request=request).qs
+            self._check_same_results(name, legacy, current)
+            legacy_time = self._measure(legacy)
+            current_time = self._measure(current)
+            self.stdout.write(
+                f'{name:<16}{legacy_time * 1000:>14.1f}ms'
+                f'{current_time * 1000:>10.1f}ms'
+                f'{legacy_time / current_time:>9.1f}x'
+            )
+
+    def _check_same_results(self, name, legacy, current):
+        legacy_ids = list(legacy.values_list('pk', flat=True)[:PAGE_SIZE])
+        current_ids = list(current.values_list('pk', flat=True)[:PAGE_SIZE])
+        if legacy_ids != current_ids or legacy.count() != current.count():
+            raise CommandError(f'Results differ for "{name}" filter.')
+
+    def _measure(self, queryset):
+        """Median time of loading the first page and counting all rows."""
+        def run():
+            list(queryset[:PAGE_SIZE])
+            queryset.count()
+        return median_time(run, self.repeat)
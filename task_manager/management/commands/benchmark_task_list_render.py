@@ -0,0 +1,90 @@
+import time
+
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.management.benchmark import (
+    median_time,
+    rolled_back,
+    seed_team,
+)
+from task_manager.tasks.views import TaskFilterView
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a large team in a rolled back transaction and measure how '
+        'long the task list page takes to render.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tasks',
+            type=int,
+            default=10000,
+            help='Number of tasks to seed (default: 10000).',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Renders per page, the median is reported (default: 5).',
+        )
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        with rolled_back():
+            self._run(options['tasks'])
+
+    def _run(self, task_count):
+        started = time.perf_counter()
+        team, users, _labels = seed_team(task_count)
+        self.stdout.write(
+            f'Seeded {task_count} tasks in '
+            f'{time.perf_counter() - started:.1f}s.'
+        )
+
+        middle = max(task_count // TaskFilterView.paginate_by // 2, 1)
+        scenarios = {
+            'first page': {'page': 1},
+            'middle page': {'page': middle},
+            'middle simple': {'page': middle, 'view_mode': 'simple'},
+            'cursor': {'cursor': ''},
+            'cursor simple': {'cursor': '', 'view_mode': 'simple'},
+        }
+
+        self.stdout.write(
+            f'{"page":<16}{"render":>10}{"queries":>9}{"html":>10}'
+            f'{"links":>7}'
+        )
+        for name, params in scenarios.items():
+            render = self._renderer(users[0], team, params)
+            with CaptureQueriesContext(connection) as ctx:
+                response = render()
+            render_time = median_time(render, self.repeat)
+            self.stdout.write(
+                f'{name:<16}{render_time * 1000:>8.1f}ms'
+                f'{len(ctx.captured_queries):>9}'
+                f'{len(response.content) / 1024:>8.1f}KB'
+                f'{len(response.context_data.get("page_links", ())):>7}'
+            )
+
+    def _renderer(self, user, team, params):
+        """Return a callable that renders the task list as ``user``."""
+        factory = RequestFactory()
+        url = reverse('tasks:tasks-list')
+        view = TaskFilterView.as_view()
+
+        def render():
+            request = factory.get(url, params)
+            request.user = user
+            request.active_team = team
+            request.session = SessionStore()
+            request._messages = FallbackStorage(request)
+            return view(request).render()
+        return render
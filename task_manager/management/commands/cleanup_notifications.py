@@ -1,42 +1,197 @@
+import argparse
+import time
 from datetime import timedelta
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db.models import Q
 from django.utils import timezone
 
 from task_manager.notifications.models import Notification
+from task_manager.notifications.unread import invalidate_unread
+
+
+def _type_days(value):
+    """Parse a TYPE=DAYS option value."""
+    notification_type, _, days = value.partition('=')
+    if notification_type not in Notification.NotificationType.values:
+        raise argparse.ArgumentTypeError(
+            f'unknown notification type "{notification_type}"'
+        )
+    if not days.isdigit():
+        raise argparse.ArgumentTypeError(f'invalid number of days "{days}"')
+    return notification_type, int(days)
+
+
+def expired_notifications(now, days, days_by_type=None, unread_days=0):
+    """
+    Condition matching notifications past their retention: read ones
+    older than days, or than the days for their type in days_by_type,
+    and, if unread_days is set, unread ones older than unread_days.
+    """
+    days_by_type = days_by_type or {}
+    read = Q(
+        ~Q(notification_type__in=days_by_type),
+        created_at__lt=now - timedelta(days=days),
+    )
+    for notification_type, type_days in days_by_type.items():
+        read |= Q(
+            notification_type=notification_type,
+            created_at__lt=now - timedelta(days=type_days),
+        )
+    expired = Q(read, is_read=True)
+    if unread_days:
+        expired |= Q(
+            is_read=False,
+            created_at__lt=now - timedelta(days=unread_days),
+        )
+    return expired
 
 
 class Command(BaseCommand):
-    help = 'Delete read notifications older than a specified number of days.'
+    help = (
+        'Delete notifications past their retention in small batches. '
+        'Read notifications are kept for --days (or --type-days for '
+        'their type), unread ones for --unread-days, or forever.'
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--days',
             type=int,
-            default=30,
-            help='Delete notifications older than this many days '
-                 '(default: 30).',
+            default=settings.NOTIFICATION_RETENTION_DAYS,
+            help='Delete read notifications older than this many days '
+                 '(default: NOTIFICATION_RETENTION_DAYS, 30).',
+        )
+        parser.add_argument(
+            '--type-days',
+            type=_type_days,
+            action='append',
+            default=[],
+            metavar='TYPE=DAYS',
+            help='Retention of read notifications of one type, e.g. '
+                 'digest=7. Repeatable; adds to '
+                 'NOTIFICATION_RETENTION_BY_TYPE.',
+        )
+        parser.add_argument(
+            '--unread-days',
+            type=int,
+            default=settings.NOTIFICATION_UNREAD_RETENTION_DAYS,
+            help='Also delete unread notifications older than this many '
+                 'days (default: NOTIFICATION_UNREAD_RETENTION_DAYS; '
+                 '0 keeps them).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Notifications deleted per statement (default: 1000).',
+        )
+        parser.add_argument(
+            '--max-seconds',
+            type=float,
+            default=0,
+            help='Stop starting new batches after this many seconds '
+                 '(default: 0, no limit).',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Seconds to pause between batches (default: 0).',
+        )
+        parser.add_argument(
+            '--start-after',
+            type=int,
+            default=0,
+            metavar='ID',
+            help='Only look at notifications with a greater id, to resume '
+                 'a stopped run where it left off.',
         )
 
     def handle(self, *args, **options):
-        days = options['days']
-        verbosity = options['verbosity']
-        cutoff_date = timezone.now() - timedelta(days=days)
+        days_by_type = {
+            **settings.NOTIFICATION_RETENTION_BY_TYPE,
+            **dict(options['type_days']),
+        }
+        expired = Notification.objects.filter(
+            expired_notifications(
+                timezone.now(),
+                options['days'],
+                days_by_type,
+                options['unread_days'],
+            )
+        )
+        self.options = options
+        deleted, batches, last_id, finished = self._delete(expired)
+
+        if options['verbosity'] > 1:
+            self._report(deleted, batches, last_id, finished, days_by_type)
 
-        queryset = Notification.objects.filter(
-            is_read=True,
-            created_at__lt=cutoff_date,
+    def _delete(self, expired):
+        """
+        Delete expired notifications batch by batch, in id order. Each
+        batch is one short statement committed on its own, so a stopped
+        run leaves no partial batch and running again just continues.
+        Returns (deleted, batches, last id, whether all were deleted).
+        """
+        options = self.options
+        deadline = (
+            time.monotonic() + options['max_seconds']
+            if options['max_seconds'] else None
         )
-        deleted_count, _ = queryset.delete()
+        deleted = batches = 0
+        last_id = options['start_after']
+        while True:
+            if deadline is not None and time.monotonic() >= deadline:
+                return deleted, batches, last_id, False
+            rows = list(
+                expired.filter(pk__gt=last_id).order_by('pk')
+                .values_list('pk', 'recipient_id', 'is_read')
+                [:options['batch_size']]
+            )
+            if not rows:
+                return deleted, batches, last_id, True
+            if batches and options['sleep']:
+                time.sleep(options['sleep'])
 
-        if verbosity > 1:
-            if deleted_count:
+            deleted += self._delete_batch(expired, rows)
+            batches += 1
+            last_id = rows[-1][0]
+            if options['verbosity'] > 2:
                 self.stdout.write(
-                    f'Deleted {deleted_count} read notification(s) '
-                    f'older than {days} day(s).'
+                    f'Batch {batches}: deleted up to id {last_id} '
+                    f'({deleted} so far).'
                 )
+
+    def _delete_batch(self, expired, rows):
+        """Delete the expired notifications in the id range of rows."""
+        # Still filtered by the retention rules, and deleted without
+        # loading rows for the delete collector (nothing references
+        # notifications and they have no delete signals)
+        batch = expired.filter(pk__gte=rows[0][0], pk__lte=rows[-1][0])
+        deleted = batch._raw_delete(batch.db)
+        unread_of = {recipient for _, recipient, read in rows if not read}
+        if unread_of:
+            invalidate_unread(*unread_of)
+        return deleted
+
+    def _report(self, deleted, batches, last_id, finished, days_by_type):
+        options = self.options
+        if not deleted and finished:
+            if days_by_type or options['unread_days']:
+                self.stdout.write('No expired notifications to delete.')
             else:
                 self.stdout.write(
-                    f'No read notifications older than {days} '
+                    f'No read notifications older than {options["days"]} '
                     f'day(s) to delete.'
                 )
+            return
+        self.stdout.write(
+            f'Deleted {deleted} notification(s) in {batches} batch(es).'
+        )
+        if not finished:
+            self.stdout.write(
+                f'Stopped after {options["max_seconds"]}s; resume with '
+                f'--start-after {last_id}.'
+            )
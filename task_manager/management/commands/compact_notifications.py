@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.notifications.models import (
+    Notification,
+    NotificationArchive,
+)
+
+
+def _renders(message_key, message_params):
+    """Whether get_message() can build the message from key and params."""
+    try:
+        message_key.format(**message_params)
+    except (KeyError, TypeError, IndexError, ValueError):
+        return False
+    return True
+
+
+class Command(BaseCommand):
+    help = (
+        'Clear the pre-rendered legacy message of notifications, live and '
+        'archived, that get_message() can build from message_key and '
+        'message_params.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Notifications checked per batch (default: 1000).',
+        )
+
+    def handle(self, *args, **options):
+        for model in (Notification, NotificationArchive):
+            compacted = self._compact(model, options['batch_size'])
+            if options['verbosity'] > 1:
+                self.stdout.write(
+                    f'Compacted {compacted} notification(s) in '
+                    f'{model._meta.db_table}.'
+                )
+
+    def _compact(self, model, batch_size):
+        """Clear the message of compactable rows of model, in id order."""
+        rows = model.objects.filter(message_key__gt='').exclude(message='')
+        compacted = last_id = 0
+        while True:
+            batch = list(
+                rows.filter(pk__gt=last_id).order_by('pk')
+                .values_list('pk', 'message_key', 'message_params')
+                [:batch_size]
+            )
+            if not batch:
+                return compacted
+            last_id = batch[-1][0]
+            compacted += model.objects.filter(pk__in=[
+                pk for pk, key, params in batch if _renders(key, params)
+            ]).update(message='')
@@ -0,0 +1,88 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from task_manager.notifications import outbox
+
+
+class Command(BaseCommand):
+    help = (
+        'Write notifications queued in the outbox. Runs until stopped '
+        'unless --once is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.NOTIFICATION_OUTBOX_WORKERS,
+            help='Number of worker threads (default: '
+                 'NOTIFICATION_OUTBOX_WORKERS).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.NOTIFICATION_OUTBOX_BATCH_SIZE,
+            help='Outbox entries claimed at a time (default: '
+                 'NOTIFICATION_OUTBOX_BATCH_SIZE).',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to sleep when the outbox is empty (default: 1).',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit as soon as no entry is due.',
+        )
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        self.totals = {'delivered': 0, 'retried': 0, 'dead': 0, 'skipped': 0}
+        self.lock = threading.Lock()
+        self.options = options
+
+        if not options['once']:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *args: self.stop.set())
+
+        if options['workers'] > 1:
+            self._run_threads(options['workers'])
+        else:
+            self._work()
+
+        if options['verbosity'] > 1:
+            self.stdout.write(
+                'Delivered {delivered}, retried {retried}, '
+                'dead {dead} outbox entries.'.format(**self.totals)
+            )
+
+    def _run_threads(self, count):
+        threads = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _work(self):
+        try:
+            counts = outbox.run(
+                self.options['batch_size'],
+                self.options['poll_interval'],
+                self.stop,
+                once=self.options['once'],
+            )
+        finally:
+            if threading.current_thread() is not threading.main_thread():
+                connections.close_all()
+        with self.lock:
+            for name, count in counts.items():
+                self.totals[name] += count
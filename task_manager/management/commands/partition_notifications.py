@@ -0,0 +1,52 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from task_manager.notifications import partitions
+from task_manager.notifications.models import (
+    Notification,
+    NotificationArchive,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'On PostgreSQL, partition the notifications and notification '
+        'archive tables by month, converting them on the first run, and '
+        'create the partitions of the coming months. Run it monthly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=settings.NOTIFICATION_PARTITIONS_AHEAD,
+            help='Create partitions through this many months from now '
+                 '(default: NOTIFICATION_PARTITIONS_AHEAD, 3).',
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        if not partitions.supports_partitioning():
+            self._write(
+                'Partitioning needs PostgreSQL; notifications stay in a '
+                'plain table.'
+            )
+            return
+
+        for model in (Notification, NotificationArchive):
+            if not partitions.is_partitioned(model):
+                partitions.partition_table(model)
+                self._write(f'Partitioned {model._meta.db_table} by month.')
+
+        until = partitions.add_months(
+            partitions.month_start(datetime.now(dt_timezone.utc)),
+            options['months_ahead'],
+        )
+        created = partitions.ensure_partitions(Notification, until)
+        self._write(f'Created {len(created)} partition(s).')
+
+    def _write(self, message):
+        if self.verbosity > 1:
+            self.stdout.write(message)
@@ -0,0 +1,66 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_manager.models import UsageCounter
+from task_manager.usage import find_usage_drift
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute per-user and per-team usage counters used for plan '
+        'limits and repair any drift.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of counters written per batch (default: 500).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report counters with a wrong value.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        verbosity = options['verbosity']
+
+        changed, created = find_usage_drift(apps.get_model)
+
+        if verbosity > 1:
+            for counter in changed:
+                self.stdout.write(
+                    f'{self._owner(counter)} {counter.resource}: '
+                    f'{counter.stored_count}->{counter.count}'
+                )
+            for counter in created:
+                self.stdout.write(
+                    f'{self._owner(counter)} {counter.resource}: '
+                    f'missing->{counter.count}'
+                )
+
+        if not dry_run:
+            with transaction.atomic():
+                UsageCounter.objects.bulk_update(
+                    changed, ['count'], batch_size=batch_size
+                )
+                UsageCounter.objects.bulk_create(
+                    created, batch_size=batch_size
+                )
+
+        if verbosity > 0:
+            action = 'Found' if dry_run else 'Repaired'
+            self.stdout.write(
+                f'{action} {len(changed) + len(created)} drifted usage '
+                f'counter(s).'
+            )
+
+    def _owner(self, counter):
+        if counter.user_id:
+            return f'User {counter.user_id}'
+        return f'Team {counter.team_id}'
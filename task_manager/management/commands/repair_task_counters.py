@@ -0,0 +1,92 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from task_manager.notes.models import Note
+from task_manager.tasks.models import Task, ChecklistItem
+
+
+def _count_subquery(queryset):
+    """Correlated COUNT(*) of related rows for each task."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(task=OuterRef('pk'))
+            .values('task').annotate(c=Count('*')).values('c'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute denormalized task counters (notes, checklist items) '
+        'and repair any drift.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of tasks updated per batch (default: 500).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report tasks with wrong counters.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        verbosity = options['verbosity']
+
+        drifted = Task.objects.annotate(
+            actual_notes=_count_subquery(Note.objects.all()),
+            actual_total=_count_subquery(ChecklistItem.objects.all()),
+            actual_done=_count_subquery(
+                ChecklistItem.objects.filter(is_done=True)
+            ),
+        ).filter(
+            ~Q(notes_count=F('actual_notes'))
+            | ~Q(checklist_total=F('actual_total'))
+            | ~Q(checklist_done=F('actual_done'))
+        ).only(
+            'pk', *Task.COUNTER_FIELDS
+        ).order_by('pk')
+
+        # Drifted tasks are few, so load them before writing to the table
+        # (SQLite gives no isolation between a cursor and writes)
+        repaired = 0
+        batch = []
+        for task in list(drifted):
+            if verbosity > 1:
+                self.stdout.write(
+                    f'Task {task.pk}: '
+                    f'notes {task.notes_count}->{task.actual_notes}, '
+                    f'checklist {task.checklist_total}->{task.actual_total}, '
+                    f'done {task.checklist_done}->{task.actual_done}'
+                )
+            task.notes_count = task.actual_notes
+            task.checklist_total = task.actual_total
+            task.checklist_done = task.actual_done
+            batch.append(task)
+            repaired += 1
+            if len(batch) >= batch_size:
+                self._save(batch, dry_run)
+                batch = []
+        self._save(batch, dry_run)
+
+        if verbosity > 0:
+            action = 'Found' if dry_run else 'Repaired'
+            self.stdout.write(
+                f'{action} {repaired} task(s) with drifted counters.'
+            )
+
+    def _save(self, batch, dry_run):
+        if not batch or dry_run:
+            return
+        with transaction.atomic():
+            Task.objects.bulk_update(batch, Task.COUNTER_FIELDS)
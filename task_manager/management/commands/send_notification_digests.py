@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.notifications.services import send_due_digests
+
+
+class Command(BaseCommand):
+    help = (
+        'Send one summary notification to each user in digest mode whose '
+        'held back notifications are due. Run it periodically, e.g. from '
+        'cron.'
+    )
+
+    def handle(self, *args, **options):
+        sent = send_due_digests()
+
+        if options['verbosity'] > 1:
+            self.stdout.write(f'Sent {sent} notification digest(s).')
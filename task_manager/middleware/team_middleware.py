@@ -1,9 +1,69 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.utils.deprecation import MiddlewareMixin
-from task_manager.teams.models import TeamMembership
+from task_manager.teams.models import Team, TeamMembership
+
+
+# Active membership of a user: team id, uuid, name and the user's role
+ACTIVE_TEAM_CACHE_KEY = 'active_team_membership:{user_id}'
+
+
+def _cache_key(user_id):
+    return ACTIVE_TEAM_CACHE_KEY.format(user_id=user_id)
+
+
+def invalidate_active_team(*user_ids):
+    """
+    Drop the cached active membership of the given users when the
+    transaction commits.
+    """
+    transaction.on_commit(partial(
+        cache.delete_many, [_cache_key(user_id) for user_id in user_ids]
+    ))
+
+
+def _load_membership(user, team_uuid):
+    membership = TeamMembership.objects.select_related('team').get(
+        team__uuid=team_uuid,
+        user=user,
+        status='active'
+    )
+    return {
+        'team_id': membership.team.pk,
+        'uuid': membership.team.uuid,
+        'name': membership.team.name,
+        'role': membership.role,
+    }
+
+
+def get_active_membership(user, team_uuid):
+    """
+    Return the cached membership of user in the team with team_uuid.
+
+    Raises TeamMembership.DoesNotExist if the user is not an active
+    member. Only one team per user is cached, the one in use, and only
+    in a cache shared by all processes (settings.CACHE_SHARED): the role
+    is used for authorization, and invalidations made in one process
+    never reach the per-process caches of the others.
+    """
+    if not settings.CACHE_SHARED:
+        return _load_membership(user, team_uuid)
+    key = _cache_key(user.pk)
+    cached = cache.get(key)
+    if cached is not None and str(cached['uuid']) == str(team_uuid):
+        return cached
+    cached = _load_membership(user, team_uuid)
+    cache.set(key, cached, settings.ACTIVE_TEAM_CACHE_TIMEOUT)
+    return cached
 
 
 class ActiveTeamMiddleware(MiddlewareMixin):
     def process_request(self, request):
+        request.active_team_role = None
+
         if not request.user.is_authenticated:
             request.active_team = None
             return
@@ -14,16 +74,22 @@ class ActiveTeamMiddleware(MiddlewareMixin):
         if active_team_uuid:
             try:
                 # check if user is an active member of this team
-                membership = TeamMembership.objects.get(
-                    team__uuid=active_team_uuid,
-                    user=request.user,
-                    status='active'
+                membership = get_active_membership(
+                    request.user, active_team_uuid
                 )
-                request.active_team = membership.team
             except TeamMembership.DoesNotExist:
                 request.active_team = None
                 # clear invalid session data
                 if 'active_team_uuid' in request.session:
                     del request.session['active_team_uuid']
+                return
+            # Only the cached fields are loaded, others are deferred
+            request.active_team = Team.from_db(
+                Team.objects.db,
+                ['id', 'uuid', 'name'],
+                [membership['team_id'], membership['uuid'],
+                 membership['name']],
+            )
+            request.active_team_role = membership['role']
         else:
             request.active_team = None
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from task_manager.usage import find_usage_drift
+
+
+def backfill(apps, schema_editor):
+    UsageCounter = apps.get_model('task_manager', 'UsageCounter')
+    _changed, created = find_usage_drift(apps.get_model)
+    UsageCounter.objects.bulk_create(created, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_manager', '0001_usage_counter'),
+        ('tasks', '0011_task_list_indexes'),
+        ('statuses', '0003_alter_status_description'),
+        ('labels', '0003_alter_label_creator'),
+        ('notes', '0002_alter_note_content_alter_note_title'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
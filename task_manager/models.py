@@ -0,0 +1,80 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+
+
+class UsageCounter(models.Model):
+    """
+    Materialized number of resources owned by a user or a team.
+
+    Kept in sync by signals on the counted models (see usage.py) so that
+    LimitService answers plan limit checks with one indexed read.
+    """
+    user = models.ForeignKey(
+        'user.User',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='usage_counters'
+    )
+    team = models.ForeignKey(
+        'teams.Team',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='usage_counters'
+    )
+    resource = models.CharField(max_length=32)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'resource'],
+                condition=Q(user__isnull=False),
+                name='usage_counter_user_resource_uniq'
+            ),
+            models.UniqueConstraint(
+                fields=['team', 'resource'],
+                condition=Q(team__isnull=False),
+                name='usage_counter_team_resource_uniq'
+            ),
+            models.CheckConstraint(
+                condition=(
+                    Q(user__isnull=False, team__isnull=True)
+                    | Q(user__isnull=True, team__isnull=False)
+                ),
+                name='usage_counter_single_owner'
+            ),
+        ]
+
+    @classmethod
+    def bump(cls, deltas):
+        """
+        Add deltas to counters, e.g. bump({('user', 1, 'tasks'): 1}).
+
+        Keys are (owner kind, owner id, resource) where the kind is
+        'user' or 'team'. Missing counters are created on increment.
+        """
+        for (kind, owner_id, resource), delta in deltas.items():
+            if not delta:
+                continue
+            lookup = {f'{kind}_id': owner_id, 'resource': resource}
+            updated = cls.objects.filter(**lookup).update(
+                count=Greatest(F('count') + delta, Value(0))
+            )
+            if updated or delta < 0:
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(count=delta, **lookup)
+            except IntegrityError:
+                # Created concurrently since the UPDATE above
+                cls.objects.filter(**lookup).update(count=F('count') + delta)
+
+    def __str__(self):
+        if self.user_id:
+            owner = f'user {self.user_id}'
+        else:
+            owner = f'team {self.team_id}'
+        return f'{owner}: {self.resource}={self.count}'
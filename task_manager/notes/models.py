@@ -1,15 +1,16 @@
 import uuid
 
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import RegexValidator, MaxLengthValidator
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.user.models import User
 from task_manager.teams.models import Team
+from task_manager import usage
 from task_manager.tasks.models import Task
 
 
-class Note(models.Model):
+class Note(usage.UsageCountedModel):
     id = models.AutoField(primary_key=True)
     uuid = models.UUIDField(
         default=uuid.uuid4,
@@ -74,6 +75,28 @@ class Note(models.Model):
         verbose_name = _('Note')
         verbose_name_plural = _('Notes')
 
+    USAGE_FIELDS = ('team_id', 'author_id')
+
+    def get_usage_keys(self):
+        if self.team_id:
+            return usage.usage_keys(('team', self.team_id, usage.TEAM_NOTES))
+        return usage.usage_keys(
+            ('user', self.author_id, usage.PERSONAL_NOTES)
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored task so signals can move the task notes
+        # counter on reassignment without re-reading the row
+        instance._saved_task_id = instance.__dict__.get('task_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The row and the task notes counter (post_save) change together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         if self.title:
             return self.title
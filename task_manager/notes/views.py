@@ -6,16 +6,19 @@ from django.utils.translation import gettext_lazy as _
 from django.views.generic import ListView, DetailView
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 
+from task_manager.conditional import ConditionalListMixin
 from task_manager.notes.models import Note
 from task_manager.notes.forms import NoteForm
-from task_manager.permissions import CustomPermissions
+from task_manager.permissions import CustomPermissions, get_permissions
 from task_manager.limit_service import LimitService
 
 
-class NoteListView(CustomPermissions, ListView):
+class NoteListView(CustomPermissions, ConditionalListMixin, ListView):
     model = Note
     template_name = 'notes/note_list.html'
     context_object_name = 'notes'
+    owner_field = 'author'
+    modified_field = 'updated_at'
 
     def get_queryset(self):
         user = self.request.user
@@ -110,7 +113,7 @@ class NoteUpdatePermissionMixin:
         is_author = note.author == request.user
         is_team_admin = (
             note.team
-            and note.team.is_admin(request.user)
+            and get_permissions(request).is_team_admin(note.team)
         )
         is_superuser = request.user.is_superuser
 
@@ -132,7 +135,7 @@ class NoteDeletePermissionMixin:
         is_author = note.author == request.user
         is_team_admin = (
             note.team
-            and note.team.is_admin(request.user)
+            and get_permissions(request).is_team_admin(note.team)
         )
         is_superuser = request.user.is_superuser
 
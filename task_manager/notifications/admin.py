@@ -1,12 +1,52 @@
 from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
-from task_manager.notifications.models import Notification
+from task_manager.notifications.models import (
+    Notification,
+    NotificationArchive,
+    NotificationOutbox,
+)
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ('recipient', 'notification_type', 'is_read',
-                    'created_at')
-    list_filter = ('notification_type', 'is_read', 'created_at')
+    list_display = ('recipient', 'notification_type', 'count', 'is_read',
+                    'updated_at')
+    list_filter = ('notification_type', 'is_read', 'updated_at')
     search_fields = ('recipient__username', 'message')
+    ordering = ('-updated_at',)
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'notification_type', 'count', 'is_read',
+                    'created_at')
+    list_filter = ('notification_type', 'is_read')
     ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'status', 'attempts', 'available_at',
+                    'created_at')
+    list_filter = ('status',)
+    readonly_fields = ('last_error', 'claim_token', 'locked_until')
+    ordering = ('available_at',)
+    actions = ('requeue',)
+
+    @admin.action(description=_('Requeue selected entries'))
+    def requeue(self, request, queryset):
+        queryset.update(
+            status=NotificationOutbox.Status.PENDING,
+            attempts=0,
+            available_at=timezone.now(),
+            claim_token='',
+            locked_until=None,
+        )
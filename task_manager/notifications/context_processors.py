@@ -1,19 +1,23 @@
-from task_manager.notifications.models import Notification
+from django.conf import settings
+from django.utils.functional import lazy
+
+from task_manager.notifications.unread import get_request_unread_count
 
 
 def notifications_context(request):
     """
-    Provides unread notifications and count for the authenticated user.
+    Provides the unread notification count for the authenticated user.
+
+    The count is lazy and cached (see unread.py): pages that do not show
+    it, and cache hits, run no query. The notifications themselves are
+    loaded by the dropdown from notifications:unread.
     """
     if not request.user.is_authenticated:
         return {}
 
-    unread_notifications = Notification.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).order_by('-created_at')[:10]
-
     return {
-        'unread_notifications': unread_notifications,
-        'unread_notifications_count': len(unread_notifications),
+        'unread_notifications_count': lazy(
+            get_request_unread_count, int
+        )(request),
+        'notification_live_updates': settings.NOTIFICATION_LIVE_UPDATES,
     }
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_created_at(apps, schema_editor):
+    """Existing notifications were last updated when they were created."""
+    Notification = apps.get_model('notifications', 'Notification')
+    Notification.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=1, verbose_name='Count')),
+                ('started_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Started at')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Updated at')),
+            ],
+            options={
+                'verbose_name': 'Notification digest',
+                'verbose_name_plural': 'Notification digests',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='notification',
+            options={'ordering': ['-updated_at'], 'verbose_name': 'Notification', 'verbose_name_plural': 'Notifications'},
+        ),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notif_recip_read_created_idx',
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='count',
+            field=models.PositiveIntegerField(default=1, verbose_name='Count'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='group_key',
+            field=models.CharField(blank=True, max_length=64, verbose_name='Group key'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Updated at'),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('task_assigned', 'Task assigned'), ('task_unassigned', 'Task unassigned'), ('task_status_changed', 'Task status changed'), ('task_completed', 'Task completed'), ('team_join_request', 'Team join request'), ('team_member_joined', 'Team member joined'), ('team_request_approved', 'Team request approved'), ('team_request_rejected', 'Team request rejected'), ('team_member_removed', 'Team member removed'), ('team_role_changed', 'Team role changed'), ('team_invited', 'Team invited'), ('team_deleted', 'Team deleted'), ('digest', 'Digest')], max_length=30, verbose_name='Notification type'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'is_read', 'updated_at'], name='notif_recip_read_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationdigest',
+            name='recipient',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notification_digest', to=settings.AUTH_USER_MODEL, verbose_name='Recipient'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0005_notification_coalescing_and_digest'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('notification_type', models.CharField(choices=[('task_assigned', 'Task assigned'), ('task_unassigned', 'Task unassigned'), ('task_status_changed', 'Task status changed'), ('task_completed', 'Task completed'), ('team_join_request', 'Team join request'), ('team_member_joined', 'Team member joined'), ('team_request_approved', 'Team request approved'), ('team_request_rejected', 'Team request rejected'), ('team_member_removed', 'Team member removed'), ('team_role_changed', 'Team role changed'), ('team_invited', 'Team invited'), ('team_deleted', 'Team deleted'), ('digest', 'Digest')], max_length=30, verbose_name='Notification type')),
+                ('message', models.TextField(blank=True, verbose_name='Message')),
+                ('message_key', models.CharField(blank=True, max_length=255, verbose_name='Message key')),
+                ('message_params', models.JSONField(blank=True, default=dict, verbose_name='Message parameters')),
+                ('action_url', models.CharField(blank=True, max_length=500, verbose_name='Action URL')),
+                ('is_read', models.BooleanField(default=False, verbose_name='Is read')),
+                ('group_key', models.CharField(blank=True, max_length=64, verbose_name='Group key')),
+                ('count', models.IntegerField(default=1, verbose_name='Count')),
+                ('created_at', models.DateTimeField(verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(verbose_name='Updated at')),
+                ('recipient', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL, verbose_name='Recipient')),
+            ],
+            options={
+                'verbose_name': 'Archived notification',
+                'verbose_name_plural': 'Notification archive',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
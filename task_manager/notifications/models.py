@@ -1,9 +1,22 @@
+from functools import lru_cache
+
 from django.db import models
+from django.db.models import F
+from django.utils import timezone, translation
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.user.models import User
 
 
+@lru_cache(maxsize=1024)
+def message_template(language, message_key):
+    """
+    Translated template of a message key, cached per language. The
+    catalog of the active language is used, language is the cache key.
+    """
+    return translation.gettext(message_key)
+
+
 class Notification(models.Model):
     class NotificationType(models.TextChoices):
         TASK_ASSIGNED = 'task_assigned', _('Task assigned')
@@ -32,6 +45,7 @@ class Notification(models.Model):
         )
         TEAM_INVITED = 'team_invited', _('Team invited')
         TEAM_DELETED = 'team_deleted', _('Team deleted')
+        DIGEST = 'digest', _('Digest')
 
     recipient = models.ForeignKey(
         User,
@@ -44,6 +58,7 @@ class Notification(models.Model):
         choices=NotificationType.choices,
         verbose_name=_('Notification type')
     )
+    # Empty for notifications with a message_key, see compact_notifications
     message = models.TextField(
         verbose_name=_('Message'),
         blank=True,
@@ -73,17 +88,33 @@ class Notification(models.Model):
         default=False,
         verbose_name=_('Is read')
     )
+    # Repeated events about the same subject (e.g. 'task:<pk>') update one
+    # unread row instead of adding rows, see services._coalesce()
+    group_key = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name=_('Group key')
+    )
+    count = models.PositiveIntegerField(
+        default=1,
+        verbose_name=_('Count')
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name=_('Created at')
     )
+    # Time of the latest coalesced event
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_('Updated at')
+    )
 
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-updated_at']
         indexes = [
             models.Index(
-                fields=['recipient', 'is_read', 'created_at'],
-                name='notif_recip_read_created_idx'
+                fields=['recipient', 'is_read', 'updated_at'],
+                name='notif_recip_read_updated_idx'
             ),
         ]
         verbose_name = _('Notification')
@@ -91,24 +122,30 @@ class Notification(models.Model):
 
     def mark_as_read(self):
         """
-        Mark notification as read using update_fields
-        to avoid unnecessary DB writes.
+        Mark notification as read. Returns whether this call changed it:
+        the UPDATE only matches an unread row, so of concurrent calls
+        only one reports the change.
         """
-        if not self.is_read:
-            self.is_read = True
-            self.save(update_fields=['is_read'])
+        if self.is_read:
+            return False
+        self.is_read = True
+        return bool(
+            Notification.objects.filter(pk=self.pk, is_read=False)
+            .update(is_read=True)
+        )
 
     def get_message(self):
         """
         Returns the translated message.
-        If message_key and message_params are set, translates the template.
-        Otherwise returns the legacy message field.
+        If message_key is set, translates the template and fills in
+        message_params. Otherwise returns the legacy message field.
         """
-        if self.message_key and self.message_params:
-            from django.utils.translation import gettext as _
+        if self.message_key:
             # message_key is actually the msgid (English template)
             # e.g., "Status of task '{task_name}' has been changed"
-            template = _(self.message_key)
+            template = message_template(
+                translation.get_language(), self.message_key
+            )
             try:
                 return template.format(**self.message_params)
             except (KeyError, TypeError):
@@ -119,3 +156,160 @@ class Notification(models.Model):
         return (
             f"{self.notification_type} - {self.recipient.username}"
         )
+
+
+class NotificationArchive(models.Model):
+    """
+    Notifications moved out of the live table by archive_notifications.
+
+    Columns match Notification exactly, so on PostgreSQL whole monthly
+    partitions can be moved here by detaching and attaching them (see
+    notifications/partitions.py).
+    """
+    id = models.BigIntegerField(primary_key=True)
+    # No database constraint: moved partitions keep their own
+    recipient = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name='archived_notifications',
+        verbose_name=_('Recipient')
+    )
+    notification_type = models.CharField(
+        max_length=30,
+        choices=Notification.NotificationType.choices,
+        verbose_name=_('Notification type')
+    )
+    message = models.TextField(blank=True, verbose_name=_('Message'))
+    message_key = models.CharField(
+        max_length=255, blank=True, verbose_name=_('Message key')
+    )
+    message_params = models.JSONField(
+        default=dict, blank=True, verbose_name=_('Message parameters')
+    )
+    action_url = models.CharField(
+        max_length=500, blank=True, verbose_name=_('Action URL')
+    )
+    is_read = models.BooleanField(default=False, verbose_name=_('Is read'))
+    group_key = models.CharField(
+        max_length=64, blank=True, verbose_name=_('Group key')
+    )
+    # Not positive: a CHECK constraint here would have to match the one
+    # moved partitions bring along by name
+    count = models.IntegerField(default=1, verbose_name=_('Count'))
+    created_at = models.DateTimeField(verbose_name=_('Created at'))
+    updated_at = models.DateTimeField(verbose_name=_('Updated at'))
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = _('Archived notification')
+        verbose_name_plural = _('Notification archive')
+
+    get_message = Notification.get_message
+
+    def __str__(self):
+        return f"{self.notification_type} - {self.recipient_id}"
+
+
+class NotificationDigest(models.Model):
+    """
+    Low-priority notifications held back for a user in digest mode.
+
+    Only a count is kept; send_notification_digests turns it into a
+    single DIGEST notification once NOTIFICATION_DIGEST_INTERVAL has
+    passed since the first held back event.
+    """
+    recipient = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='notification_digest',
+        verbose_name=_('Recipient')
+    )
+    count = models.PositiveIntegerField(default=1, verbose_name=_('Count'))
+    started_at = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        verbose_name=_('Started at')
+    )
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_('Updated at')
+    )
+
+    class Meta:
+        verbose_name = _('Notification digest')
+        verbose_name_plural = _('Notification digests')
+
+    @classmethod
+    def add(cls, recipient_ids):
+        """Count one more held back notification for each recipient."""
+        now = timezone.now()
+        updated = cls.objects.filter(recipient_id__in=recipient_ids).update(
+            count=F('count') + 1, updated_at=now
+        )
+        if updated < len(recipient_ids):
+            # Existing digests conflict and are skipped, the rest start now
+            cls.objects.bulk_create(
+                [
+                    cls(recipient_id=pk, started_at=now, updated_at=now)
+                    for pk in recipient_ids
+                ],
+                ignore_conflicts=True,
+            )
+
+    def __str__(self):
+        return f"{self.recipient_id} - {self.count}"
+
+
+class NotificationOutbox(models.Model):
+    """
+    Notification fan-out waiting to be written by the delivery worker.
+
+    Rows are added when the transaction that triggered the notification
+    commits and are deleted once their notifications exist. Failed rows
+    are retried with a growing delay and end up DEAD after too many
+    attempts.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        PROCESSING = 'processing', _('Processing')
+        DEAD = 'dead', _('Dead')
+
+    payload = models.JSONField(verbose_name=_('Payload'))
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_('Status')
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('Attempts')
+    )
+    available_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_('Available at')
+    )
+    claim_token = models.CharField(max_length=32, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, verbose_name=_('Last error'))
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Created at')
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'available_at'],
+                name='notif_outbox_status_avail_idx'
+            ),
+        ]
+        verbose_name = _('Notification outbox entry')
+        verbose_name_plural = _('Notification outbox')
+
+    def __str__(self):
+        notification_type = self.payload.get('notification', {}).get(
+            'notification_type'
+        )
+        return f"{notification_type} - {self.status}"
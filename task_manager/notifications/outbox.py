@@ -0,0 +1,136 @@
+"""
+Delivery of notifications queued in NotificationOutbox.
+
+Workers claim a batch of due entries by marking them PROCESSING with a
+random claim token and a lease. On databases with SKIP LOCKED (PostgreSQL)
+the candidate rows are locked while they are claimed, so concurrent
+workers never wait on each other or pick the same rows. Elsewhere (SQLite)
+the claiming UPDATE repeats the claimable condition: a row claimed by
+another worker in the meantime no longer matches and is left to it.
+
+Delivery is at least once: an entry whose worker died is claimed again
+when its lease expires.
+"""
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from task_manager.notifications import services
+from task_manager.notifications.models import NotificationOutbox
+
+
+logger = logging.getLogger(__name__)
+
+Status = NotificationOutbox.Status
+
+
+def _claimable(now):
+    return (
+        Q(status=Status.PENDING, available_at__lte=now)
+        | Q(status=Status.PROCESSING, locked_until__lt=now)
+    )
+
+
+def claim_batch(batch_size):
+    """Claim up to batch_size due outbox entries and return them."""
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    with transaction.atomic():
+        candidates = NotificationOutbox.objects.filter(
+            _claimable(now)
+        ).order_by('available_at', 'pk')
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return []
+        NotificationOutbox.objects.filter(
+            _claimable(now), pk__in=ids
+        ).update(
+            status=Status.PROCESSING,
+            claim_token=token,
+            locked_until=now + timedelta(
+                seconds=settings.NOTIFICATION_OUTBOX_LEASE
+            ),
+        )
+    return list(
+        NotificationOutbox.objects.filter(claim_token=token)
+        .order_by('available_at', 'pk')
+    )
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt, doubling each time."""
+    return settings.NOTIFICATION_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def process(entry):
+    """
+    Write the notifications of a claimed entry and delete it in one
+    transaction. On failure the entry is released for a retry, or marked
+    DEAD once it has used up NOTIFICATION_OUTBOX_MAX_ATTEMPTS.
+
+    Returns the resulting status: None when delivered, PROCESSING when
+    the lease expired and another worker has claimed the entry since.
+    """
+    mine = NotificationOutbox.objects.filter(
+        pk=entry.pk, claim_token=entry.claim_token
+    )
+    try:
+        with transaction.atomic():
+            # Deleting first holds the row until the notifications exist
+            if not mine.delete()[0]:
+                return Status.PROCESSING
+            services.deliver(entry.payload)
+        return None
+    except Exception as error:
+        attempts = entry.attempts + 1
+        if attempts >= settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS:
+            status = Status.DEAD
+            logger.exception('Notification outbox entry %s is dead', entry.pk)
+        else:
+            status = Status.PENDING
+            logger.warning(
+                'Notification outbox entry %s failed (attempt %s): %r',
+                entry.pk, attempts, error,
+            )
+        mine.update(
+            status=status,
+            attempts=attempts,
+            available_at=timezone.now() + timedelta(
+                seconds=retry_delay(attempts)
+            ),
+            claim_token='',
+            locked_until=None,
+            last_error=repr(error),
+        )
+        return status
+
+
+def run(batch_size, poll_interval, stop, once=False):
+    """
+    Claim and process batches until stop is set, or, with once, until no
+    entry is due. Returns a dict of delivered/retried/dead/skipped counts.
+    """
+    counts = {'delivered': 0, 'retried': 0, 'dead': 0, 'skipped': 0}
+    names = {
+        None: 'delivered',
+        Status.PENDING: 'retried',
+        Status.DEAD: 'dead',
+        Status.PROCESSING: 'skipped',
+    }
+    while not stop.is_set():
+        batch = claim_batch(batch_size)
+        for entry in batch:
+            counts[names[process(entry)]] += 1
+        if batch:
+            continue
+        if once:
+            break
+        stop.wait(poll_interval)
+    return counts
@@ -0,0 +1,316 @@
+"""
+Monthly partitions of notifications on PostgreSQL, and the archive tier.
+
+``partition_notifications`` turns notifications_notification and the
+archive table into tables partitioned by month of ``created_at``, one
+partition per month named ``<table>_pYYYY_MM`` plus a DEFAULT partition,
+and creates partitions for the coming months. ``archive_notifications``
+then moves months older than NOTIFICATION_ARCHIVE_AFTER_DAYS to the
+archive by detaching their partition from the live table and attaching
+it to the archive, and drops archived months older than
+NOTIFICATION_ARCHIVE_RETENTION_DAYS: no rows are copied or deleted.
+
+Other databases (SQLite), and PostgreSQL before the conversion, keep
+plain tables; there old rows are copied to the archive and deleted in
+batches, and old archived rows are deleted in batches.
+
+PostgreSQL needs the partition key in the primary key, so partitioned
+tables have a primary key on (id, created_at). The id stays unique, it
+comes from one sequence.
+"""
+import re
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.db import connection, transaction
+
+from task_manager.notifications.models import (
+    Notification,
+    NotificationArchive,
+)
+from task_manager.notifications.unread import invalidate_unread
+
+
+PARTITION_KEY = 'created_at'
+
+
+def month_start(value):
+    """First day of the month of a date or datetime."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, months):
+    index = month.month - 1 + months
+    return date(month.year + index // 12, index % 12 + 1, 1)
+
+
+def _bound(month):
+    return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(model, month):
+    return f'{model._meta.db_table}_p{month:%Y_%m}'
+
+
+def qn_table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def supports_partitioning():
+    return connection.vendor == 'postgresql'
+
+
+def is_partitioned(model):
+    """Whether the table of model is partitioned (PostgreSQL only)."""
+    if not supports_partitioning():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table '
+            'WHERE partrelid = %s::regclass',
+            [model._meta.db_table],
+        )
+        return cursor.fetchone() is not None
+
+
+def monthly_partitions(model):
+    """{month: partition name} of the monthly partitions of model."""
+    pattern = re.compile(
+        re.escape(model._meta.db_table) + r'_p(\d{4})_(\d{2})$'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = %s::regclass',
+            [model._meta.db_table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def create_partition(schema_editor, model, month):
+    qn = schema_editor.quote_name
+    schema_editor.execute(
+        f'CREATE TABLE IF NOT EXISTS {qn(partition_name(model, month))} '
+        f'PARTITION OF {qn(model._meta.db_table)} '
+        f'FOR VALUES FROM (%s) TO (%s)',
+        [_bound(month), _bound(add_months(month, 1))],
+    )
+
+
+def ensure_partitions(model, until):
+    """
+    Create the monthly partitions of model from the current month through
+    the month of until. Returns the names of the partitions created.
+    """
+    existing = monthly_partitions(model)
+    month = month_start(datetime.now(dt_timezone.utc))
+    created = []
+    with connection.schema_editor() as schema_editor:
+        while month <= month_start(until):
+            if month not in existing:
+                create_partition(schema_editor, model, month)
+                created.append(partition_name(model, month))
+            month = add_months(month, 1)
+    return created
+
+
+def _months_with_rows(table, cursor):
+    cursor.execute(
+        f'SELECT MIN({PARTITION_KEY}), MAX({PARTITION_KEY}) FROM {table}'
+    )
+    first, last = cursor.fetchone()
+    if first is None:
+        return []
+    months = [month_start(first)]
+    while months[-1] < month_start(last):
+        months.append(add_months(months[-1], 1))
+    return months
+
+
+def _add_id_sequence(schema_editor, table):
+    # Identity columns are not allowed on partitions before PostgreSQL 17,
+    # so ids of a partitioned table come from a plain sequence
+    qn = schema_editor.quote_name
+    sequence = qn(f'{table}_id_partitioned_seq')
+    schema_editor.execute(
+        f'CREATE SEQUENCE {sequence} OWNED BY {qn(table)}.id'
+    )
+    schema_editor.execute(
+        f'ALTER TABLE {qn(table)} ALTER COLUMN id '
+        f"SET DEFAULT nextval('{sequence}')"
+    )
+    return sequence
+
+
+def _add_keys_and_indexes(schema_editor, model):
+    # Built after the copy, on the parent and every partition
+    schema_editor.execute(
+        f'ALTER TABLE {qn_table(model)} '
+        f'ADD PRIMARY KEY (id, {schema_editor.quote_name(PARTITION_KEY)})'
+    )
+    for sql in schema_editor._model_indexes_sql(model):
+        schema_editor.execute(sql)
+    for field in model._meta.local_fields:
+        if field.remote_field and field.db_constraint:
+            schema_editor.execute(schema_editor._create_fk_sql(
+                model, field, '_fk_%(to_table)s_%(to_column)s'
+            ))
+
+
+def partition_table(model):
+    """
+    Rebuild the table of model as a partitioned table with the same
+    columns, rows, indexes and foreign keys. The table is locked while
+    its rows are copied, so run this in a maintenance window.
+    """
+    table = model._meta.db_table
+    old = f'{table}_unpartitioned'
+    with transaction.atomic(), connection.schema_editor() as schema_editor:
+        qn = schema_editor.quote_name
+        schema_editor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}')
+        schema_editor.execute(
+            f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS '
+            f'INCLUDING CONSTRAINTS INCLUDING STORAGE) '
+            f'PARTITION BY RANGE ({qn(PARTITION_KEY)})'
+        )
+        sequence = None
+        if model._meta.pk.db_returning:
+            sequence = _add_id_sequence(schema_editor, table)
+        schema_editor.execute(
+            f'CREATE TABLE {qn(table + "_pdefault")} '
+            f'PARTITION OF {qn(table)} DEFAULT'
+        )
+        with connection.cursor() as cursor:
+            for month in _months_with_rows(qn(old), cursor):
+                create_partition(schema_editor, model, month)
+        schema_editor.execute(
+            f'INSERT INTO {qn(table)} SELECT * FROM {qn(old)}'
+        )
+        if sequence:
+            schema_editor.execute(
+                f"SELECT setval('{sequence}', "
+                f'COALESCE(MAX(id), 0) + 1, false) FROM {qn(table)}'
+            )
+        schema_editor.execute(f'DROP TABLE {qn(old)}')
+        _add_keys_and_indexes(schema_editor, model)
+
+
+def archive_partitions(before):
+    """
+    Move the monthly partitions of the live table that end on or before
+    the month of before to the archive. Returns the months moved.
+
+    A coalesced notification keeps its created_at while updated_at moves
+    on, so an old partition can hold unread notifications still active
+    in the bell: such partitions stay live until a later run.
+    """
+    live = qn_table(Notification)
+    archive = qn_table(NotificationArchive)
+    moved = []
+    for month, name in sorted(monthly_partitions(Notification).items()):
+        if add_months(month, 1) > month_start(before):
+            break
+        archived = connection.ops.quote_name(
+            partition_name(NotificationArchive, month)
+        )
+        name = connection.ops.quote_name(name)
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Coalescing updates wait until the partition is moved
+            cursor.execute(f'LOCK TABLE {name} IN SHARE ROW EXCLUSIVE MODE')
+            cursor.execute(
+                f'SELECT 1 FROM {name} '
+                f'WHERE NOT is_read AND updated_at >= %s LIMIT 1',
+                [before],
+            )
+            if cursor.fetchone():
+                continue
+            cursor.execute(
+                f'SELECT DISTINCT recipient_id FROM {name} WHERE NOT is_read'
+            )
+            invalidate_unread(*(row[0] for row in cursor.fetchall()))
+            cursor.execute(f'ALTER TABLE {live} DETACH PARTITION {name}')
+            cursor.execute(f'ALTER TABLE {name} RENAME TO {archived}')
+            cursor.execute(
+                f'ALTER TABLE {archive} ATTACH PARTITION {archived} '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [_bound(month), _bound(add_months(month, 1))],
+            )
+        moved.append(month)
+    return moved
+
+
+def archive_rows(before, batch_size):
+    """
+    Copy notifications created before before to the archive and delete
+    them, batch by batch in id order, each batch in its own transaction.
+    Unread notifications updated since before (coalesced ones) are kept.
+    Returns the number of notifications moved.
+    """
+    fields = Notification._meta.concrete_fields
+    columns = [field.column for field in fields]
+    attnames = [field.attname for field in fields]
+    insert = 'INSERT INTO {} ({}) '.format(
+        qn_table(NotificationArchive),
+        ', '.join(connection.ops.quote_name(c) for c in columns),
+    )
+    old = Notification.objects.filter(created_at__lt=before).exclude(
+        is_read=False, updated_at__gte=before
+    ).order_by()
+    moved = 0
+    while True:
+        ids = list(
+            old.order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return moved
+        batch = old.filter(pk__gte=ids[0], pk__lte=ids[-1])
+        with transaction.atomic():
+            invalidate_unread(*set(
+                batch.filter(is_read=False)
+                .values_list('recipient_id', flat=True)
+            ))
+            select, params = batch.values_list(
+                *attnames
+            ).query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(insert + select, params)
+            moved += batch._raw_delete(batch.db)
+
+
+def drop_archive_partitions(before):
+    """
+    Drop the monthly partitions of the archive that end on or before the
+    month of before. Returns the months dropped.
+    """
+    dropped = []
+    partitions = monthly_partitions(NotificationArchive)
+    for month, name in sorted(partitions.items()):
+        if add_months(month, 1) > month_start(before):
+            break
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE {connection.ops.quote_name(name)}')
+        dropped.append(month)
+    return dropped
+
+
+def delete_archived_rows(before, batch_size):
+    """
+    Delete archived notifications created before before, batch by batch.
+    Returns the number deleted.
+    """
+    old = NotificationArchive.objects.filter(created_at__lt=before)
+    deleted = 0
+    while True:
+        ids = list(
+            old.order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        batch = old.filter(pk__gte=ids[0], pk__lte=ids[-1])
+        deleted += batch._raw_delete(batch.db)
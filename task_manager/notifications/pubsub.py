@@ -0,0 +1,82 @@
+"""
+In-process publish/subscribe for live notification updates.
+
+Open streams of a user subscribe here and are woken up when notifications
+of that user change in this process. Events carry no data: a woken
+stream reads the current state itself, so several changes while it is
+busy make one wake-up. Changes made by other processes (other server
+workers, the outbox worker) are not seen here; streams notice them when
+they recheck the unread count on each heartbeat.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from functools import partial
+
+from django.db import transaction
+
+
+_subscriptions = defaultdict(set)
+_lock = threading.Lock()
+
+
+class Subscription:
+    """
+    Wake-ups for one stream of a user, registered while used as a
+    context manager. Must be created on the stream's event loop.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+
+    def __enter__(self):
+        with _lock:
+            _subscriptions[self.user_id].add(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        with _lock:
+            subscriptions = _subscriptions[self.user_id]
+            subscriptions.discard(self)
+            if not subscriptions:
+                del _subscriptions[self.user_id]
+
+    async def wait(self, timeout):
+        """
+        Wait up to timeout seconds for a change. Returns whether there
+        was one; changes published before the call count too.
+        """
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+    def _wake(self):
+        try:
+            self._loop.call_soon_threadsafe(self._changed.set)
+        except RuntimeError:
+            # The loop of a finished request is closed
+            pass
+
+
+def publish(user_ids):
+    """Wake the streams of the given users. Safe to call from any thread."""
+    with _lock:
+        woken = [
+            subscription
+            for user_id in user_ids
+            for subscription in _subscriptions.get(user_id, ())
+        ]
+    for subscription in woken:
+        subscription._wake()
+
+
+def publish_on_commit(user_ids):
+    """Wake the streams of the given users when the transaction commits."""
+    user_ids = set(user_ids)
+    if user_ids:
+        transaction.on_commit(partial(publish, user_ids))
@@ -1,73 +1,279 @@
-from django.urls import reverse
-from django.utils.translation import gettext_lazy as _
+from collections import namedtuple
+from datetime import timedelta
+from functools import partial
 
-from task_manager.notifications.models import Notification
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_noop
+
+from task_manager.notifications.models import (
+    Notification,
+    NotificationDigest,
+    NotificationOutbox,
+)
+from task_manager.notifications.pubsub import publish_on_commit
+from task_manager.notifications.unread import add_unread
+from task_manager.tasks.models import Task
 from task_manager.user.models import User
 
 
-def _create(recipient, notification_type, message_key='', message_params=None,
-            message='', action_url=''):
+# Repeats of these update the recipient's unread row about the same subject
+COALESCED_TYPES = {
+    Notification.NotificationType.TASK_STATUS_CHANGED,
+}
+
+# Low-priority types that users in digest mode get as one summary
+DIGEST_TYPES = {
+    Notification.NotificationType.TASK_STATUS_CHANGED,
+    Notification.NotificationType.TASK_COMPLETED,
+    Notification.NotificationType.TEAM_MEMBER_JOINED,
+}
+
+
+class RecipientSet(namedtuple('RecipientSet', ['name', 'key'])):
+    """
+    Recipients named by a resolver in RECIPIENT_SETS and its argument,
+    e.g. RecipientSet('task', task.pk). Unlike a queryset it can be
+    stored in the outbox and resolved by the delivery worker.
+    """
+
+
+def _task_recipients(task_id):
+    """Task author and executors, resolved together in one query."""
+    executor_ids = Task.executors.through.objects.filter(
+        task_id=task_id
+    ).values('user_id')
+    author_ids = Task.objects.filter(pk=task_id).values('author_id')
+    return User.objects.filter(
+        Q(pk__in=author_ids) | Q(pk__in=executor_ids)
+    )
+
+
+def _team_admins(team_id):
+    return User.objects.filter(
+        team_memberships__team_id=team_id,
+        team_memberships__role='admin',
+        team_memberships__status='active',
+    )
+
+
+RECIPIENT_SETS = {
+    'task': _task_recipients,
+    'team_admins': _team_admins,
+}
+
+
+def _resolve_recipients(recipients):
+    """
+    Resolve a recipient set to {user id: whether the user is in digest
+    mode}.
+
+    recipients may be a RecipientSet, a single User, a User queryset or
+    an iterable of User objects and primary keys. Querysets and bare
+    primary keys are resolved with one query, so missing users are
+    skipped; User objects are used as they are.
+    """
+    if isinstance(recipients, RecipientSet):
+        recipients = RECIPIENT_SETS[recipients.name](recipients.key)
+    if isinstance(recipients, User):
+        return {recipients.pk: recipients.digest_notifications}
+    if isinstance(recipients, QuerySet):
+        return dict(recipients.values_list('pk', 'digest_notifications'))
+
+    recipients = list(recipients)
+    resolved = {
+        r.pk: r.digest_notifications
+        for r in recipients if isinstance(r, User)
+    }
+    pks = {r for r in recipients if not isinstance(r, User)} - set(resolved)
+    if pks:
+        resolved.update(
+            User.objects.filter(pk__in=pks)
+            .values_list('pk', 'digest_notifications')
+        )
+    return resolved
+
+
+def _serialize_recipients(recipients):
+    """Recipient set as stored in an outbox payload."""
+    if isinstance(recipients, RecipientSet):
+        return {'set': list(recipients)}
+    if isinstance(recipients, User):
+        recipients = [recipients]
+    if isinstance(recipients, QuerySet):
+        recipients = recipients.values_list('pk', flat=True)
+    # Users are stored as ids and checked again on delivery: they may be
+    # deleted before the worker gets to them
+    return {'ids': [getattr(r, 'pk', r) for r in recipients]}
+
+
+def _coalesce(recipient_ids, fields):
+    """
+    Fold the notification into recent unread rows of the same type and
+    group: their count goes up and they show the latest message. Returns
+    the ids of recipients that had such a row.
+    """
+    window = settings.NOTIFICATION_COALESCE_WINDOW
+    if not recipient_ids or not window or not fields.get('group_key'):
+        return set()
+
+    now = timezone.now()
+    rows = dict(
+        Notification.objects.filter(
+            recipient_id__in=recipient_ids,
+            notification_type=fields['notification_type'],
+            group_key=fields['group_key'],
+            is_read=False,
+            updated_at__gte=now - timedelta(seconds=window),
+        ).values_list('pk', 'recipient_id')
+    )
+    if rows:
+        Notification.objects.filter(pk__in=rows).update(
+            count=F('count') + 1,
+            updated_at=now,
+            message=fields['message'],
+            message_params=fields['message_params'],
+            action_url=fields['action_url'],
+        )
+    return set(rows.values())
+
+
+def _bulk_create(recipients, fields, exclude_id=None):
+    recipients = _resolve_recipients(recipients)
+    recipients.pop(exclude_id, None)
+    recipient_ids = set(recipients)
+    notification_type = fields['notification_type']
+    if notification_type in DIGEST_TYPES:
+        # Held back for users in digest mode
+        digest_ids = {pk for pk, digest in recipients.items() if digest}
+        if digest_ids:
+            NotificationDigest.add(digest_ids)
+            recipient_ids -= digest_ids
+    if notification_type in COALESCED_TYPES:
+        coalesced_ids = _coalesce(recipient_ids, fields)
+        publish_on_commit(coalesced_ids)
+        recipient_ids -= coalesced_ids
+    if not recipient_ids:
+        return []
+
+    created = Notification.objects.bulk_create([
+        Notification(recipient_id=recipient_id, **fields)
+        for recipient_id in sorted(recipient_ids)
+    ])
+    # Coalesced rows were unread already and do not change the count
+    add_unread(recipient_ids)
+    publish_on_commit(recipient_ids)
+    return created
+
+
+def deliver(payload):
+    """
+    Write the notifications of an outbox payload (see _create).
+    Used by the delivery worker.
+    """
+    recipients = payload['recipients']
+    if 'set' in recipients:
+        recipients = RecipientSet(*recipients['set'])
+    else:
+        recipients = recipients['ids']
+    return _bulk_create(
+        recipients, payload['notification'], payload.get('exclude')
+    )
+
+
+def _create(recipients, notification_type, message_key='',
+            message_params=None, message='', action_url='', exclude=None,
+            group_key=''):
     """
-    Private helper to create a notification.
+    Private helper to create notifications for a set of recipients.
     All public functions use this to avoid code duplication.
 
+    Recipients are resolved with at most one query and all notifications
+    are written with a single bulk_create, so the cost of a fan-out does
+    not grow with the number of recipients.
+
+    With NOTIFICATION_DELIVERY = 'outbox' nothing is written here: the
+    fan-out is stored in NotificationOutbox when the current transaction
+    commits and the deliver_notifications worker writes it later.
+
     Args:
-        recipient: User who receives the notification
+        recipients: RecipientSet, User, User queryset or iterable of
+            users/primary keys
         notification_type: Type from NotificationType
         message_key: Translation key for the message template
         message_params: Dict of parameters for template formatting
-        message: Legacy field for backward compatibility
+        message: Legacy pre-rendered text, only for notifications
+            without a message_key
         action_url: URL for the notification action
+        exclude: User who never receives the notification (the actor)
+        group_key: Subject of the notification, e.g. 'task:<pk>'; repeated
+            notifications with the same key may be coalesced
+
+    Returns:
+        List of created notifications, empty when delivery is deferred.
+        Coalesced notifications and ones held back for a digest are not
+        included.
     """
-    Notification.objects.create(
-        recipient=recipient,
-        notification_type=notification_type,
-        message=message,
-        message_key=message_key,
-        message_params=message_params or {},
-        action_url=action_url,
+    fields = {
+        'notification_type': notification_type,
+        'message': str(message),
+        'message_key': message_key,
+        'message_params': message_params or {},
+        'action_url': action_url,
+        'group_key': group_key,
+    }
+    exclude_id = exclude.pk if exclude is not None else None
+
+    if settings.NOTIFICATION_DELIVERY != 'outbox':
+        return _bulk_create(recipients, fields, exclude_id)
+
+    payload = {
+        'recipients': _serialize_recipients(recipients),
+        'notification': fields,
+        'exclude': exclude_id,
+    }
+    transaction.on_commit(
+        partial(NotificationOutbox.objects.create, payload=payload)
     )
+    return []
 
 
-def notify_task_assigned(task, assignee, actor):
+def notify_task_assigned(task, assignees, actor):
     """
-    Notify user when assigned to a task.
-    Skip if user assigned themselves.
+    Notify users assigned to a task.
+    assignees is a user or a set of users/primary keys.
+    Skip the actor if they assigned themselves.
     """
-    if assignee == actor:
-        return
-
     action_url = reverse('tasks:tasks-list')
-    _create(
-        recipient=assignee,
+    return _create(
+        recipients=assignees,
         notification_type=Notification.NotificationType.TASK_ASSIGNED,
-        message_key='You have been assigned to task: {task_name}',
+        message_key=gettext_noop('You have been assigned to task: {task_name}'),
         message_params={'task_name': task.name},
-        message=_('You have been assigned to task: {task_name}').format(
-            task_name=task.name
-        ),
         action_url=action_url,
+        exclude=actor,
     )
 
 
-def notify_task_unassigned(task, assignee, actor):
+def notify_task_unassigned(task, assignees, actor):
     """
-    Notify user when removed from task executors.
-    Skip if user removed themselves.
+    Notify users removed from task executors.
+    assignees is a user or a set of users/primary keys.
+    Skip the actor if they removed themselves.
     """
-    if assignee == actor:
-        return
-
     action_url = reverse('tasks:tasks-list')
-    _create(
-        recipient=assignee,
+    return _create(
+        recipients=assignees,
         notification_type=Notification.NotificationType.TASK_UNASSIGNED,
-        message_key='You have been removed from task: {task_name}',
-        message_params={'task_name': task.name},
-        message=_('You have been removed from task: {task_name}').format(
-            task_name=task.name
+        message_key=gettext_noop(
+            'You have been removed from task: {task_name}'
         ),
+        message_params={'task_name': task.name},
         action_url=action_url,
+        exclude=actor,
     )
 
 
@@ -78,30 +284,20 @@ def notify_task_status_changed(task, actor):
     """
     action_url = reverse('tasks:tasks-list')
     message_params = {'task_name': task.name}
-    message = _('Status of task \'{task_name}\' has been changed').format(
-        **message_params
+    # Author and executors are collected as one set, so an author who is
+    # also an executor gets a single notification.
+    return _create(
+        recipients=RecipientSet('task', task.pk),
+        notification_type=Notification.NotificationType.TASK_STATUS_CHANGED,
+        message_key=gettext_noop(
+            'Status of task \'{task_name}\' has been changed'
+        ),
+        message_params=message_params,
+        action_url=action_url,
+        exclude=actor,
+        group_key=f'task:{task.pk}',
     )
 
-    # Collect unique recipients to prevent duplicate notifications
-    # when the author is also an executor.
-    recipients = set()
-    if task.author:
-        recipients.add(task.author)
-    for executor in task.executors.all():
-        recipients.add(executor)
-
-    for recipient in recipients:
-        if recipient == actor:
-            continue
-        _create(
-            recipient=recipient,
-            notification_type=Notification.NotificationType.TASK_STATUS_CHANGED,
-            message_key='Status of task \'{task_name}\' has been changed',
-            message_params=message_params,
-            message=message,
-            action_url=action_url,
-        )
-
 
 def notify_task_completed(task, actor):
     """
@@ -110,28 +306,17 @@ def notify_task_completed(task, actor):
     """
     action_url = reverse('tasks:tasks-list')
     message_params = {'task_name': task.name}
-    message = _('Task \'{task_name}\' has been completed').format(
-        **message_params
+    # Author and executors are collected as one set, so an author who is
+    # also an executor gets a single notification.
+    return _create(
+        recipients=RecipientSet('task', task.pk),
+        notification_type=Notification.NotificationType.TASK_COMPLETED,
+        message_key=gettext_noop('Task \'{task_name}\' has been completed'),
+        message_params=message_params,
+        action_url=action_url,
+        exclude=actor,
     )
 
-    recipients = set()
-    if task.author:
-        recipients.add(task.author)
-    for executor in task.executors.all():
-        recipients.add(executor)
-
-    for recipient in recipients:
-        if recipient == actor:
-            continue
-        _create(
-            recipient=recipient,
-            notification_type=Notification.NotificationType.TASK_COMPLETED,
-            message_key='Task \'{task_name}\' has been completed',
-            message_params=message_params,
-            message=message,
-            action_url=action_url,
-        )
-
 
 def notify_team_join_request(team, applicant):
     """
@@ -142,40 +327,26 @@ def notify_team_join_request(team, applicant):
         'username': applicant.username,
         'team_name': team.name,
     }
-    message = _(
-        '{username} wants to join team \'{team_name}\''
-    ).format(**message_params)
 
-    admins = User.objects.filter(
-        team_memberships__team=team,
-        team_memberships__role='admin',
-        team_memberships__status='active',
+    return _create(
+        recipients=RecipientSet('team_admins', team.pk),
+        notification_type=Notification.NotificationType.TEAM_JOIN_REQUEST,
+        message_key=gettext_noop(
+            '{username} wants to join team \'{team_name}\''
+        ),
+        message_params=message_params,
+        action_url=action_url,
     )
 
-    for admin in admins:
-        _create(
-            recipient=admin,
-            notification_type=Notification.NotificationType.TEAM_JOIN_REQUEST,
-            message_key='{username} wants to join team \'{team_name}\'',
-            message_params=message_params,
-            message=message,
-            action_url=action_url,
-        )
-
 
 def notify_team_member_joined(team, new_member):
     """
     Notify all team admins about a new member joining.
     Skip if the new member is an admin themselves.
     """
-    # Check if new_member is an admin
-    is_admin = team.memberships.filter(
-        user=new_member,
-        role='admin',
-        status='active',
-    ).exists()
-
-    if is_admin:
+    # Loading the admins once also tells whether new_member is one
+    admins = list(_team_admins(team.pk))
+    if new_member in admins:
         return
 
     action_url = reverse('teams:team-detail', kwargs={'uuid': team.uuid})
@@ -183,26 +354,15 @@ def notify_team_member_joined(team, new_member):
         'username': new_member.username,
         'team_name': team.name,
     }
-    message = _(
-        '{username} has joined team \'{team_name}\''
-    ).format(**message_params)
 
-    admins = User.objects.filter(
-        team_memberships__team=team,
-        team_memberships__role='admin',
-        team_memberships__status='active',
+    return _create(
+        recipients=admins,
+        notification_type=Notification.NotificationType.TEAM_MEMBER_JOINED,
+        message_key=gettext_noop('{username} has joined team \'{team_name}\''),
+        message_params=message_params,
+        action_url=action_url,
     )
 
-    for admin in admins:
-        _create(
-            recipient=admin,
-            notification_type=Notification.NotificationType.TEAM_MEMBER_JOINED,
-            message_key='{username} has joined team \'{team_name}\'',
-            message_params=message_params,
-            message=message,
-            action_url=action_url,
-        )
-
 
 def notify_request_approved(team, user):
     """
@@ -210,17 +370,13 @@ def notify_request_approved(team, user):
     """
     action_url = reverse('teams:team-detail', kwargs={'uuid': team.uuid})
     message_params = {'team_name': team.name}
-    message = _(
-        'Your request to join team \'{team_name}\' has been approved'
-    ).format(**message_params)
-    _create(
-        recipient=user,
+    return _create(
+        recipients=user,
         notification_type=Notification.NotificationType.TEAM_REQUEST_APPROVED,
-        message_key=(
+        message_key=gettext_noop(
             'Your request to join team \'{team_name}\' has been approved'
         ),
         message_params=message_params,
-        message=message,
         action_url=action_url,
     )
 
@@ -231,17 +387,13 @@ def notify_request_rejected(team, user):
     """
     action_url = reverse('teams:team-detail', kwargs={'uuid': team.uuid})
     message_params = {'team_name': team.name}
-    message = _(
-        'Your request to join team \'{team_name}\' has been rejected'
-    ).format(**message_params)
-    _create(
-        recipient=user,
+    return _create(
+        recipients=user,
         notification_type=Notification.NotificationType.TEAM_REQUEST_REJECTED,
-        message_key=(
+        message_key=gettext_noop(
             'Your request to join team \'{team_name}\' has been rejected'
         ),
         message_params=message_params,
-        message=message,
         action_url=action_url,
     )
 
@@ -256,15 +408,13 @@ def notify_member_removed(team, removed_user, actor):
 
     action_url = reverse('teams:team-detail', kwargs={'uuid': team.uuid})
     message_params = {'team_name': team.name}
-    message = _(
-        'You have been removed from team \'{team_name}\''
-    ).format(**message_params)
-    _create(
-        recipient=removed_user,
+    return _create(
+        recipients=removed_user,
         notification_type=Notification.NotificationType.TEAM_MEMBER_REMOVED,
-        message_key='You have been removed from team \'{team_name}\'',
+        message_key=gettext_noop(
+            'You have been removed from team \'{team_name}\''
+        ),
         message_params=message_params,
-        message=message,
         action_url=action_url,
     )
 
@@ -275,17 +425,13 @@ def notify_role_changed(team, user, new_role):
     """
     action_url = reverse('teams:team-detail', kwargs={'uuid': team.uuid})
     message_params = {'team_name': team.name, 'role': new_role}
-    message = _(
-        'Your role in team \'{team_name}\' has been changed to {role}'
-    ).format(**message_params)
-    _create(
-        recipient=user,
+    return _create(
+        recipients=user,
         notification_type=Notification.NotificationType.TEAM_ROLE_CHANGED,
-        message_key=(
+        message_key=gettext_noop(
             'Your role in team \'{team_name}\' has been changed to {role}'
         ),
         message_params=message_params,
-        message=message,
         action_url=action_url,
     )
 
@@ -296,15 +442,13 @@ def notify_team_invited(team, invited_user):
     """
     action_url = reverse('teams:team-detail', kwargs={'uuid': team.uuid})
     message_params = {'team_name': team.name}
-    message = _(
-        'You have been invited to join team \'{team_name}\''
-    ).format(**message_params)
-    _create(
-        recipient=invited_user,
+    return _create(
+        recipients=invited_user,
         notification_type=Notification.NotificationType.TEAM_INVITED,
-        message_key='You have been invited to join team \'{team_name}\'',
+        message_key=gettext_noop(
+            'You have been invited to join team \'{team_name}\''
+        ),
         message_params=message_params,
-        message=message,
         action_url=action_url,
     )
 
@@ -316,22 +460,48 @@ def notify_team_deleted(team, members):
     """
     action_url = reverse('teams:team-join')
     message_params = {'team_name': team.name}
-    message = _(
-        'Team \'{team_name}\' has been deleted'
-    ).format(**message_params)
 
-    # Ensure we have a list/queryset to iterate
-    if hasattr(members, 'all'):
-        members_list = members.all()
-    else:
-        members_list = members
-
-    for member in members_list:
-        _create(
-            recipient=member,
-            notification_type=Notification.NotificationType.TEAM_DELETED,
-            message_key='Team \'{team_name}\' has been deleted',
-            message_params=message_params,
-            message=message,
-            action_url=action_url,
+    return _create(
+        recipients=members,
+        notification_type=Notification.NotificationType.TEAM_DELETED,
+        message_key=gettext_noop('Team \'{team_name}\' has been deleted'),
+        message_params=message_params,
+        action_url=action_url,
+    )
+
+
+def send_due_digests():
+    """
+    Turn digests started more than NOTIFICATION_DIGEST_INTERVAL ago into
+    one DIGEST notification each. Returns the number of digests sent.
+    """
+    cutoff = timezone.now() - timedelta(
+        seconds=settings.NOTIFICATION_DIGEST_INTERVAL
+    )
+    action_url = reverse('tasks:tasks-list')
+
+    with transaction.atomic():
+        # Locked so that events held back meanwhile wait for the next digest
+        digests = list(
+            NotificationDigest.objects.select_for_update()
+            .filter(started_at__lte=cutoff)
         )
+        Notification.objects.bulk_create([
+            Notification(
+                recipient_id=digest.recipient_id,
+                notification_type=Notification.NotificationType.DIGEST,
+                message_key=gettext_noop(
+                    'New updates on your tasks and teams: {count}'
+                ),
+                message_params={'count': digest.count},
+                action_url=action_url,
+            )
+            for digest in digests
+        ])
+        NotificationDigest.objects.filter(
+            pk__in=[digest.pk for digest in digests]
+        ).delete()
+        recipient_ids = [digest.recipient_id for digest in digests]
+        add_unread(recipient_ids)
+        publish_on_commit(recipient_ids)
+    return len(digests)
@@ -0,0 +1,96 @@
+"""
+Per-user count of unread notifications, kept in the cache.
+
+The navbar bell shows it on every page, so a cache hit costs no query.
+Writers adjust the cached value once their transaction commits: new
+notifications increment it, marking one as read decrements it, marking
+all as read drops it. A missing value is counted in the database on the
+next read.
+
+The key includes a generation (see team_cache.py) read before counting.
+Writers that cannot adjust the cached value bump it instead of deleting
+the value: a count made before their commit, and cached after it, is
+then cached under the old generation and never read.
+
+The count is only cached when the cache is shared by all processes
+(settings.CACHE_SHARED), the delivery worker included: adjustments made
+in one process must reach the others. Otherwise it is counted on every
+read, once per request.
+"""
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from task_manager.notifications.models import Notification
+from task_manager.team_cache import (
+    bump_generation_now,
+    get_generation,
+)
+
+
+UNREAD_COUNT_CACHE_KEY = 'unread_notifications:{user_id}:{generation}'
+
+
+def _scope(user_id):
+    return f'unread:{user_id}'
+
+
+def _cache_key(user_id):
+    return UNREAD_COUNT_CACHE_KEY.format(
+        user_id=user_id, generation=get_generation(_scope(user_id))
+    )
+
+
+def _count_unread(user_id):
+    return Notification.objects.filter(
+        recipient_id=user_id, is_read=False
+    ).count()
+
+
+def get_unread_count(user_id):
+    """Number of unread notifications of the user."""
+    if not settings.CACHE_SHARED:
+        return _count_unread(user_id)
+    key = _cache_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = _count_unread(user_id)
+        cache.set(key, count, settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+    return count
+
+
+def get_request_unread_count(request):
+    """get_unread_count() for the user of request, read once per request."""
+    if not hasattr(request, '_unread_count'):
+        request._unread_count = get_unread_count(request.user.pk)
+    return request._unread_count
+
+
+def _adjust(user_ids, delta):
+    for user_id in user_ids:
+        try:
+            if cache.incr(_cache_key(user_id), delta) >= 0:
+                continue
+        except ValueError:
+            # Not cached: a read may be counting, outdated by this change
+            pass
+        bump_generation_now(_scope(user_id))
+
+
+def add_unread(user_ids, delta=1):
+    """
+    Change the cached count of each user in user_ids by delta (one per
+    user, so a list may repeat ids) when the transaction commits.
+    """
+    user_ids = list(user_ids)
+    if user_ids:
+        transaction.on_commit(partial(_adjust, user_ids, delta))
+
+
+def invalidate_unread(*user_ids):
+    """Drop the cached counts of the given users on commit."""
+    transaction.on_commit(
+        partial(bump_generation_now, *(_scope(pk) for pk in user_ids))
+    )
@@ -5,6 +5,9 @@ from task_manager.notifications import views
 app_name = 'notifications'
 
 urlpatterns = [
+    path('unread/', views.unread_list, name='unread'),
+    path('stream/', views.stream, name='stream'),
+    path('poll/', views.poll, name='poll'),
     path('<int:pk>/read/', views.mark_read, name='mark-read'),
     path('mark-all-read/', views.mark_all_read, name='mark-all-read'),
 ]
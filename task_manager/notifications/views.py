@@ -1,9 +1,192 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
-from django.views.decorators.http import require_POST
+from django.utils import timezone, translation
+from django.utils.dateparse import parse_datetime
+from django.utils.timesince import timesince
+from django.utils.translation import gettext as _
+from django.views.decorators.http import require_GET, require_POST
 
 from task_manager.notifications.models import Notification
+from task_manager.notifications.pubsub import Subscription, publish_on_commit
+from task_manager.notifications.unread import (
+    add_unread,
+    get_unread_count,
+    invalidate_unread,
+)
+
+
+NotificationType = Notification.NotificationType
+
+# Bootstrap icon shown next to each notification type in the dropdown
+NOTIFICATION_ICONS = {
+    NotificationType.TASK_ASSIGNED: 'bi-person-plus text-primary',
+    NotificationType.TASK_UNASSIGNED: 'bi-person-dash text-warning',
+    NotificationType.TASK_STATUS_CHANGED: 'bi-arrow-repeat text-info',
+    NotificationType.TASK_COMPLETED: 'bi-check-circle-fill text-success',
+    NotificationType.TEAM_JOIN_REQUEST: 'bi-person-plus text-primary',
+    NotificationType.TEAM_MEMBER_JOINED: 'bi-people-fill text-success',
+    NotificationType.TEAM_REQUEST_APPROVED: 'bi-check-lg text-success',
+    NotificationType.TEAM_REQUEST_REJECTED: 'bi-x-lg text-danger',
+    NotificationType.TEAM_MEMBER_REMOVED: 'bi-person-x text-danger',
+    NotificationType.TEAM_ROLE_CHANGED: 'bi-person-gear text-info',
+    NotificationType.TEAM_INVITED: 'bi-envelope-plus text-primary',
+    NotificationType.TEAM_DELETED: 'bi-trash text-danger',
+    NotificationType.DIGEST: 'bi-collection text-secondary',
+}
+DEFAULT_ICON = 'bi-bell text-secondary'
+
+# Notifications listed in the dropdown
+DROPDOWN_LIMIT = 10
+
+# Live updates list notifications changed since the previous update with
+# this overlap, so rows committed late are not missed; clients replace
+# the ones they already show
+LIVE_OVERLAP = timedelta(seconds=5)
+
+
+def serialize_notification(notification):
+    """Notification as listed in the dropdown."""
+    return {
+        'id': notification.pk,
+        'message': notification.get_message(),
+        'count': notification.count,
+        'icon': NOTIFICATION_ICONS.get(
+            notification.notification_type, DEFAULT_ICON
+        ),
+        'action_url': notification.action_url,
+        'time': '{} {}'.format(timesince(notification.updated_at), _('ago')),
+    }
+
+
+@require_GET
+@login_required
+def unread_list(request):
+    """
+    Latest unread notifications for the navbar dropdown, as JSON.
+    Loaded when the dropdown opens instead of on every page.
+    """
+    notifications = Notification.objects.filter(
+        recipient=request.user,
+        is_read=False
+    ).order_by('-updated_at')[:DROPDOWN_LIMIT]
+
+    return JsonResponse({
+        'count': get_unread_count(request.user.pk),
+        'notifications': [
+            serialize_notification(notification)
+            for notification in notifications
+        ],
+    })
+
+
+def _live_state(user_id, since, language):
+    """
+    Unread count and the unread notifications changed after since, with
+    the since for the next update.
+    """
+    checked_at = timezone.now()
+    notifications = Notification.objects.filter(
+        recipient_id=user_id,
+        is_read=False,
+        updated_at__gt=since,
+    ).order_by('-updated_at')[:DROPDOWN_LIMIT]
+    with translation.override(language):
+        return {
+            'count': get_unread_count(user_id),
+            'notifications': [
+                serialize_notification(notification)
+                for notification in notifications
+            ],
+            'since': (checked_at - LIVE_OVERLAP).isoformat(),
+        }
+
+
+def _sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+async def _event_stream(user_id, since, language):
+    """
+    Server-Sent Events for one page: an 'update' whenever the user's
+    notifications change, a comment line as heartbeat otherwise. Ends
+    after NOTIFICATION_STREAM_MAX_AGE; the browser then reconnects.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.NOTIFICATION_STREAM_MAX_AGE
+    heartbeat = settings.NOTIFICATION_STREAM_HEARTBEAT
+    with Subscription(user_id) as subscription:
+        yield f'retry: {int(heartbeat * 1000)}\n\n'
+        state = await sync_to_async(_live_state)(user_id, since, language)
+        yield _sse('update', state)
+        while loop.time() < deadline:
+            changed = await subscription.wait(heartbeat)
+            if not changed:
+                # Changes made by other processes only show in the count
+                count = await sync_to_async(get_unread_count)(user_id)
+                if count == state['count']:
+                    yield ': heartbeat\n\n'
+                    continue
+            state = await sync_to_async(_live_state)(
+                user_id, parse_datetime(state['since']), language
+            )
+            yield _sse('update', state)
+
+
+def _since(request):
+    since = request.GET.get('since')
+    return (since and parse_datetime(since)) or timezone.now()
+
+
+@require_GET
+@login_required
+async def stream(request):
+    """
+    Live notification updates as Server-Sent Events. Each open page holds
+    a connection, so it is only served with NOTIFICATION_LIVE_UPDATES on,
+    which needs an ASGI server (task_manager.asgi).
+    """
+    if not settings.NOTIFICATION_LIVE_UPDATES:
+        raise Http404
+    user = await request.auser()
+    response = StreamingHttpResponse(
+        _event_stream(user.pk, _since(request), request.LANGUAGE_CODE),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Keeps nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@require_GET
+@login_required
+async def poll(request):
+    """
+    Long-poll fallback for stream: answers at once if the unread count
+    differs from the count parameter or notifications changed after
+    since, otherwise waits up to NOTIFICATION_LONGPOLL_TIMEOUT seconds
+    for a change. Returns the same data as a stream update.
+    """
+    if not settings.NOTIFICATION_LIVE_UPDATES:
+        raise Http404
+    user = await request.auser()
+    since = _since(request)
+    get_state = sync_to_async(_live_state)
+    # Subscribed before reading, so a change in between is not missed
+    with Subscription(user.pk) as subscription:
+        state = await get_state(user.pk, since, request.LANGUAGE_CODE)
+        unchanged = str(state['count']) == request.GET.get('count')
+        if unchanged and not state['notifications']:
+            await subscription.wait(settings.NOTIFICATION_LONGPOLL_TIMEOUT)
+            state = await get_state(user.pk, since, request.LANGUAGE_CODE)
+    return JsonResponse(state)
 
 
 @require_POST
@@ -18,7 +201,9 @@ def mark_read(request, pk):
         pk=pk,
         recipient=request.user
     )
-    notification.mark_as_read()
+    if notification.mark_as_read():
+        add_unread([request.user.pk], -1)
+        publish_on_commit([request.user.pk])
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({'status': 'ok'})
@@ -37,6 +222,9 @@ def mark_all_read(request):
         recipient=request.user,
         is_read=False
     ).update(is_read=True)
+    # Recounted rather than set to 0: notifications may have arrived since
+    invalidate_unread(request.user.pk)
+    publish_on_commit([request.user.pk])
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({'status': 'ok'})
@@ -8,6 +8,92 @@ UNAUTHORIZED_MESSAGE = _('You are not authorized! Please login.')
 USERS_LIST_URL = 'user:user-list'
 
 
+class PermissionResolver:
+    """
+    Answers authorization questions for one user during one request.
+
+    The role in the active team is the one ActiveTeamMiddleware resolved
+    for this request; roles in other teams are loaded once from
+    TeamMembership. Executor membership is checked with one EXISTS
+    query per task. Use get_permissions(request) to share one resolver
+    between the mixins and the view.
+    """
+
+    def __init__(self, user, active_team=None, active_team_role=None):
+        self.user = user
+        self._roles = None
+        self._executor_of = {}
+        if active_team is not None and active_team_role:
+            self._active_role = (active_team.pk, active_team_role)
+        else:
+            self._active_role = None
+
+    def _team_roles(self):
+        """Roles of the user in all their teams, by team id."""
+        from task_manager.teams.models import TeamMembership
+
+        if self._roles is None:
+            self._roles = dict(
+                TeamMembership.objects.filter(user=self.user)
+                .values_list('team_id', 'role')
+            )
+        return self._roles
+
+    def is_team_admin(self, team):
+        """Check if the user is admin of team (a Team or its id)."""
+        team_id = getattr(team, 'pk', team)
+        if team_id is None:
+            return False
+        if self._active_role and self._active_role[0] == team_id:
+            return self._active_role[1] == 'admin'
+        return self._team_roles().get(team_id) == 'admin'
+
+    def is_task_author(self, task):
+        return task.author_id == self.user.pk
+
+    def is_task_executor(self, task):
+        if task.pk not in self._executor_of:
+            prefetched = getattr(task, '_prefetched_objects_cache', {})
+            if 'executors' in prefetched:
+                is_executor = any(
+                    user.pk == self.user.pk
+                    for user in prefetched['executors']
+                )
+            else:
+                is_executor = task.executors.through.objects.filter(
+                    task_id=task.pk, user_id=self.user.pk
+                ).exists()
+            self._executor_of[task.pk] = is_executor
+        return self._executor_of[task.pk]
+
+    def can_delete_task(self, task):
+        """Author or team admin."""
+        return (
+            self.is_task_author(task)
+            or self.is_team_admin(task.team_id)
+        )
+
+    def can_edit_task(self, task):
+        """Author, executor or team admin."""
+        return (
+            self.can_delete_task(task)
+            or self.is_task_executor(task)
+        )
+
+
+def get_permissions(request):
+    """Return the PermissionResolver of this request."""
+    resolver = getattr(request, '_permission_resolver', None)
+    if resolver is None:
+        resolver = PermissionResolver(
+            request.user,
+            getattr(request, 'active_team', None),
+            getattr(request, 'active_team_role', None),
+        )
+        request._permission_resolver = resolver
+    return resolver
+
+
 class CustomPermissions(LoginRequiredMixin):
     def dispatch(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
@@ -34,7 +120,7 @@ class TeamAdminPermissions(LoginRequiredMixin):
             return redirect('login')
 
         team = self.get_object()
-        if not team.is_admin(request.user):
+        if not get_permissions(request).is_team_admin(team):
             messages.error(
                 request,
                 _("You don't have permissions to modify this."
@@ -55,11 +141,13 @@ class TeamMembershipAdminPermissions(LoginRequiredMixin):
             return redirect('login')
 
         try:
-            membership = TeamMembership.objects.get(uuid=kwargs['uuid'])
+            membership = TeamMembership.objects.select_related('team').get(
+                uuid=kwargs['uuid']
+            )
             team = membership.team
 
             # check if user is team admin or not
-            if not team.is_admin(request.user):
+            if not get_permissions(request).is_team_admin(team):
                 messages.error(
                     request,
                     _("You don't have permissions to manage team members."
@@ -68,7 +156,7 @@ class TeamMembershipAdminPermissions(LoginRequiredMixin):
                 return redirect('teams:team-detail', uuid=team.uuid)
 
             # check if user is trying to change their own role
-            if membership.user == request.user:
+            if membership.user_id == request.user.pk:
                 messages.error(
                     request,
                     _("You cannot change your own role in the team.")
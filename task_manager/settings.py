@@ -147,6 +147,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'task_manager.wsgi.application'
+ASGI_APPLICATION = 'task_manager.asgi.application'
 
 
 # Database
@@ -278,11 +279,87 @@ if not DEBUG:
     SECURE_CONTENT_TYPE_NOSNIFF = True  # Prevent MIME type sniffing
     X_FRAME_OPTIONS = 'DENY'  # Prevent clickjacking by denying iframe embedding
 
+# === Cache ===
+# CACHE_BACKEND selects the default cache:
+# 'locmem' - memory of each process (default, nothing to run). Only for
+#            a single process: the others never see its invalidations
+# 'file'   - directory CACHE_LOCATION, shared by the processes of a host
+#            (the default of the Docker image)
+# 'redis'  - server at CACHE_LOCATION (e.g. redis://localhost:6379/0, any
+#            Redis-protocol server), shared by all hosts and containers
+#            (the default of docker-compose.yml)
+# Cached lists, fragments and list validators rely on invalidations, so
+# run several workers or containers with 'file' or 'redis' only
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+_cache_backends = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'default'),
+    'file': (
+        'django.core.cache.backends.filebased.FileBasedCache',
+        str(BASE_DIR / '.cache'),
+    ),
+    'redis': (
+        'django.core.cache.backends.redis.RedisCache',
+        'redis://localhost:6379/0',
+    ),
+}
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backends[CACHE_BACKEND][0],
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION', _cache_backends[CACHE_BACKEND][1]
+        ),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'taskman'),
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', '300')),
+    },
+}
+
+# Whether all processes use the same cache. Values every process must see
+# current, such as user preferences, are only cached then; with locmem
+# they are read from the database
+CACHE_SHARED = CACHE_BACKEND != 'locmem'
+
+# Seconds values cached per team (or personal space) are kept, see
+# task_manager/team_cache.py. Changes invalidate them at once through the
+# team's generation counter
+TEAM_CACHE_TIMEOUT = int(os.getenv('TEAM_CACHE_TIMEOUT', '300'))
+
+# Seconds rendered template fragments are kept ({% cache %} in the navbar
+# and task rows). Their keys change with what they show
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv('FRAGMENT_CACHE_TIMEOUT', '600'))
+
+# Seconds a user's preferences (e.g. default task filters) are kept, see
+# task_manager/user/preferences.py
+USER_PREFERENCE_CACHE_TIMEOUT = int(
+    os.getenv('USER_PREFERENCE_CACHE_TIMEOUT', '300')
+)
+
+# === Sessions ===
+# SESSION_BACKEND selects where sessions are kept:
+# 'db'             - a database row read on every request (default)
+# 'cached_db'      - the database, read through the cache above. Needs a
+#                    cache shared by all processes (file or redis): with
+#                    locmem, a logout in one process is not seen by others
+# 'signed_cookies' - the cookie itself, no server storage; sessions
+#                    cannot be ended server-side (only by their expiry)
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_BACKEND]
+
 # Disable security settings when running tests
 if os.getenv('TESTING'):
     SECURE_SSL_REDIRECT = False
     SESSION_COOKIE_SECURE = False
     CSRF_COOKIE_SECURE = False
+    # Test transactions are rolled back but a cache is not: nothing may
+    # leak between tests. Tests of caching override this with locmem
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        },
+    }
 
 # === Trusted Proxies ===
 # List of proxy server IPs that are trusted to forward client IP addresses
@@ -310,6 +387,128 @@ if TRUSTED_PROXIES:
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# === Task list pagination ===
+# Result sets larger than this use cursor (keyset) pagination instead of
+# page numbers: deep pages cost the same as the first one and no COUNT(*)
+# over the whole filtered list is needed
+TASK_LIST_CURSOR_THRESHOLD = int(
+    os.getenv('TASK_LIST_CURSOR_THRESHOLD', '500')
+)
+
+# === Task search ===
+# Full-text search backend for the task list (see tasks/search.py):
+# 'auto' picks by database ('postgres' tsvector + GIN, 'sqlite' FTS5),
+# 'basic' falls back to a plain case-insensitive substring match
+TASK_SEARCH_BACKEND = os.getenv('TASK_SEARCH_BACKEND', 'auto')
+
+# === Active team ===
+# Seconds the active team membership (team id, uuid, name, role) resolved
+# by ActiveTeamMiddleware is cached per user, with a shared cache only
+# (CACHE_SHARED). Membership and team changes invalidate it on commit
+ACTIVE_TEAM_CACHE_TIMEOUT = int(os.getenv('ACTIVE_TEAM_CACHE_TIMEOUT', '300'))
+
+# === Notification delivery ===
+# 'sync' writes notifications in the request that triggers them. 'outbox'
+# only queues them in NotificationOutbox when the transaction commits and
+# `manage.py deliver_notifications` writes them in the background
+NOTIFICATION_DELIVERY = os.getenv('NOTIFICATION_DELIVERY', 'sync')
+# Worker threads and entries claimed per batch by deliver_notifications
+NOTIFICATION_OUTBOX_WORKERS = int(
+    os.getenv('NOTIFICATION_OUTBOX_WORKERS', '1')
+)
+NOTIFICATION_OUTBOX_BATCH_SIZE = int(
+    os.getenv('NOTIFICATION_OUTBOX_BATCH_SIZE', '100')
+)
+# Failed entries are retried after RETRY_DELAY seconds, doubled on each
+# attempt, and marked dead after MAX_ATTEMPTS. A claimed entry whose
+# worker died is claimed again after LEASE seconds
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = int(
+    os.getenv('NOTIFICATION_OUTBOX_MAX_ATTEMPTS', '5')
+)
+NOTIFICATION_OUTBOX_RETRY_DELAY = int(
+    os.getenv('NOTIFICATION_OUTBOX_RETRY_DELAY', '30')
+)
+NOTIFICATION_OUTBOX_LEASE = int(os.getenv('NOTIFICATION_OUTBOX_LEASE', '300'))
+
+# === Notification coalescing and digests ===
+# A task status change within this many seconds of an unread one about the
+# same task updates that notification instead of adding one (0 disables)
+NOTIFICATION_COALESCE_WINDOW = int(
+    os.getenv('NOTIFICATION_COALESCE_WINDOW', '600')
+)
+# Users in digest mode get low-priority notifications as one summary once
+# this many seconds have passed since the first one (see the
+# send_notification_digests command)
+NOTIFICATION_DIGEST_INTERVAL = int(
+    os.getenv('NOTIFICATION_DIGEST_INTERVAL', '3600')
+)
+
+# === Unread notification counter ===
+# Seconds the unread count shown on the navbar bell is cached per user,
+# with a shared cache only (CACHE_SHARED). New and read notifications
+# adjust it
+NOTIFICATION_UNREAD_CACHE_TIMEOUT = int(
+    os.getenv('NOTIFICATION_UNREAD_CACHE_TIMEOUT', '300')
+)
+
+# === Live notifications ===
+# Push notification changes to open pages over Server-Sent Events, with a
+# long-poll fallback. Every open page holds a connection, so turn this on
+# only when serving task_manager.asgi with an ASGI server, never with
+# sync WSGI workers
+NOTIFICATION_LIVE_UPDATES = os.getenv(
+    'NOTIFICATION_LIVE_UPDATES', 'False'
+).lower() in ('true', '1', 'yes')
+# Seconds between heartbeats of an idle stream (each also rechecks the
+# unread count), before a stream is closed for the browser to reconnect,
+# and that a long poll waits for a change
+NOTIFICATION_STREAM_HEARTBEAT = float(
+    os.getenv('NOTIFICATION_STREAM_HEARTBEAT', '20')
+)
+NOTIFICATION_STREAM_MAX_AGE = int(
+    os.getenv('NOTIFICATION_STREAM_MAX_AGE', '600')
+)
+NOTIFICATION_LONGPOLL_TIMEOUT = float(
+    os.getenv('NOTIFICATION_LONGPOLL_TIMEOUT', '25')
+)
+
+# === Notification retention ===
+# cleanup_notifications deletes read notifications older than
+# NOTIFICATION_RETENTION_DAYS, or than the days set for their type in
+# NOTIFICATION_RETENTION_BY_TYPE ('type=days,...', e.g. 'digest=7').
+# Unread ones are kept unless NOTIFICATION_UNREAD_RETENTION_DAYS is set
+NOTIFICATION_RETENTION_DAYS = int(
+    os.getenv('NOTIFICATION_RETENTION_DAYS', '30')
+)
+NOTIFICATION_RETENTION_BY_TYPE = {
+    notification_type.strip(): int(days)
+    for notification_type, _, days in (
+        rule.partition('=')
+        for rule in os.getenv('NOTIFICATION_RETENTION_BY_TYPE', '').split(',')
+        if rule.strip()
+    )
+}
+NOTIFICATION_UNREAD_RETENTION_DAYS = int(
+    os.getenv('NOTIFICATION_UNREAD_RETENTION_DAYS', '0')
+)
+
+# === Notification partitions and archive ===
+# archive_notifications moves notifications older than
+# NOTIFICATION_ARCHIVE_AFTER_DAYS to the archive table and drops archived
+# ones older than NOTIFICATION_ARCHIVE_RETENTION_DAYS (0 keeps them). On
+# PostgreSQL, after partition_notifications, whole monthly partitions are
+# moved and dropped; partition_notifications also creates partitions for
+# the next NOTIFICATION_PARTITIONS_AHEAD months, run it monthly
+NOTIFICATION_ARCHIVE_AFTER_DAYS = int(
+    os.getenv('NOTIFICATION_ARCHIVE_AFTER_DAYS', '180')
+)
+NOTIFICATION_ARCHIVE_RETENTION_DAYS = int(
+    os.getenv('NOTIFICATION_ARCHIVE_RETENTION_DAYS', '0')
+)
+NOTIFICATION_PARTITIONS_AHEAD = int(
+    os.getenv('NOTIFICATION_PARTITIONS_AHEAD', '3')
+)
+
 # Logging configuration (stdout only for Docker)
 LOGGING = {
     'version': 1,
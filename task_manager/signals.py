@@ -0,0 +1,146 @@
+from collections import Counter
+
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_save, post_delete
+
+from task_manager.models import UsageCounter
+from task_manager.team_cache import (
+    bump_generation,
+    names_scope,
+    task_scope,
+    team_scope,
+    user_scope,
+)
+from task_manager.usage import UsageCountedModel
+
+
+# Models whose changes invalidate the cache of their team, with the field
+# holding the owner of rows outside a team
+TEAM_CACHED_MODELS = {
+    'tasks.Task': 'author_id',
+    'statuses.Status': 'creator_id',
+    'labels.Label': 'creator_id',
+    'notes.Note': 'author_id',
+    'teams.TeamMembership': 'user_id',
+}
+# Models whose names are shown with tasks (see names_scope())
+NAMED_MODELS = ('statuses.Status', 'labels.Label', 'teams.TeamMembership')
+
+
+def usage_counted_saved(sender, instance, created, update_fields, **kwargs):
+    """Move usage counters when a row is created or its owner changes."""
+    if update_fields is not None and not (
+        set(update_fields) & {
+            sender._meta.get_field(field).name
+            for field in sender.USAGE_FIELDS
+        }
+    ):
+        return
+
+    keys = instance.get_loaded_usage_keys()
+    saved_keys = frozenset() if created else getattr(
+        instance, '_saved_usage_keys', None
+    )
+    instance._saved_usage_keys = keys
+    if keys is None or saved_keys is None:
+        # Unknown previous or current state (instance not loaded from the
+        # database) is left to the reconcile_usage_counters command
+        return
+
+    deltas = Counter(keys - saved_keys)
+    deltas.subtract(saved_keys - keys)
+    UsageCounter.bump(deltas)
+
+
+def usage_counted_deleted(sender, instance, **kwargs):
+    keys = getattr(instance, '_saved_usage_keys', None)
+    if keys is None:
+        keys = instance.get_loaded_usage_keys() or ()
+    UsageCounter.bump(dict.fromkeys(keys, -1))
+
+
+def connect_usage_counters():
+    for model in apps.get_models():
+        if issubclass(model, UsageCountedModel):
+            post_save.connect(usage_counted_saved, sender=model)
+            post_delete.connect(usage_counted_deleted, sender=model)
+
+
+def _cache_scope(instance):
+    if instance.team_id is not None:
+        return team_scope(instance.team_id)
+    owner_field = TEAM_CACHED_MODELS[instance._meta.label]
+    return user_scope(getattr(instance, owner_field))
+
+
+def team_cached_changed(sender, instance, **kwargs):
+    scope = _cache_scope(instance)
+    scopes = [scope]
+    if sender._meta.label in NAMED_MODELS:
+        scopes.append(names_scope(scope))
+    if sender._meta.label == 'teams.TeamMembership':
+        # The teams of a user are shown wherever they go (team switcher)
+        scopes.append(user_scope(instance.user_id))
+    bump_generation(*scopes)
+
+
+def team_changed(sender, instance, created, **kwargs):
+    """Team names are shown in the team switcher of their members."""
+    if created:
+        return
+    bump_generation(team_scope(instance.pk), *(
+        user_scope(user_id) for user_id in
+        instance.memberships.values_list('user_id', flat=True)
+    ))
+
+
+def task_relations_changed(sender, instance, action, pk_set, model,
+                           **kwargs):
+    """Executors and labels are shown with tasks."""
+    if instance._meta.label == 'tasks.Task':
+        if action.startswith('post_'):
+            bump_generation(_cache_scope(instance), task_scope(instance.pk))
+        return
+    # Changed from the user or label side: the tasks are in pk_set, or for
+    # clear() only known before it
+    if action == 'pre_clear':
+        field = next(
+            field.name for field in sender._meta.fields
+            if field.related_model is type(instance)
+        )
+        pk_set = sender.objects.filter(**{field: instance}).values('task_id')
+    elif action not in ('post_add', 'post_remove'):
+        return
+    tasks = model.objects.filter(pk__in=pk_set).only('team_id', 'author_id')
+    bump_generation(*(
+        scope for task in tasks
+        for scope in (_cache_scope(task), task_scope(task.pk))
+    ))
+
+
+def user_changed(sender, instance, created, update_fields, **kwargs):
+    """Usernames are among the task choices of the user's teams."""
+    if created or (
+        update_fields is not None and 'username' not in update_fields
+    ):
+        return
+    scopes = [user_scope(instance.pk)] + [
+        team_scope(team_id) for team_id in
+        instance.team_memberships.values_list('team_id', flat=True)
+    ]
+    bump_generation(*scopes, *map(names_scope, scopes))
+
+
+def connect_team_cache():
+    for label in TEAM_CACHED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(team_cached_changed, sender=model)
+        post_delete.connect(team_cached_changed, sender=model)
+    post_save.connect(user_changed, sender=apps.get_model('user.User'))
+    post_save.connect(team_changed, sender=apps.get_model('teams.Team'))
+    task = apps.get_model('tasks.Task')
+    for field in ('executors', 'labels'):
+        m2m_changed.connect(
+            task_relations_changed,
+            sender=getattr(task, field).through,
+        )
@@ -5,8 +5,11 @@ from task_manager.user.models import User
 from django.core.validators import RegexValidator, MaxLengthValidator
 from django.utils.translation import gettext_lazy as _
 
+from task_manager import usage
+from task_manager.tracking import TrackedFieldsModel
 
-class Status(models.Model):
+
+class Status(TrackedFieldsModel, usage.UsageCountedModel):
     id = models.AutoField(primary_key=True)
     uuid = models.UUIDField(
         default=uuid.uuid4,
@@ -58,6 +61,18 @@ class Status(models.Model):
         verbose_name=_('Created at')
     )
 
+    USAGE_FIELDS = ('team_id', 'creator_id')
+    TRACKED_FIELDS = ('name',)
+
+    def get_usage_keys(self):
+        if self.team_id:
+            return usage.usage_keys(
+                ('team', self.team_id, usage.TEAM_STATUSES)
+            )
+        return usage.usage_keys(
+            ('user', self.creator_id, usage.PERSONAL_STATUSES)
+        )
+
     # creating default statuses for user
     @classmethod
     def create_default_statuses_for_user(cls, user, team=None):
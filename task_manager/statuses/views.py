@@ -1,5 +1,6 @@
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
+from task_manager.conditional import ConditionalListMixin
 from task_manager.permissions import CustomPermissions
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
@@ -9,11 +10,15 @@ from .models import Status
 from task_manager.statuses.forms import StatusForm
 from django.shortcuts import redirect
 from task_manager.limit_service import LimitService
+from task_manager.team_cache import cached_list, request_scope
 
 
-class StatusesListView(CustomPermissions, ListView):
+class StatusesListView(CustomPermissions, ConditionalListMixin, ListView):
     model = Status
     template_name = 'statuses/statuses_list.html'
+    # The statuses are a cached list, not a queryset
+    context_object_name = 'status_list'
+    owner_field = 'creator'
 
     def get_queryset(self):
         user = self.request.user
@@ -22,13 +27,14 @@ class StatusesListView(CustomPermissions, ListView):
 
         if team:
             # show active_team statuses
-            return Status.objects.filter(team=team)
+            statuses = Status.objects.filter(team=team)
         else:
             # show user individual statuses
-            return Status.objects.filter(
+            statuses = Status.objects.filter(
                 creator=user,
                 team__isnull=True
             )
+        return cached_list(request_scope(self.request), 'statuses', statuses)
 
 
 class StatusesCreateView(SuccessMessageMixin, CreateView):
@@ -0,0 +1,80 @@
+"""
+Choices of the task filter and task form, cached per team.
+
+Both offer the statuses, labels and users of the active team (or the
+user's own ones) as choices. The querysets below still validate
+submitted values; the choices shown are rendered from a catalog of
+(pk, label) pairs kept in the team cache (see team_cache.py), so a page
+with a filter or task form does not query them. Status, label,
+membership and task (author) changes bump the team generation, user
+renames bump the teams of the user.
+"""
+from django import forms
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.team_cache import get_or_set, request_scope
+from task_manager.user.models import User
+
+
+def choice_querysets(request):
+    """Querysets of the statuses, labels, executors and authors to offer."""
+    user = request.user
+    team = getattr(request, 'active_team', None)
+    if not team:
+        return {
+            'statuses': Status.objects.filter(
+                creator=user, team__isnull=True
+            ),
+            'labels': Label.objects.filter(creator=user, team__isnull=True),
+            'executors': User.objects.filter(pk=user.pk),
+            'authors': User.objects.filter(pk=user.pk),
+        }
+
+    team_users = User.objects.filter(
+        team_memberships__team=team,
+        team_memberships__status='active'
+    ).distinct()
+    # Authors are also those who left the team or were deleted, as long
+    # as they have tasks in it
+    authors_from_tasks = User.objects.filter(
+        author_set__team=team
+    ).distinct()
+    return {
+        'statuses': Status.objects.filter(team=team),
+        'labels': Label.objects.filter(team=team),
+        'executors': team_users,
+        'authors': (team_users | authors_from_tasks).distinct(),
+    }
+
+
+def choice_catalog(request):
+    """
+    {name: [(pk, label), ...]} for the querysets of choice_querysets(),
+    plus member_count, the number of team memberships (1 outside a
+    team). Read from the cache.
+    """
+    def build():
+        catalog = {
+            name: [(obj.pk, str(obj)) for obj in queryset]
+            for name, queryset in choice_querysets(request).items()
+        }
+        team = getattr(request, 'active_team', None)
+        catalog['member_count'] = team.memberships.count() if team else 1
+        return catalog
+
+    return get_or_set(request_scope(request), 'task_choices', build)
+
+
+def set_choices(field, queryset, choices):
+    """
+    Validate field against queryset but render it with cached choices,
+    so that rendering runs no query.
+    """
+    field.queryset = queryset
+    if getattr(field, 'empty_label', None) is not None:
+        choices = [('', field.empty_label), *choices]
+    # Set after the queryset, which resets the choices of the widget, and
+    # with the plain ChoiceField setter: django-filter's fields wrap what
+    # is set in their model choice iterator
+    forms.ChoiceField.choices.fset(field, choices)
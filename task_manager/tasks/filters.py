@@ -1,7 +1,13 @@
 import django_filters
 from django import forms
-from django.db.models import Q
-from task_manager.tasks.models import Task
+from django.db.models import Exists, OuterRef, Q, QuerySet
+from task_manager.tasks.choices import (
+    choice_catalog,
+    choice_querysets,
+    set_choices,
+)
+from task_manager.tasks.models import Task, ChecklistItem
+from task_manager.tasks.search import search_tasks
 from task_manager.statuses.models import Status
 from task_manager.labels.models import Label
 from task_manager.user.models import User
@@ -95,67 +101,55 @@ class TaskFilter(django_filters.FilterSet):
         request = self.request
         if request is None:
             return
-        user = request.user
-        team = getattr(request, 'active_team', None)
-
-        if team:
-            team_users = User.objects.filter(
-                team_memberships__team=team,
-                team_memberships__status='active'
-            ).distinct()
-
-            self.filters['executors'].queryset = team_users
-
-            # Для авторов добавляем всех, кто когда-либо был автором задач
-            # в этой команде:
-            # - активных участников команды
-            # - удалённых пользователей (is_deleted=True)
-            # - пользователей, исключённых из команды (status != 'active')
-            authors_from_tasks = User.objects.filter(
-                author_set__team=team
-            ).distinct()
-
-            # Объединяем активных участников и всех авторов задач
-            self.filters['author'].queryset = (
-                team_users | authors_from_tasks
-            ).distinct()
-
-            self.filters['status'].queryset = Status.objects.filter(team=team)
-            self.filters['labels'].queryset = Label.objects.filter(team=team)
-        else:
-            self.filters['executors'].queryset = User.objects.filter(
-                pk=user.pk)
-            self.filters['author'].queryset = User.objects.filter(pk=user.pk)
-            self.filters['status'].queryset = Status.objects.filter(
-                creator=user,
-                team__isnull=True
-            )
-            self.filters['labels'].queryset = Label.objects.filter(
-                creator=user,
-                team__isnull=True
-            )
+        # Rendered from the cached catalog, validated by the querysets
+        querysets = choice_querysets(request)
+        catalog = choice_catalog(request)
+        for name, choices in (
+            ('status', 'statuses'),
+            ('labels', 'labels'),
+            ('executors', 'executors'),
+            ('author', 'authors'),
+        ):
+            filter_ = self.filters[name]
+            filter_.queryset = querysets[choices]
+            set_choices(filter_.field, querysets[choices], catalog[choices])
 
     def filter_search(self, queryset, name, value):
         if not value:
             return queryset
-        return queryset.filter(
-            Q(name__icontains=value) | Q(description__icontains=value)
-        )
+        return search_tasks(queryset, value)
 
     def filter_my_tasks(self, queryset, name, value):
         """Filter tasks where user is author OR executor."""
-        user = self.request.user
         if value:
-            return queryset.filter(
-                Q(author=user) | Q(executors=user)
-            ).distinct()
+            return queryset.filter(self._my_tasks_condition())
         return queryset
 
     def filter_has_checklist(self, queryset, name, value):
         if value:
-            return queryset.filter(checklist_items__isnull=False).distinct()
+            return queryset.filter(self._has_checklist_condition())
         return queryset
 
+    # Conditions on to-many relations are EXISTS semi-joins: a JOIN would
+    # repeat a task once per matching row and need DISTINCT over the wide
+    # list rows to remove the duplicates.
+
+    def _m2m_exists(self, field_name, values):
+        """EXISTS over the through table of a Task many-to-many field."""
+        field = Task._meta.get_field(field_name)
+        return Exists(field.remote_field.through.objects.filter(**{
+            field.m2m_field_name(): OuterRef('pk'),
+            f'{field.m2m_reverse_field_name()}__in': values,
+        }))
+
+    def _my_tasks_condition(self):
+        """Task authored by the current user or assigned to them."""
+        user = self.request.user
+        return Q(author=user) | self._m2m_exists('executors', [user.pk])
+
+    def _has_checklist_condition(self):
+        return Exists(ChecklistItem.objects.filter(task=OuterRef('pk')))
+
     def _is_excluded(self, param_name):
         """Check if exclude checkbox is checked."""
         data = self.form.data if self.form.is_bound else self.form.initial
@@ -182,15 +176,16 @@ class TaskFilter(django_filters.FilterSet):
         exclude_mode = self._is_excluded(f'{field_name}_exclude')
 
         # Handle multiple values (for ModelMultipleChoiceFilter)
-        if isinstance(value, (list, tuple)):
-            if not value:
-                return qs
-            condition = Q(**{f'{lookup_field}__in': value})
+        if not isinstance(value, (list, tuple, QuerySet)):
+            value = [value]
+
+        if Task._meta.get_field(lookup_field).many_to_many:
+            condition = self._m2m_exists(lookup_field, value)
         else:
-            condition = Q(**{lookup_field: value})
+            condition = Q(**{f'{lookup_field}__in': value})
 
         if exclude_mode:
-            return qs.exclude(condition)
+            return qs.filter(~condition)
         return qs.filter(condition)
 
     def _apply_date_filters(self, qs):
@@ -211,29 +206,24 @@ class TaskFilter(django_filters.FilterSet):
         if not my_tasks:
             return qs
 
-        user = self.request.user
-        exclude_mode = self._is_excluded('my_tasks_exclude')
-
-        condition = Q(author=user) | Q(executors=user)
-        if exclude_mode:
-            return qs.exclude(condition).distinct()
-        return qs.filter(condition).distinct()
+        condition = self._my_tasks_condition()
+        if self._is_excluded('my_tasks_exclude'):
+            return qs.filter(~condition)
+        return qs.filter(condition)
 
     def _apply_search_filter(self, qs):
         """Apply text search filter."""
         search = self._get_filter_value('search')
         if not search:
             return qs
-        return qs.filter(
-            Q(name__icontains=search) | Q(description__icontains=search)
-        )
+        return search_tasks(qs, search)
 
     def _apply_has_checklist_filter(self, qs):
         """Apply checklist presence filter."""
         has_checklist = self._get_filter_value('has_checklist')
         if not has_checklist:
             return qs
-        return qs.filter(checklist_items__isnull=False).distinct()
+        return qs.filter(self._has_checklist_condition())
 
     def filter_queryset(self, queryset):
         """Override to handle exclude logic properly.
@@ -1,7 +1,9 @@
+from task_manager.tasks.choices import (
+    choice_catalog,
+    choice_querysets,
+    set_choices,
+)
 from task_manager.tasks.models import Task
-from task_manager.user.models import User
-from task_manager.statuses.models import Status
-from task_manager.labels.models import Label
 from django import forms
 
 
@@ -32,36 +34,33 @@ class TaskForm(forms.ModelForm):
         if not user.is_authenticated:
             return
 
-        team = getattr(self.request, 'active_team', None)
-
-        if team:
-            # team mode - only active members can be executors
-            self.fields['executors'].queryset = User.objects.filter(
-                team_memberships__team=team,
-                team_memberships__status='active'
-            )
-            self.fields['status'].queryset = Status.objects.filter(
-                team=team
-            )
-            self.fields['labels'].queryset = Label.objects.filter(
-                team=team
+        querysets = choice_querysets(self.request)
+        catalog = choice_catalog(self.request)
+        # Rendered from the cached catalog, validated by the querysets
+        for name, choices in (
+            ('status', 'statuses'),
+            ('executors', 'executors'),
+            ('labels', 'labels'),
+        ):
+            set_choices(
+                self.fields[name], querysets[choices], catalog[choices]
             )
+
+        if getattr(self.request, 'active_team', None):
             # if team has only one member - set executor to author
-            if team.memberships.count() == 1:
+            if catalog['member_count'] == 1:
                 self.fields['executors'].initial = [user]
         else:
-            # individual mode
-            self.fields['executors'].queryset = User.objects.filter(
-                pk=user.pk
-            )
-            self.fields['status'].queryset = Status.objects.filter(
-                creator=user,
-                team__isnull=True
-            )
-            self.fields['labels'].queryset = Label.objects.filter(
-                creator=user,
-                team__isnull=True
-            )
             # user is executor in individual mode
             self.fields['executors'].initial = [user]
             self.fields['executors'].widget.attrs['readonly'] = True
+
+    def save(self, commit=True):
+        if not commit or self.instance._state.adding:
+            return super().save(commit)
+        task = super().save(commit=False)
+        # Only the edited columns are written. updated_at always is, so
+        # an edit of labels or executors alone is dated too
+        task.save(update_fields=[*task.changed_fields, 'updated_at'])
+        self._save_m2m()
+        return task
@@ -0,0 +1,26 @@
+from django.db import models
+from django.db.models.expressions import OrderBy
+
+
+class NullsOrderedIndex(models.Index):
+    """
+    Index with explicit NULLS FIRST/LAST placement on PostgreSQL.
+
+    PostgreSQL can serve ``ORDER BY x DESC NULLS LAST`` from an index only
+    when the index has the same NULL placement. SQLite rejects NULLS
+    modifiers in CREATE INDEX, but already sorts NULLs first ascending
+    and last descending, so the modifiers are simply dropped there.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor == 'postgresql':
+            return super().create_sql(model, schema_editor, using, **kwargs)
+        index = self.clone()
+        index.expressions = tuple(
+            OrderBy(expression.expression, descending=expression.descending)
+            if isinstance(expression, OrderBy) else expression
+            for expression in self.expressions
+        )
+        return super(NullsOrderedIndex, index).create_sql(
+            model, schema_editor, using, **kwargs
+        )
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:27
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count_subquery(model, **filters):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(task=OuterRef('pk'), **filters)
+            .values('task').annotate(c=Count('*')).values('c'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def backfill_counters(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    ChecklistItem = apps.get_model('tasks', 'ChecklistItem')
+    Note = apps.get_model('notes', 'Note')
+    Task.objects.update(
+        notes_count=_count_subquery(Note),
+        checklist_total=_count_subquery(ChecklistItem),
+        checklist_done=_count_subquery(ChecklistItem, is_done=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_alter_task_description'),
+        ('notes', '0002_alter_note_content_alter_note_title'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='checklist_done',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Done checklist items'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='checklist_total',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Checklist items'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='notes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Notes count'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:40
+
+import task_manager.tasks.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0003_alter_label_creator'),
+        ('statuses', '0003_alter_status_description'),
+        ('tasks', '0010_task_search_index'),
+        ('teams', '0005_teaminvite'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['team', 'created_at', 'id'], name='task_team_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=task_manager.tasks.indexes.NullsOrderedIndex(models.F('team'), models.OrderBy(models.F('updated_at'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='task_team_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['team', 'name', 'id'], name='task_team_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('team__isnull', True)), fields=['author', 'created_at', 'id'], name='task_personal_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=task_manager.tasks.indexes.NullsOrderedIndex(models.F('author'), models.OrderBy(models.F('updated_at'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), condition=models.Q(('team__isnull', True)), name='task_personal_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('team__isnull', True)), fields=['author', 'name', 'id'], name='task_personal_name_idx'),
+        ),
+    ]
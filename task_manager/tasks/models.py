@@ -1,6 +1,9 @@
 import uuid
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from task_manager.tasks.indexes import NullsOrderedIndex
 from task_manager.user.models import User
 from task_manager.teams.models import Team
 from task_manager.statuses.models import Status
@@ -8,8 +11,11 @@ from task_manager.labels.models import Label
 from django.core.validators import RegexValidator, MaxLengthValidator
 from django.utils.translation import gettext_lazy as _
 
+from task_manager import usage
+from task_manager.tracking import TrackedFieldsModel
 
-class Task(models.Model):
+
+class Task(TrackedFieldsModel, usage.UsageCountedModel):
     id = models.AutoField(primary_key=True)
     uuid = models.UUIDField(
         default=uuid.uuid4,
@@ -85,6 +91,67 @@ class Task(models.Model):
         related_name='updated_tasks',
         verbose_name=_('Updated by')
     )
+    # Denormalized counters kept in sync by signals (see signals.py)
+    notes_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Notes count')
+    )
+    checklist_total = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Checklist items')
+    )
+    checklist_done = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Done checklist items')
+    )
+
+    COUNTER_FIELDS = ('notes_count', 'checklist_total', 'checklist_done')
+    # Fields a task edit can change, see TaskForm.save()
+    TRACKED_FIELDS = (
+        'name', 'description', 'team', 'status', 'author', 'updated_by',
+    )
+
+    # Tasks count towards the author's limit, team tasks also the team's
+    USAGE_FIELDS = ('author_id', 'team_id')
+
+    class Meta:
+        # The task list is scoped by team, or by author for personal tasks
+        # (team IS NULL), and ordered by one of SORT_OPTIONS with id as the
+        # tie-breaker. Each index serves one sort key in both directions.
+        indexes = [
+            models.Index(
+                fields=['team', 'created_at', 'id'],
+                name='task_team_created_idx'
+            ),
+            NullsOrderedIndex(
+                F('team'), F('updated_at').desc(nulls_last=True),
+                F('id').desc(),
+                name='task_team_updated_idx'
+            ),
+            models.Index(
+                fields=['team', 'name', 'id'],
+                name='task_team_name_idx'
+            ),
+            models.Index(
+                fields=['author', 'created_at', 'id'],
+                condition=Q(team__isnull=True),
+                name='task_personal_created_idx'
+            ),
+            NullsOrderedIndex(
+                F('author'), F('updated_at').desc(nulls_last=True),
+                F('id').desc(),
+                condition=Q(team__isnull=True),
+                name='task_personal_updated_idx'
+            ),
+            models.Index(
+                fields=['author', 'name', 'id'],
+                condition=Q(team__isnull=True),
+                name='task_personal_name_idx'
+            ),
+        ]
 
     @property
     def was_edited(self):
@@ -92,35 +159,38 @@ class Task(models.Model):
             return False
         return (self.updated_at - self.created_at).total_seconds() > 2
 
-    @property
-    def checklist_total(self):
-        if getattr(self, 'annotated_checklist_total', None) is not None:
-            return self.annotated_checklist_total
-        return self.checklist_items.count()
-
-    @property
-    def checklist_done(self):
-        if getattr(self, 'annotated_checklist_done', None) is not None:
-            return self.annotated_checklist_done
-        return self.checklist_items.filter(is_done=True).count()
-
     @property
     def checklist_progress(self):
         if self.checklist_total == 0:
             return 0
         return int((self.checklist_done / self.checklist_total) * 100)
 
-    @property
-    def notes_count(self):
-        if getattr(self, 'annotated_notes_count', None) is not None:
-            return self.annotated_notes_count
-        return self.notes.count()
+    @classmethod
+    def bump_counters(cls, task_id, **deltas):
+        """
+        Atomically add deltas to the denormalized counters of a task,
+        e.g. bump_counters(task.pk, checklist_total=1, checklist_done=1).
+        """
+        cls.objects.filter(pk=task_id).update(**{
+            field: Greatest(F(field) + delta, Value(0))
+            for field, delta in deltas.items()
+        })
+
+    def get_usage_keys(self):
+        return usage.usage_keys(
+            ('user', self.author_id, usage.TASKS),
+            ('team', self.team_id, usage.TASKS),
+        )
 
     def save(self, *args, **kwargs):
-        # Auto-detect team if not specified
-        if not self.team and self.author:
-            # If task is created without team, it's an individual task
-            pass
+        # Counters are changed only through bump_counters() and must not
+        # be overwritten by a stale instance
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -150,5 +220,37 @@ class ChecklistItem(models.Model):
     class Meta:
         ordering = ['position', 'id']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so signals can compute counter deltas
+        # without re-reading the row
+        instance._saved_is_done = instance.__dict__.get('is_done')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The row and the task counters (post_save) change together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def toggle(self):
+        """
+        Flip is_done as loaded and count it in the task's checklist_done.
+        The row is only updated if it still has the loaded state, so two
+        concurrent toggles from the same state count once. Returns
+        whether this call changed the row.
+        """
+        was_done = self.is_done
+        with transaction.atomic():
+            changed = ChecklistItem.objects.filter(
+                pk=self.pk, is_done=was_done
+            ).update(is_done=not was_done)
+            if changed:
+                Task.bump_counters(
+                    self.task_id, checklist_done=-1 if was_done else 1
+                )
+        self.is_done = self._saved_is_done = not was_done
+        return bool(changed)
+
     def __str__(self):
         return self.text[:50]
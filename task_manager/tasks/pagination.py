@@ -0,0 +1,210 @@
+"""
+Keyset (cursor) pagination for the task list.
+
+OFFSET pagination gets slower with every page and needs a COUNT(*) over
+the whole filtered queryset. Keyset pagination instead remembers the sort
+value and id of the last row shown and asks the database for rows that
+come after it, so every page costs the same and no count is needed.
+
+The position is passed around as an opaque ``?cursor=`` token.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import F, Q
+
+
+CURSOR_PARAM = 'cursor'
+
+# Fields whose values must be converted from/to JSON-friendly strings
+DATETIME_SORT_FIELDS = ('created_at', 'updated_at')
+
+# Sort fields that may contain NULLs
+NULLABLE_SORT_FIELDS = ('updated_at', 'search_rank')
+
+
+def get_ordering(sort):
+    """
+    Return the full ordering for a sort key from SORT_OPTIONS.
+
+    ``id`` is added as a tie-breaker so the order is total, which keyset
+    pagination requires. For nullable fields NULLs are placed explicitly
+    so the order is the same on PostgreSQL and SQLite. NOT NULL fields get
+    a plain ASC/DESC, which the composite indexes on Task can serve in
+    either direction.
+    """
+    descending = sort.startswith('-')
+    field = sort.lstrip('-')
+    if field not in NULLABLE_SORT_FIELDS:
+        if descending:
+            return [F(field).desc(), F('id').desc()]
+        return [F(field).asc(), F('id').asc()]
+    if descending:
+        return [F(field).desc(nulls_last=True), F('id').desc()]
+    return [F(field).asc(nulls_first=True), F('id').asc()]
+
+
+def encode_cursor(sort, value, pk, backwards=False):
+    """Pack sort key, sort value and id into an opaque URL-safe token."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {'s': sort, 'v': value, 'id': pk}
+    if backwards:
+        payload['b'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, sort):
+    """
+    Unpack a cursor token.
+
+    Returns (value, pk, backwards) or None when the token is invalid or
+    was created for a different sort order.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if payload['s'] != sort:
+            return None
+        pk = int(payload['id'])
+        value = payload['v']
+        if value is not None and sort.lstrip('-') in DATETIME_SORT_FIELDS:
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        return None
+    return value, pk, bool(payload.get('b'))
+
+
+def _after_condition(field, value, pk, descending):
+    """
+    Build the WHERE condition for rows placed after (value, pk).
+
+    Mirrors get_ordering(): ascending puts NULLs first, descending puts
+    NULLs last.
+    """
+    if descending:
+        if value is None:
+            return Q(**{f'{field}__isnull': True, 'id__lt': pk})
+        return (
+            Q(**{f'{field}__lt': value})
+            | Q(**{field: value, 'id__lt': pk})
+            | Q(**{f'{field}__isnull': True})
+        )
+    if value is None:
+        return (
+            Q(**{f'{field}__isnull': True, 'id__gt': pk})
+            | Q(**{f'{field}__isnull': False})
+        )
+    return (
+        Q(**{f'{field}__gt': value})
+        | Q(**{field: value, 'id__gt': pk})
+    )
+
+
+def _reverse_sort(sort):
+    """The exact reverse of get_ordering(sort), NULL placement included."""
+    if sort.startswith('-'):
+        return sort.lstrip('-')
+    return f'-{sort}'
+
+
+class CursorPage:
+    """
+    Page object for keyset pagination.
+
+    Mimics the parts of django.core.paginator.Page used by templates
+    (iteration, len(), has_next/has_previous) and exposes cursor tokens
+    instead of page numbers.
+    """
+
+    def __init__(self, object_list, sort, has_next, has_previous):
+        self.object_list = object_list
+        self.sort = sort
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def _cursor_for(self, obj, backwards=False):
+        field = self.sort.lstrip('-')
+        return encode_cursor(
+            self.sort, getattr(obj, field), obj.pk, backwards=backwards
+        )
+
+    @property
+    def next_cursor(self):
+        if not self._has_next or not self.object_list:
+            return None
+        return self._cursor_for(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or not self.object_list:
+            return None
+        return self._cursor_for(self.object_list[0], backwards=True)
+
+
+def paginate_by_cursor(queryset, sort, token, per_page):
+    """
+    Return a CursorPage for the queryset ordered by ``sort``.
+
+    Fetches one extra row to learn whether another page exists, so no
+    COUNT query is issued. An invalid token starts from the first page.
+    """
+    field = sort.lstrip('-')
+    descending = sort.startswith('-')
+    cursor = decode_cursor(token, sort)
+
+    if cursor is None:
+        rows = list(queryset.order_by(*get_ordering(sort))[:per_page + 1])
+        return CursorPage(
+            rows[:per_page], sort,
+            has_next=len(rows) > per_page,
+            has_previous=False,
+        )
+
+    value, pk, backwards = cursor
+    if backwards:
+        # Rows before the cursor are the rows after it in reverse order
+        rows = list(
+            queryset.filter(
+                _after_condition(field, value, pk, not descending)
+            ).order_by(*get_ordering(_reverse_sort(sort)))[:per_page + 1]
+        )
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page]
+        rows.reverse()
+        return CursorPage(
+            rows, sort, has_next=True, has_previous=has_previous
+        )
+
+    rows = list(
+        queryset.filter(_after_condition(field, value, pk, descending))
+        .order_by(*get_ordering(sort))[:per_page + 1]
+    )
+    return CursorPage(
+        rows[:per_page], sort,
+        has_next=len(rows) > per_page,
+        has_previous=True,
+    )
@@ -0,0 +1,73 @@
+"""
+Cached rows of the task list.
+
+Each row is a template fragment (``{% cache %}`` in task_rows.html)
+under a key of everything it shows:
+
+* the task's updated_at, bumped by every edit of the task itself;
+* its counters, which change with notes and checklist items without
+  bumping updated_at;
+* the generation of the task's scope (team_cache.task_scope()), bumped
+  when its labels or executors change (see signals.py);
+* the names generation of its team (team_cache.names_scope()), bumped
+  by status, label and user renames;
+* the language, the view mode and the row's place in the list.
+
+The view reads the page's rows in one get_many() and prefetches labels
+and executors only for the rows that have to be rendered.
+"""
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models import prefetch_related_objects
+from django.utils.safestring import mark_safe
+
+from task_manager.team_cache import (
+    get_generation,
+    get_generations,
+    names_scope,
+    task_scope,
+)
+
+
+ROW_FRAGMENT = 'task_row'
+# Related rows only the card layout shows
+FULL_ROW_PREFETCH = ('labels', 'executors')
+
+
+def prepare_rows(tasks, scope, language, view_mode):
+    """
+    Set row_cache_key on tasks, the rows of one page of the list of
+    scope, and cached_row on those already rendered. Prefetch what the
+    other rows show.
+    """
+    names = get_generation(names_scope(scope))
+    generations = get_generations(task_scope(task.pk) for task in tasks)
+    rows = {}
+    for index, task in enumerate(tasks):
+        task.row_cache_key = ':'.join(str(part) for part in (
+            task.pk,
+            task.updated_at,
+            task.notes_count,
+            task.checklist_total,
+            task.checklist_done,
+            generations[task_scope(task.pk)],
+            names,
+            language,
+            view_mode,
+            index == 0,
+            index == len(tasks) - 1,
+        ))
+        rows[make_template_fragment_key(
+            ROW_FRAGMENT, [task.row_cache_key]
+        )] = task
+
+    missing = []
+    cached = cache.get_many(rows)
+    for key, task in rows.items():
+        if key in cached:
+            # As {% cache %} would output it
+            task.cached_row = mark_safe(cached[key])
+        else:
+            missing.append(task)
+    if view_mode == 'full':
+        prefetch_related_objects(missing, *FULL_ROW_PREFETCH)
@@ -0,0 +1,200 @@
+"""
+Full-text search over task name and description.
+
+``icontains`` on a 20,000 character description is a sequential scan,
+so search goes through a backend chosen by ``TASK_SEARCH_BACKEND``:
+
+* ``postgres`` - a stored ``tsvector`` column (name weighted above
+  description) with a GIN index, ranked with ``ts_rank``;
+* ``sqlite`` - an FTS5 table kept in sync by triggers, ranked with
+  ``bm25``. Used for development and tests;
+* ``basic`` - the old ``icontains`` match, without ranking;
+* ``auto`` (default) - pick by database vendor.
+
+The index is maintained by the database itself (a generated column on
+PostgreSQL, triggers on SQLite), so every write path - model saves,
+``bulk_create``, ``update()`` and fixtures - keeps it up to date.
+
+Every backend annotates matching tasks with ``search_rank`` (higher is
+more relevant), which the ``-search_rank`` sort option orders by.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+
+SEARCH_RANK = 'search_rank'
+
+# Text search configuration for the tsvector column. 'simple' does no
+# stemming, so it works the same for Russian and English task names.
+SEARCH_CONFIG = 'simple'
+
+TASK_TABLE = 'tasks_task'
+SEARCH_VECTOR_COLUMN = 'search_vector'
+FTS_TABLE = 'tasks_task_fts'
+
+WORD_RE = re.compile(r'\w+')
+
+
+def get_terms(query):
+    """Split a user query into words, dropping FTS syntax characters."""
+    return WORD_RE.findall(query or '')
+
+
+class BasicSearchBackend:
+    """Case-insensitive substring match, works on any database."""
+
+    name = 'basic'
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        ).annotate(**{SEARCH_RANK: Value(0.0, output_field=FloatField())})
+
+
+class PostgresSearchBackend:
+    """Search the GIN-indexed ``search_vector`` column."""
+
+    name = 'postgres'
+
+    def to_tsquery(self, terms):
+        # Every word must match, as a prefix like the old icontains did
+        return ' & '.join(f"'{term}':*" for term in terms)
+
+    def search(self, queryset, query):
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        params = (SEARCH_CONFIG, self.to_tsquery(terms))
+        vector = f'"{TASK_TABLE}"."{SEARCH_VECTOR_COLUMN}"'
+        return queryset.filter(RawSQL(
+            f'{vector} @@ to_tsquery(%s, %s)', params,
+            output_field=BooleanField(),
+        )).annotate(**{SEARCH_RANK: RawSQL(
+            f'ts_rank({vector}, to_tsquery(%s, %s))', params,
+            output_field=FloatField(),
+        )})
+
+
+class SQLiteSearchBackend:
+    """Search the FTS5 ``tasks_task_fts`` table."""
+
+    name = 'sqlite'
+
+    # bm25() column weights: name, description
+    NAME_WEIGHT = 10.0
+    DESCRIPTION_WEIGHT = 1.0
+
+    def to_match(self, terms):
+        # Quoted prefix tokens; quoting disables FTS5 operators
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, query):
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        # The FTS table is joined once: bm25() reads the rank of the row
+        # MATCH found instead of running the match again per task
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = "{TASK_TABLE}"."id"',
+                f'{FTS_TABLE} MATCH %s',
+            ],
+            params=[self.to_match(terms)],
+        ).annotate(**{SEARCH_RANK: RawSQL(
+            # bm25() is lower for better matches, negate it
+            f'-bm25({FTS_TABLE}, %s, %s)',
+            (self.NAME_WEIGHT, self.DESCRIPTION_WEIGHT),
+            output_field=FloatField(),
+        )})
+
+
+SEARCH_BACKENDS = {
+    backend.name: backend
+    for backend in (
+        BasicSearchBackend, PostgresSearchBackend, SQLiteSearchBackend,
+    )
+}
+
+VENDOR_BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend():
+    """Return the search backend configured by TASK_SEARCH_BACKEND."""
+    name = getattr(settings, 'TASK_SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        backend = VENDOR_BACKENDS.get(connection.vendor, BasicSearchBackend)
+        return backend()
+    return SEARCH_BACKENDS[name]()
+
+
+def search_tasks(queryset, query):
+    """Filter tasks by a search query and annotate them with search_rank."""
+    return get_search_backend().search(queryset, query)
+
+
+# === SQLite trigger DDL (used by the post_migrate check) ===
+
+SQLITE_TRIGGERS_SQL = {
+    f'{FTS_TABLE}_ai': f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai
+    AFTER INSERT ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f'{FTS_TABLE}_ad': f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad
+    AFTER DELETE ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f'{FTS_TABLE}_au': f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF name, description ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+}
+
+SQLITE_REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+
+def ensure_sqlite_search_index(using_connection):
+    """
+    Create the FTS5 triggers when they are missing.
+
+    SQLite migrations that rebuild tasks_task (copy, drop, rename) drop
+    the triggers with the old table, so this also runs after every
+    migrate. Recreated triggers may have missed writes, so the index is
+    rebuilt from tasks_task. Does nothing before the FTS table exists.
+    """
+    with using_connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name = %s "
+            "OR (type = 'trigger' AND tbl_name = %s)",
+            [FTS_TABLE, TASK_TABLE],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if FTS_TABLE not in existing:
+            return
+        missing = [
+            sql for name, sql in SQLITE_TRIGGERS_SQL.items()
+            if name not in existing
+        ]
+        if not missing:
+            return
+        for sql in missing:
+            cursor.execute(sql)
+        cursor.execute(SQLITE_REBUILD_SQL)
@@ -1,7 +1,15 @@
-from django.db.models.signals import m2m_changed, pre_save, post_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_save,
+    post_delete,
+    post_migrate,
+)
+from django.db import connections
 from django.dispatch import receiver
 
-from task_manager.tasks.models import Task
+from task_manager.tasks.models import Task, ChecklistItem
+from task_manager.notes.models import Note
+from task_manager.tasks.search import ensure_sqlite_search_index
 from task_manager.notifications.services import (
     notify_task_assigned,
     notify_task_unassigned,
@@ -10,28 +18,6 @@ from task_manager.notifications.services import (
 )
 
 
-def _notify_assigned(instance, pk_set, actor):
-    """Notify users added as task executors."""
-    from task_manager.user.models import User
-    for user_pk in pk_set:
-        try:
-            user = User.objects.get(pk=user_pk)
-            notify_task_assigned(instance, user, actor)
-        except User.DoesNotExist:
-            pass
-
-
-def _notify_unassigned(instance, pk_set, actor):
-    """Notify users removed from task executors."""
-    from task_manager.user.models import User
-    for user_pk in pk_set:
-        try:
-            user = User.objects.get(pk=user_pk)
-            notify_task_unassigned(instance, user, actor)
-        except User.DoesNotExist:
-            pass
-
-
 @receiver(m2m_changed, sender=Task.executors.through)
 def task_executors_changed(sender, instance, action, pk_set, **kwargs):
     """
@@ -45,41 +31,27 @@ def task_executors_changed(sender, instance, action, pk_set, **kwargs):
     if actor is None:
         return
 
+    # pk_set is resolved to existing users in one query by the service
     if action == 'post_add':
-        _notify_assigned(instance, pk_set, actor)
+        notify_task_assigned(instance, pk_set, actor)
     elif action == 'post_remove':
-        _notify_unassigned(instance, pk_set, actor)
-
-
-@receiver(pre_save, sender=Task)
-def task_pre_save(sender, instance, **kwargs):
-    """
-    Store old status ID to detect changes in post_save.
-    """
-    if instance.pk:
-        try:
-            old = Task.objects.get(pk=instance.pk)
-            instance._old_status_id = old.status_id
-        except Task.DoesNotExist:
-            instance._old_status_id = None
-    else:
-        instance._old_status_id = None
+        notify_task_unassigned(instance, pk_set, actor)
 
 
 @receiver(post_save, sender=Task)
-def task_post_save(sender, instance, created, **kwargs):
+def task_post_save(sender, instance, created, update_fields, **kwargs):
     """
     Notify author and executors about status changes and completion.
     """
-    if created:
-        return
-
     actor = getattr(instance, '_actor', None)
-    if actor is None:
+    if created or actor is None:
         return
 
-    old_status_id = getattr(instance, '_old_status_id', None)
-    if old_status_id is None or old_status_id == instance.status_id:
+    # The field snapshot still holds the status from before this save;
+    # it is unknown (None) for a task that was not loaded from the database
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    if instance.get_saved_value('status') in (None, instance.status_id):
         return
 
     notify_task_status_changed(instance, actor)
@@ -89,3 +61,91 @@ def task_post_save(sender, instance, created, **kwargs):
     # flag to Status would make it more robust.
     if instance.status.name == 'Completed':
         notify_task_completed(instance, actor)
+
+
+def _bump_task_counters(instance, task_id, **deltas):
+    """
+    Apply counter deltas to the task in the database and, when the task
+    is already loaded on the instance, to that in-memory task as well.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if task_id is None or not deltas:
+        return
+
+    Task.bump_counters(task_id, **deltas)
+
+    task_field = type(instance)._meta.get_field('task')
+    if task_field.is_cached(instance):
+        task = task_field.get_cached_value(instance)
+        if task is not None and task.pk == task_id:
+            for field, delta in deltas.items():
+                setattr(task, field, max(getattr(task, field) + delta, 0))
+
+
+@receiver(post_save, sender=ChecklistItem)
+def checklist_item_saved(sender, instance, created, raw, update_fields,
+                         **kwargs):
+    """Keep Task.checklist_total/checklist_done in sync."""
+    if raw:
+        return
+
+    if created:
+        _bump_task_counters(
+            instance, instance.task_id,
+            checklist_total=1,
+            checklist_done=int(instance.is_done),
+        )
+    elif update_fields is None or 'is_done' in update_fields:
+        # Unknown previous state (instance not loaded from the database)
+        # is left to the repair_task_counters command
+        was_done = getattr(instance, '_saved_is_done', None)
+        if was_done is not None:
+            _bump_task_counters(
+                instance, instance.task_id,
+                checklist_done=int(instance.is_done) - int(was_done),
+            )
+
+    instance._saved_is_done = instance.is_done
+
+
+@receiver(post_delete, sender=ChecklistItem)
+def checklist_item_deleted(sender, instance, **kwargs):
+    _bump_task_counters(
+        instance, instance.task_id,
+        checklist_total=-1,
+        checklist_done=-int(instance.is_done),
+    )
+
+
+@receiver(post_save, sender=Note)
+def note_saved(sender, instance, created, raw, update_fields, **kwargs):
+    """Keep Task.notes_count in sync on create and reassignment."""
+    if raw:
+        return
+
+    if created:
+        _bump_task_counters(instance, instance.task_id, notes_count=1)
+    elif hasattr(instance, '_saved_task_id') and (
+        update_fields is None or 'task' in update_fields
+    ):
+        old_task_id = instance._saved_task_id
+        if old_task_id != instance.task_id:
+            _bump_task_counters(instance, old_task_id, notes_count=-1)
+            _bump_task_counters(instance, instance.task_id, notes_count=1)
+
+    instance._saved_task_id = instance.task_id
+
+
+@receiver(post_delete, sender=Note)
+def note_deleted(sender, instance, **kwargs):
+    _bump_task_counters(instance, instance.task_id, notes_count=-1)
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, using, **kwargs):
+    """Recreate SQLite FTS triggers dropped by a tasks_task table rebuild."""
+    if sender.name != 'task_manager.tasks':
+        return
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        ensure_sqlite_search_index(connection)
@@ -2,6 +2,7 @@ from django.urls import path
 
 from task_manager.tasks.views import (
     TaskFilterView,
+    TaskRowsView,
     TaskCreateView,
     TaskUpdateView,
     TaskDeleteView,
@@ -16,6 +17,7 @@ app_name = 'tasks'
 
 urlpatterns = [
     path('', TaskFilterView.as_view(), name="tasks-list"),
+    path('rows/', TaskRowsView.as_view(), name="tasks-rows"),
     path('create/',
          TaskCreateView.as_view(), name='task-create'),
     path('<uuid:uuid>/update/',
@@ -1,41 +1,61 @@
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
-from task_manager.permissions import CustomPermissions, UNAUTHORIZED_MESSAGE
+from task_manager.conditional import ConditionalListMixin
+from task_manager.permissions import (
+    CustomPermissions,
+    UNAUTHORIZED_MESSAGE,
+    get_permissions,
+)
 from django.urls import reverse_lazy
-from django.utils.translation import gettext_lazy as _
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language, gettext_lazy as _
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from django.db import models
-from django.db.models import Count, OuterRef, Subquery, Value
-from django.db.models.functions import Coalesce
 from .models import Task, ChecklistItem
-from task_manager.notes.models import Note
 from task_manager.tasks.forms import TaskForm
 from django.shortcuts import redirect, get_object_or_404
 from django_filters.views import FilterView
 from task_manager.tasks.filters import TaskFilter
+from task_manager.tasks.rows import prepare_rows
+from task_manager.tasks.search import get_terms
+from task_manager.team_cache import request_scope
+from task_manager.user.preferences import (
+    delete_preference,
+    get_preference,
+    set_preference,
+)
+from task_manager.tasks.pagination import (
+    CURSOR_PARAM,
+    get_ordering,
+    paginate_by_cursor,
+)
 from urllib.parse import urlencode
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
+from django.conf import settings
 from task_manager.limit_service import LimitService
 import json
 
 
-# Session keys for storing filter settings (context-aware)
-SESSION_FILTER_KEY_PREFIX = 'task_filter_params'
-SESSION_FILTER_ENABLED_KEY_PREFIX = 'task_filter_enabled'
+# User preference holding the default filter (context-aware)
+FILTER_PREFERENCE_KEY_PREFIX = 'task_filter'
 
 
-def _get_filter_session_keys(request):
-    """Get context-aware session keys for filter settings."""
+def get_filter_preference_key(request):
+    """Get the context-aware preference key of the default filter."""
     team = getattr(request, 'active_team', None)
     if team:
         suffix = str(team.uuid)
     else:
         suffix = 'individual'
-    return (
-        f"{SESSION_FILTER_KEY_PREFIX}_{suffix}",
-        f"{SESSION_FILTER_ENABLED_KEY_PREFIX}_{suffix}",
+    return f"{FILTER_PREFERENCE_KEY_PREFIX}_{suffix}"
+
+
+def get_saved_filter(request):
+    """Default filter parameters of the user in this context, or {}."""
+    return get_preference(
+        request.user.pk, get_filter_preference_key(request), {}
     )
 
 
@@ -47,6 +67,7 @@ SERVICE_PARAMS = (
     'view_mode',
     'sort',
     'page',
+    CURSOR_PARAM,
 )
 
 # Sort options for task list
@@ -57,19 +78,28 @@ SORT_OPTIONS = {
     'created_at': _('Oldest first'),
     'name': _('Name A→Z'),
     '-name': _('Name Z→A'),
+    '-search_rank': _('Relevance'),
 }
 DEFAULT_SORT = '-created_at'
 
+# Task list layouts: each one renders rows with its own partial template
+VIEW_MODES = {
+    'full': 'tasks/partials/task_row_full.html',
+    'simple': 'tasks/partials/task_row_simple.html',
+}
+DEFAULT_VIEW_MODE = 'full'
+
+# Page links shown around the current page and at each end of the list
+PAGINATION_ON_EACH_SIDE = 2
+PAGINATION_ON_ENDS = 1
+# Sort options that need a search query (search_rank is annotated by it)
+SEARCH_SORT_OPTIONS = ('-search_rank',)
+
 
 class TaskDeletePermissionMixin():
     def dispatch(self, request, *args, **kwargs):
         task = self.get_object()
-        is_author = task.author == request.user
-        is_team_admin = (
-            task.team
-            and task.team.is_admin(request.user)
-        )
-        if not is_author and not is_team_admin:
+        if not get_permissions(request).can_delete_task(task):
             messages.error(
                 request,
                 _("Task can only be deleted by its author or team admin.")
@@ -81,13 +111,7 @@ class TaskDeletePermissionMixin():
 class TaskUpdatePermissionMixin():
     def dispatch(self, request, *args, **kwargs):
         task = self.get_object()
-        is_author = task.author == request.user
-        is_executor = request.user in task.executors.all()
-        is_team_admin = (
-            task.team
-            and task.team.is_admin(request.user)
-        )
-        if not is_author and not is_executor and not is_team_admin:
+        if not get_permissions(request).can_edit_task(task):
             messages.error(
                 request,
                 _("Task can only be updated by its author, executors "
@@ -97,19 +121,21 @@ class TaskUpdatePermissionMixin():
         return super().dispatch(request, *args, **kwargs)
 
 
-class TaskFilterView(CustomPermissions, FilterView):
+class TaskFilterView(CustomPermissions, ConditionalListMixin, FilterView):
     model = Task
     template_name = 'tasks/task_filter.html'
     filterset_class = TaskFilter
     paginate_by = 50
+    owner_field = 'author'
+    modified_field = 'updated_at'
+    counter_fields = ('notes_count', 'checklist_total', 'checklist_done')
 
     def get(self, request, *args, **kwargs):
         # Handle reset filter button (removes saved default filter)
         if 'reset_default' in request.GET:
-            filter_key, enabled_key = _get_filter_session_keys(request)
-            request.session.pop(filter_key, None)
-            request.session.pop(enabled_key, None)
-            request.session.pop(f'{filter_key}_explicit', None)
+            delete_preference(
+                request.user.pk, get_filter_preference_key(request)
+            )
             # Redirect to clean list with open filter panel
             show_filter = request.GET.get('show_filter', '')
             if show_filter:
@@ -118,7 +144,7 @@ class TaskFilterView(CustomPermissions, FilterView):
 
         # Handle saving filter (when checkbox is checked and form is submitted)
         if 'save_as_default' in request.GET:
-            self._save_filter_to_session(request)
+            self._save_default_filter(request)
 
         # If no filter parameters - apply the saved filter
         if self._should_apply_saved_filter(request):
@@ -126,6 +152,12 @@ class TaskFilterView(CustomPermissions, FilterView):
 
         return super().get(request, *args, **kwargs)
 
+    def get_validator_parts(self):
+        # The saved default filter is shown in the filter panel
+        return super().get_validator_parts() + [
+            get_saved_filter(self.request),
+        ]
+
     def _get_filter_params(self, request):
         """Extract filter parameters from GET (without service params).
 
@@ -147,21 +179,32 @@ class TaskFilterView(CustomPermissions, FilterView):
         sort = self.request.GET.get('sort', DEFAULT_SORT)
         if sort not in SORT_OPTIONS:
             sort = DEFAULT_SORT
+        if sort in SEARCH_SORT_OPTIONS and not self._has_search_query():
+            sort = DEFAULT_SORT
         return sort
 
-    def _save_filter_to_session(self, request):
-        """Save current filter parameters to session."""
+    def _get_view_mode(self):
+        """Get validated layout of the task list."""
+        view_mode = self.request.GET.get('view_mode', DEFAULT_VIEW_MODE)
+        if view_mode not in VIEW_MODES:
+            view_mode = DEFAULT_VIEW_MODE
+        return view_mode
+
+    def _has_search_query(self):
+        return bool(get_terms(self.request.GET.get('search')))
+
+    def _save_default_filter(self, request):
+        """Save current filter parameters as the user's default."""
         filter_params = self._get_filter_params(request)
 
         # Don't save empty filter (user cleared all fields)
         if not filter_params:
             return
 
-        filter_key, enabled_key = _get_filter_session_keys(request)
-
-        request.session[filter_key] = filter_params
-        request.session[enabled_key] = True
-        request.session[f'{filter_key}_explicit'] = True
+        set_preference(
+            request.user.pk, get_filter_preference_key(request),
+            filter_params,
+        )
         messages.success(request, _('Filter saved as default'))
 
     def _should_apply_saved_filter(self, request):
@@ -180,16 +223,11 @@ class TaskFilterView(CustomPermissions, FilterView):
             return False
 
         # Check if saved filter exists (context-aware)
-        filter_key, enabled_key = _get_filter_session_keys(request)
-        filter_enabled = request.session.get(enabled_key, False)
-        saved_params = request.session.get(filter_key, {})
-
-        return filter_enabled and saved_params
+        return bool(get_saved_filter(request))
 
     def _redirect_with_saved_filter(self, request):
         """Redirect with saved filter parameters applied."""
-        filter_key, _ = _get_filter_session_keys(request)
-        saved_params = request.session.get(filter_key, {})
+        saved_params = get_saved_filter(request)
         # saved_params is already in list format from .lists()
         query_string = urlencode(saved_params, doseq=True)
         return redirect(f"{request.path}?{query_string}")
@@ -211,54 +249,52 @@ class TaskFilterView(CustomPermissions, FilterView):
         # Optimize single relations with select_related
         qs = qs.select_related('status', 'author', 'updated_by')
 
-        # Create Subquery annotations for counts to avoid N+1 queries
-        # This prevents duplicate rows from ManyToMany JOINs
-        notes_count_subq = Note.objects.filter(
-            task=OuterRef('pk')
-        ).values('task').annotate(c=Count('*')).values('c')
+        # notes_count / checklist_total / checklist_done are stored on
+        # the task itself, so no per-row count subqueries are needed
 
-        checklist_total_subq = ChecklistItem.objects.filter(
-            task=OuterRef('pk')
-        ).values('task').annotate(c=Count('*')).values('c')
+        # Labels and executors (card layout only) are prefetched for the
+        # rows of the page that are not cached, see prepare_rows()
 
-        checklist_done_subq = ChecklistItem.objects.filter(
-            task=OuterRef('pk'), is_done=True
-        ).values('task').annotate(c=Count('*')).values('c')
+        # Ordering matches the composite indexes on Task (id makes it
+        # total). No DISTINCT needed: TaskFilter checks to-many relations
+        # with EXISTS subqueries, which never repeat a task.
+        return qs.order_by(*get_ordering(sort))
 
-        # Apply annotations with Coalesce to handle null values
-        qs = qs.annotate(
-            annotated_notes_count=Coalesce(
-                Subquery(notes_count_subq), Value(0)
-            ),
-            annotated_checklist_total=Coalesce(
-                Subquery(checklist_total_subq), Value(0)
-            ),
-            annotated_checklist_done=Coalesce(
-                Subquery(checklist_done_subq), Value(0)
-            )
-        )
-
-        # Prefetch ManyToMany and reverse relations
-        qs = qs.prefetch_related('labels', 'executors', 'notes__author')
+    def _use_cursor_pagination(self, queryset):
+        """Decide between page-number and cursor pagination.
 
-        # Apply distinct and ordering
-        return qs.distinct().order_by(sort)
+        An explicit ?cursor= or ?page= wins. Otherwise small result sets
+        keep page numbers and large ones switch to cursor mode. The size
+        check is a COUNT over a LIMITed subquery, so it is bounded.
+        """
+        if CURSOR_PARAM in self.request.GET:
+            return True
+        if 'page' in self.request.GET:
+            return False
+        threshold = settings.TASK_LIST_CURSOR_THRESHOLD
+        return queryset[:threshold + 1].count() > threshold
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self._use_cursor_pagination(queryset):
+            return super().paginate_queryset(queryset, page_size)
+
+        page = paginate_by_cursor(
+            queryset,
+            self._get_sort_param(),
+            self.request.GET.get(CURSOR_PARAM),
+            page_size,
+        )
+        return (None, page, page.object_list, page.has_other_pages())
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         # Information about saved filter for template rendering (context-aware)
-        filter_key, enabled_key = _get_filter_session_keys(self.request)
-        saved_params = self.request.session.get(filter_key, {})
-
-        # Check if user explicitly saved this filter (not auto-applied)
-        user_explicitly_saved = self.request.session.get(
-            f'{filter_key}_explicit', False
-        )
+        saved_params = get_saved_filter(self.request)
 
         context['saved_filter_params'] = saved_params
-        # Checkbox is checked only when user explicitly saved filter
-        context['saved_filter_enabled'] = user_explicitly_saved
+        # A default filter is only ever saved explicitly by the user
+        context['saved_filter_enabled'] = bool(saved_params)
         context['has_saved_filter'] = bool(saved_params)
 
         # Count of active filter params (not empty)
@@ -276,14 +312,146 @@ class TaskFilterView(CustomPermissions, FilterView):
         context['current_sort'] = current_sort
         context['current_sort_label'] = SORT_OPTIONS.get(
             current_sort, SORT_OPTIONS[DEFAULT_SORT])
-        context['sort_options'] = SORT_OPTIONS
-
-        query_params = self.request.GET.copy()
-        query_params.pop('page', None)
-        context['query_string'] = query_params.urlencode()
+        if self._has_search_query():
+            context['sort_options'] = SORT_OPTIONS
+        else:
+            context['sort_options'] = {
+                key: label for key, label in SORT_OPTIONS.items()
+                if key not in SEARCH_SORT_OPTIONS
+            }
+
+        # Cursor mode has no paginator and therefore no total count
+        paginator = context.get('paginator')
+        context['cursor_mode'] = paginator is None
+        context['task_count'] = paginator.count if paginator else None
+
+        # Only the selected layout is rendered
+        view_mode = self._get_view_mode()
+        context['view_mode'] = view_mode
+        context['task_row_template'] = VIEW_MODES[view_mode]
+        self._prepare_rows(context, view_mode)
+
+        # Links are built once here instead of rebuilding the query string
+        # from request.GET for every link in the template
+        context.update(self._get_toolbar_urls(view_mode))
+        context['sort_links'] = self._get_sort_links(
+            context['sort_options'], current_sort
+        )
+        context.update(self._get_pagination_urls(paginator, context))
 
         return context
 
+    def _prepare_rows(self, context, view_mode):
+        """Read the cached rows of the page, see rows.py."""
+        page = context['page_obj']
+        # The page and the context share the instances given cached rows
+        tasks = list(page.object_list)
+        name = self.get_context_object_name(page.object_list)
+        page.object_list = context['object_list'] = context[name] = tasks
+        prepare_rows(
+            tasks, request_scope(self.request), get_language(), view_mode
+        )
+
+    def _url(self, keep_position=False, **changes):
+        """
+        Return a '?query' link to the list with some parameters changed.
+
+        A value of None removes the parameter. The page position is
+        dropped unless ``keep_position`` is set or it is changed explicitly.
+        """
+        params = self.request.GET.copy()
+        dropped = changes if keep_position else ('page', CURSOR_PARAM, *changes)
+        for key in dropped:
+            params.pop(key, None)
+        for key, value in changes.items():
+            if value is not None:
+                params[key] = value
+        # urlencode() leaves nothing but '&' that HTML escaping would touch
+        return mark_safe(f'?{params.urlencode()}')
+
+    def _get_toolbar_urls(self, view_mode):
+        show_view_mode = None if view_mode == DEFAULT_VIEW_MODE else view_mode
+        return {
+            'view_mode_toggle_url': self._url(
+                keep_position=True,
+                view_mode='simple' if view_mode == DEFAULT_VIEW_MODE
+                else None,
+            ),
+            'hide_filter_url': self._url(keep_position=True, show_filter=None),
+            'show_filter_url': self._url(keep_position=True, show_filter='1'),
+            # Opening the panel starts from an empty filter form
+            'open_filter_url': mark_safe('?' + urlencode({
+                key: value for key, value in (
+                    ('view_mode', show_view_mode), ('show_filter', '1'),
+                ) if value
+            })),
+            'reset_filter_url': self._url(reset_default='1'),
+        }
+
+    def _get_sort_links(self, sort_options, current_sort):
+        return [
+            {
+                'label': label,
+                'url': self._url(sort=key),
+                'active': key == current_sort,
+                'descending': key.startswith('-'),
+            }
+            for key, label in sort_options.items()
+        ]
+
+    def _get_pagination_urls(self, paginator, context):
+        """Previous/next links and a windowed list of page links."""
+        page = context.get('page_obj')
+        if not context.get('is_paginated'):
+            return {}
+        if paginator is None:
+            return {
+                'first_page_url': self._url(**{CURSOR_PARAM: ''}),
+                'previous_page_url': page.has_previous() and self._url(
+                    **{CURSOR_PARAM: page.previous_cursor}
+                ),
+                'next_page_url': page.has_next() and self._url(
+                    **{CURSOR_PARAM: page.next_cursor}
+                ),
+            }
+        return {
+            'previous_page_url': page.has_previous() and self._url(
+                page=page.previous_page_number()
+            ),
+            'next_page_url': page.has_next() and self._url(
+                page=page.next_page_number()
+            ),
+            'page_links': [
+                {
+                    'number': number,
+                    'url': self._url(page=number),
+                    'current': number == page.number,
+                }
+                if number != paginator.ELLIPSIS else {'number': None}
+                for number in paginator.get_elided_page_range(
+                    page.number,
+                    on_each_side=PAGINATION_ON_EACH_SIDE,
+                    on_ends=PAGINATION_ON_ENDS,
+                )
+            ],
+        }
+
+
+class TaskRowsView(TaskFilterView):
+    """
+    Task list rows and pagination only, without the page layout.
+
+    Used by the task list to switch pages and view modes and to load
+    more rows on scroll without re-rendering the navbar or filter panel.
+    Takes the same query parameters as the task list.
+    """
+    template_name = 'tasks/partials/task_rows.html'
+
+    def get(self, request, *args, **kwargs):
+        # Saving, resetting and applying default filters is handled by the
+        # full page; the rows always follow the given parameters
+        return ConditionalListMixin.get(self, request, *args, **kwargs)
+
 
 class TaskCreateView(CustomPermissions, SuccessMessageMixin, CreateView):
     form_class = TaskForm
@@ -399,11 +567,7 @@ class TaskDeleteView(TaskDeletePermissionMixin,
 
 def _check_task_edit_permission(request, task):
     """Check if user can edit task (author, executor or team admin)."""
-    is_author = task.author == request.user
-    is_executor = request.user in task.executors.all()
-    is_team_admin = task.team and task.team.is_admin(request.user)
-
-    if not is_author and not is_executor and not is_team_admin:
+    if not get_permissions(request).can_edit_task(task):
         return JsonResponse(
             {'error': _("Task can only be updated by its author, "
                         "executors or team admin.")},
@@ -539,11 +703,13 @@ def checklist_toggle(request, uuid, item_id):
     if error:
         return error
 
-    item = get_object_or_404(ChecklistItem, id=item_id, task=task)
+    item = get_object_or_404(task.checklist_items, id=item_id)
 
-    # Toggle the done status
-    item.is_done = not item.is_done
-    item.save()
+    if item.toggle():
+        task.checklist_done += 1 if item.is_done else -1
+    else:
+        # Toggled by a concurrent request already
+        task.refresh_from_db(fields=Task.COUNTER_FIELDS)
 
     return JsonResponse({
         'id': item.id,
@@ -569,7 +735,7 @@ def checklist_delete(request, uuid, item_id):
     if error:
         return error
 
-    item = get_object_or_404(ChecklistItem, id=item_id, task=task)
+    item = get_object_or_404(task.checklist_items, id=item_id)
 
     # Delete the checklist item
     item.delete()
@@ -0,0 +1,147 @@
+"""
+Cache entries scoped to a team, or to a user's personal space (and to
+a task, or to the names shown with the tasks of a team or user).
+
+Keys include the current generation of their scope. Saving or deleting
+a task, status, label, note or team membership bumps the generation of
+its scope when the transaction commits (see signals.py), so all entries
+of the scope go stale at once without being found and deleted: one
+``cache.incr`` whatever their number. Stale entries are never read
+again and expire after TEAM_CACHE_TIMEOUT, which also bounds what
+bypasses signals, such as ``QuerySet.update()``, and bumps that a
+per-process cache (locmem) does not see.
+
+Read the value to cache after get_generation(), as the helpers here do:
+a change committed in between then only makes the entry stale.
+"""
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+GENERATION_CACHE_KEY = 'cache_generation:{scope}'
+
+
+def team_scope(team_id):
+    return f'team:{team_id}'
+
+
+def user_scope(user_id):
+    return f'user:{user_id}'
+
+
+def task_scope(task_id):
+    """Scope of what is shown of one task, e.g. its row in the task list."""
+    return f'task:{task_id}'
+
+
+def names_scope(scope):
+    """
+    Scope of the status, label and user names shown with the tasks of
+    scope, which change much less often than the tasks.
+    """
+    return f'{scope}:names'
+
+
+def request_scope(request):
+    """Scope of the request: its active team, or the user's own space."""
+    team = getattr(request, 'active_team', None)
+    if team is not None:
+        return team_scope(team.pk)
+    return user_scope(request.user.pk)
+
+
+def _generation_key(scope):
+    return GENERATION_CACHE_KEY.format(scope=scope)
+
+
+def get_generation(scope):
+    """Current generation of scope."""
+    key = _generation_key(scope)
+    generation = cache.get(key)
+    if generation is None:
+        # Starting from the clock rather than 1 keeps an expired counter
+        # from coming back to a generation that has entries already. It
+        # expires like the entries, which bounds how long per-process
+        # caches miss bumps made by other processes
+        cache.add(key, time.time_ns() // 1000, settings.TEAM_CACHE_TIMEOUT)
+        generation = cache.get(key, 0)
+    return generation
+
+
+def get_generations(scopes):
+    """{scope: current generation} of several scopes, in one round trip."""
+    keys = {_generation_key(scope): scope for scope in scopes}
+    generations = {
+        keys[key]: generation
+        for key, generation in cache.get_many(keys).items()
+    }
+    missing = {
+        key: time.time_ns() // 1000
+        for key, scope in keys.items() if scope not in generations
+    }
+    if missing:
+        cache.set_many(missing, settings.TEAM_CACHE_TIMEOUT)
+        generations.update(
+            (keys[key], generation) for key, generation in missing.items()
+        )
+    return generations
+
+
+def _bump(scopes):
+    for scope in scopes:
+        try:
+            cache.incr(_generation_key(scope))
+        except ValueError:
+            # Not cached: the next get_generation() starts a new one
+            pass
+
+
+def bump_generation(*scopes):
+    """Invalidate the entries of scopes when the transaction commits."""
+    scopes = set(scopes)
+    if scopes:
+        transaction.on_commit(partial(_bump, scopes))
+
+
+def bump_generation_now(*scopes):
+    """Invalidate the entries of scopes at once, e.g. after a commit."""
+    _bump(set(scopes))
+
+
+def scoped_key(scope, name, *parts):
+    """Cache key of the entry name of scope in its current generation."""
+    return ':'.join(
+        ['team_cache', scope, str(get_generation(scope)), name]
+        + [str(part) for part in parts]
+    )
+
+
+_missing = object()
+
+
+def get_or_set(scope, name, compute, *parts, timeout=None):
+    """
+    The cached value of name (and parts, e.g. a language or filter) in
+    scope, or compute() cached until the scope changes.
+    """
+    key = scoped_key(scope, name, *parts)
+    value = cache.get(key, _missing)
+    if value is _missing:
+        value = compute()
+        cache.set(
+            key,
+            value,
+            settings.TEAM_CACHE_TIMEOUT if timeout is None else timeout,
+        )
+    return value
+
+
+def cached_list(scope, name, queryset, *parts, timeout=None):
+    """The rows of queryset as a list, cached like get_or_set()."""
+    return get_or_set(
+        scope, name, partial(list, queryset), *parts, timeout=timeout
+    )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TeamsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.teams'
+
+    def ready(self):
+        import task_manager.teams.signals  # noqa: F401
@@ -5,6 +5,9 @@ from task_manager.user.models import User
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinLengthValidator, MaxLengthValidator
 
+from task_manager import usage
+from task_manager.tracking import TrackedFieldsModel
+
 
 class Team(models.Model):
     id = models.AutoField(primary_key=True)
@@ -66,7 +69,7 @@ class Team(models.Model):
         return self.name
 
 
-class TeamMembership(models.Model):
+class TeamMembership(TrackedFieldsModel, usage.UsageCountedModel):
     uuid = models.UUIDField(
         default=uuid.uuid4,
         unique=True,
@@ -107,6 +110,18 @@ class TeamMembership(models.Model):
     class Meta:
         unique_together = ['user', 'team']
 
+    # Admin memberships are the user's own teams
+    USAGE_FIELDS = ('user_id', 'team_id', 'role', 'status')
+    TRACKED_FIELDS = ('role', 'status')
+
+    def get_usage_keys(self):
+        return usage.usage_keys(
+            ('user', self.user_id if self.role == 'admin' else None,
+             usage.TEAMS),
+            ('team', self.team_id if self.status == 'active' else None,
+             usage.TEAM_MEMBERS),
+        )
+
     def __str__(self):
         return f"{self.user.username} - {self.team.name} ({self.role})"
 
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from task_manager.middleware.team_middleware import invalidate_active_team
+from task_manager.teams.models import Team, TeamMembership
+
+
+@receiver(post_save, sender=TeamMembership)
+def membership_saved(sender, instance, created, **kwargs):
+    """Role or status changes must reach the member's next request."""
+    if created or instance.changed_fields:
+        invalidate_active_team(instance.user_id)
+
+
+@receiver(post_delete, sender=TeamMembership)
+def membership_deleted(sender, instance, **kwargs):
+    """Team deletion is covered too: it deletes memberships by cascade."""
+    invalidate_active_team(instance.user_id)
+
+
+@receiver(post_save, sender=Team)
+def team_saved(sender, instance, created, **kwargs):
+    """The cached membership includes the team name."""
+    if created:
+        return
+    invalidate_active_team(
+        *instance.memberships.values_list('user_id', flat=True)
+    )
@@ -2,7 +2,8 @@ from django.http import HttpResponseRedirect
 from django.contrib.auth.mixins import LoginRequiredMixin
 from task_manager.permissions import (
     TeamAdminPermissions,
-    TeamMembershipAdminPermissions
+    TeamMembershipAdminPermissions,
+    get_permissions,
 )
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
@@ -25,6 +26,7 @@ from task_manager.teams.models import Team, TeamMembership, TeamInvite
 from task_manager.tasks.models import Task
 from task_manager.statuses.models import Status
 from task_manager.limit_service import LimitService
+from task_manager.team_cache import get_or_set, team_scope
 from task_manager.notifications.services import (
     notify_team_join_request,
     notify_team_member_joined,
@@ -195,7 +197,7 @@ class TeamExitView(LoginRequiredMixin, View):
 
     def _check_admin_removal_allowed(self, request, team, target_user):
         """Check if admin can remove another member"""
-        if not team.is_admin(request.user):
+        if not get_permissions(request).is_team_admin(team):
             messages.error(
                 request,
                 _('You do not have rights to manage team members. '
@@ -674,21 +676,24 @@ class TeamDetailView(LoginRequiredMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        team = self.get_object()
+        team = self.object
 
         # get all team members with their roles
         memberships = TeamMembership.objects.filter(
             team=team).select_related('user')
         context['memberships'] = memberships
-        context['is_admin'] = team.is_admin(self.request.user)
+        context['is_admin'] = get_permissions(self.request).is_team_admin(team)
 
         # get active member count (excluding deleted users)
-        active_count = TeamMembership.objects.filter(
-            team=team,
-            status='active',
-            user__is_deleted=False
-        ).count()
-        context['active_member_count'] = active_count
+        context['active_member_count'] = get_or_set(
+            team_scope(team.pk),
+            'active_member_count',
+            TeamMembership.objects.filter(
+                team=team,
+                status='active',
+                user__is_deleted=False
+            ).count,
+        )
 
         # get team usage summary for limits display
         service = LimitService(self.request.user)
@@ -760,10 +765,12 @@ class TeamMemberRoleUpdateView(TeamMembershipAdminPermissions, UpdateView):
         return reverse_lazy(USER_LIST_URL)
 
     def form_valid(self, form):
-        membership = self.get_object()
-        old_role = membership.role
+        # The form has applied the new values; the field snapshot still
+        # holds the stored ones until the membership is saved
+        membership = form.instance
+        old_role = membership.get_saved_value('role')
         new_role = form.cleaned_data['role']
-        old_status = membership.status
+        old_status = membership.get_saved_value('status')
         new_status = form.cleaned_data['status']
         team = membership.team
 
@@ -40,6 +40,10 @@ self.addEventListener('fetch', (e) => {
 
   const url = new URL(e.request.url);
 
+  // Живые уведомления (SSE, long poll): браузер работает с ними напрямую
+  if (url.pathname.startsWith('{% url "notifications:stream" %}') ||
+      url.pathname.startsWith('{% url "notifications:poll" %}')) return;
+
   // Навигация: Network First
   if (e.request.mode === 'navigate') {
     e.respondWith(
@@ -0,0 +1,79 @@
+"""
+Snapshots of field values as stored in the database.
+
+Models inheriting ``TrackedFieldsModel`` remember the stored value of each
+field in ``TRACKED_FIELDS`` when loaded (``from_db``), saved or refreshed,
+so saves and signal handlers can tell what changed without re-reading
+the row::
+
+    task = Task.objects.get(pk=pk)
+    task.status = done
+    task.has_changed('status')  # True
+    task.changed_fields         # ['status']
+
+Foreign keys are compared by id. A field whose stored value is unknown
+(new instance, or deferred when the row was loaded) counts as changed
+once it is assigned.
+During post_save the snapshot still holds the values from before the
+save; it is updated once ``save()`` returns.
+"""
+from django.db import models
+
+
+class TrackedFieldsModel(models.Model):
+    """Base for models that track changes of TRACKED_FIELDS."""
+
+    TRACKED_FIELDS = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._take_snapshot()
+        return instance
+
+    def _take_snapshot(self, fields=None):
+        """Record current values of the tracked fields (all by default)."""
+        snapshot = self.__dict__.setdefault('_field_snapshot', {})
+        for name in self.TRACKED_FIELDS:
+            attname = self._meta.get_field(name).attname
+            if fields is not None and not {name, attname} & set(fields):
+                continue
+            if attname in self.__dict__:
+                snapshot[name] = self.__dict__[attname]
+            else:
+                snapshot.pop(name, None)
+
+    def get_saved_value(self, field):
+        """Stored value of a tracked field (the id for a foreign key)."""
+        return self.__dict__.get('_field_snapshot', {}).get(field)
+
+    def has_changed(self, field):
+        """Whether a tracked field differs from its stored value."""
+        attname = self._meta.get_field(field).attname
+        if attname not in self.__dict__:
+            # Deferred and never assigned
+            return False
+        snapshot = self.__dict__.get('_field_snapshot', {})
+        if field not in snapshot:
+            return True
+        return self.__dict__[attname] != snapshot[field]
+
+    @property
+    def changed_fields(self):
+        """Tracked fields that differ from their stored values."""
+        return [
+            name for name in self.TRACKED_FIELDS if self.has_changed(name)
+        ]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._take_snapshot(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(
+            using=using, fields=fields, from_queryset=from_queryset
+        )
+        self._take_snapshot(fields)
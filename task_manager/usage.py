@@ -0,0 +1,154 @@
+"""
+Materialized resource usage for plan limits.
+
+Models counted towards a plan limit inherit ``UsageCountedModel`` and
+list the counters a row contributes to in ``get_usage_keys()``. Signals
+(see signals.py) and ``bulk_create`` keep ``UsageCounter`` in sync;
+anything that bypasses them, such as ``QuerySet.update()`` of an owner
+field, is fixed by the ``reconcile_usage_counters`` command.
+"""
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import Count
+
+
+# User counters
+TEAMS = 'teams'
+TASKS = 'tasks'
+PERSONAL_STATUSES = 'personal_statuses'
+PERSONAL_LABELS = 'personal_labels'
+PERSONAL_NOTES = 'personal_notes'
+
+# Team counters (tasks are counted for both the author and the team)
+TEAM_MEMBERS = 'team_members'
+TEAM_STATUSES = 'team_statuses'
+TEAM_LABELS = 'team_labels'
+TEAM_NOTES = 'team_notes'
+
+
+def usage_keys(*keys):
+    """Counter keys (kind, owner id, resource) that have an owner."""
+    return frozenset(key for key in keys if key[1] is not None)
+
+
+class UsageCountedQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from task_manager.models import UsageCounter
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            # With conflict handling it is unknown which rows were inserted
+            if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+                return objs
+            deltas = Counter()
+            for obj in objs:
+                obj._saved_usage_keys = obj.get_usage_keys()
+                deltas.update(obj._saved_usage_keys)
+            UsageCounter.bump(deltas)
+        return objs
+
+
+class UsageCountedModel(models.Model):
+    """Base for models whose rows count towards a plan limit."""
+
+    # Attributes read by get_usage_keys()
+    USAGE_FIELDS = ()
+
+    objects = UsageCountedQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def get_usage_keys(self):
+        """Return the counters this row is counted in, see usage_keys()."""
+        raise NotImplementedError
+
+    def get_loaded_usage_keys(self):
+        """Usage keys, or None if an owner field is deferred."""
+        if any(field not in self.__dict__ for field in self.USAGE_FIELDS):
+            return None
+        return self.get_usage_keys()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored owners so signals can move counters when
+        # they change, without re-reading the row
+        instance._saved_usage_keys = instance.get_loaded_usage_keys()
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The row and its usage counters (post_save) change together
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
+
+def count_usage(get_model):
+    """
+    Count usage from the resource tables.
+
+    ``get_model`` is ``apps.get_model`` so that migrations can pass their
+    historical app registry. Returns {(kind, owner id, resource): count}.
+    """
+    Task = get_model('tasks', 'Task')
+    Status = get_model('statuses', 'Status')
+    Label = get_model('labels', 'Label')
+    Note = get_model('notes', 'Note')
+    TeamMembership = get_model('teams', 'TeamMembership')
+
+    personal = {'team__isnull': True}
+    sources = [
+        ('user', TEAMS, TeamMembership.objects.filter(role='admin'), 'user'),
+        ('user', TASKS, Task.objects.all(), 'author'),
+        ('user', PERSONAL_STATUSES, Status.objects.filter(**personal),
+         'creator'),
+        ('user', PERSONAL_LABELS, Label.objects.filter(**personal),
+         'creator'),
+        ('user', PERSONAL_NOTES, Note.objects.filter(**personal), 'author'),
+        ('team', TEAM_MEMBERS, TeamMembership.objects.filter(status='active'),
+         'team'),
+        ('team', TASKS, Task.objects.all(), 'team'),
+        ('team', TEAM_STATUSES, Status.objects.all(), 'team'),
+        ('team', TEAM_LABELS, Label.objects.all(), 'team'),
+        ('team', TEAM_NOTES, Note.objects.all(), 'team'),
+    ]
+    usage = {}
+    for kind, resource, queryset, owner in sources:
+        rows = queryset.filter(**{f'{owner}__isnull': False}).values(
+            owner
+        ).annotate(n=Count('*')).values_list(owner, 'n').order_by()
+        for owner_id, n in rows:
+            usage[(kind, owner_id, resource)] = n
+    return usage
+
+
+def find_usage_drift(get_model):
+    """
+    Compare stored counters with the resource tables.
+
+    Returns (changed counters, new counters): UsageCounter instances with
+    the actual count set, the changed ones carry the stored count in
+    ``stored_count``.
+    """
+    UsageCounter = get_model('task_manager', 'UsageCounter')
+    actual = count_usage(get_model)
+
+    changed = []
+    for counter in UsageCounter.objects.order_by('pk'):
+        kind = 'user' if counter.user_id else 'team'
+        key = (kind, counter.user_id or counter.team_id, counter.resource)
+        count = actual.pop(key, 0)
+        if counter.count != count:
+            counter.stored_count = counter.count
+            counter.count = count
+            changed.append(counter)
+
+    created = [
+        UsageCounter(
+            count=count, resource=resource, **{f'{kind}_id': owner_id}
+        )
+        for (kind, owner_id, resource), count in sorted(actual.items())
+    ]
+    return changed, created
@@ -9,7 +9,10 @@ class UserForm(forms.ModelForm):
 
     class Meta:
         model = User
-        fields = ['username', 'first_name', 'last_name', 'description']
+        fields = [
+            'username', 'first_name', 'last_name', 'description',
+            'digest_notifications',
+        ]
 
         help_texts = {
             'first_name': _('Optional'),
@@ -94,6 +97,7 @@ class UserForm(forms.ModelForm):
             'first_name',
             'last_name',
             'description',
+            'digest_notifications',
             'join_team_name',
             'join_team_password',
         ]:
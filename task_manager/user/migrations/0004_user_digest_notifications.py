@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_alter_user_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='digest_notifications',
+            field=models.BooleanField(default=False, help_text='Receive status changes, completed tasks and new team members as one periodic summary.', verbose_name='Notification digest'),
+        ),
+    ]
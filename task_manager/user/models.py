@@ -13,6 +13,14 @@ class User(AbstractUser):
         default='',
         validators=[MaxLengthValidator(20000)]
     )
+    digest_notifications = models.BooleanField(
+        default=False,
+        verbose_name=_('Notification digest'),
+        help_text=_(
+            'Receive status changes, completed tasks and new team members '
+            'as one periodic summary.'
+        )
+    )
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
@@ -54,7 +62,7 @@ class User(AbstractUser):
                     # Promote the next member to admin
                     next_admin = other_memberships.order_by('joined_at').first()
                     next_admin.role = 'admin'
-                    next_admin.save()
+                    next_admin.save(update_fields=['role'])
                 else:
                     # No other active members, delete the team
                     team.delete()
@@ -62,4 +70,35 @@ class User(AbstractUser):
 
             # Deactivate membership
             membership.status = 'inactive'
-            membership.save()
+            membership.save(update_fields=['status'])
+
+
+class UserPreference(models.Model):
+    """
+    A setting a user keeps across sessions and devices, e.g. their
+    default task filter. Read through the cache, see preferences.py.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='preferences',
+        verbose_name=_('User')
+    )
+    key = models.CharField(max_length=100, verbose_name=_('Key'))
+    value = models.JSONField(verbose_name=_('Value'))
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Updated at')
+    )
+
+    class Meta:
+        verbose_name = _('User preference')
+        verbose_name_plural = _('User preferences')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'key'], name='unique_user_preference'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}: {self.key}'
@@ -0,0 +1,76 @@
+"""
+Per-user preferences, kept in the database and read through the cache.
+
+All preferences of a user are one cache entry, so reading any of them
+on a page costs no query on a hit. Its key includes a per-user
+generation (see team_cache.py) that writers bump once their transaction
+commits; the next read loads the preferences again, and a read that
+loaded them before the commit caches them under the old generation,
+where they are never read. Unlike the session, nothing is written while
+pages are only browsed.
+
+Preferences are only cached when the cache is shared by all processes
+(settings.CACHE_SHARED): a per-process cache would not see changes made
+in the others.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from task_manager.team_cache import bump_generation, get_generation
+from task_manager.user.models import UserPreference
+
+
+PREFERENCES_CACHE_KEY = 'user_preferences:{user_id}:{generation}'
+
+
+def _scope(user_id):
+    return f'preferences:{user_id}'
+
+
+def _cache_key(user_id):
+    return PREFERENCES_CACHE_KEY.format(
+        user_id=user_id, generation=get_generation(_scope(user_id))
+    )
+
+
+def _load_preferences(user_id):
+    return dict(
+        UserPreference.objects.filter(user_id=user_id)
+        .values_list('key', 'value')
+    )
+
+
+def get_preferences(user_id):
+    """{key: value} of all preferences of the user."""
+    if not settings.CACHE_SHARED:
+        return _load_preferences(user_id)
+    key = _cache_key(user_id)
+    preferences = cache.get(key)
+    if preferences is None:
+        preferences = _load_preferences(user_id)
+        cache.set(key, preferences, settings.USER_PREFERENCE_CACHE_TIMEOUT)
+    return preferences
+
+
+def get_preference(user_id, key, default=None):
+    return get_preferences(user_id).get(key, default)
+
+
+def _changed(user_id):
+    bump_generation(_scope(user_id))
+
+
+def set_preference(user_id, key, value):
+    UserPreference.objects.update_or_create(
+        user_id=user_id, key=key, defaults={'value': value}
+    )
+    _changed(user_id)
+
+
+def delete_preference(user_id, key):
+    """Delete the preference if the user has it."""
+    deleted, _ = UserPreference.objects.filter(
+        user_id=user_id, key=key
+    ).delete()
+    if deleted:
+        _changed(user_id)
@@ -1,6 +1,10 @@
 from django.contrib.auth import login, update_session_auth_hash, logout
 from django.contrib.messages.views import SuccessMessageMixin
-from task_manager.permissions import CustomPermissions, UserPermissions
+from task_manager.permissions import (
+    CustomPermissions,
+    UserPermissions,
+    get_permissions,
+)
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import ListView, DetailView
@@ -45,7 +49,7 @@ class UserListView(ListView):
 
         if team:
             from task_manager.teams.models import TeamMembership
-            is_admin = team.is_admin(self.request.user)
+            is_admin = get_permissions(self.request).is_team_admin(team)
 
             if is_admin:
                 # Admin sees all memberships including pending
@@ -130,7 +134,8 @@ class UserDetailView(DetailView):
             return True
 
         # In team mode: admin can view team members' limits
-        if active_team and active_team.is_admin(self.request.user):
+        permissions = get_permissions(self.request)
+        if active_team and permissions.is_team_admin(active_team):
             try:
                 TeamMembership.objects.get(
                     user=user, team=active_team, status='active'
@@ -193,7 +198,7 @@ class UserDetailView(DetailView):
             self.request.user.is_authenticated
             and self.request.user != user
             and active_team
-            and active_team.is_admin(self.request.user)
+            and get_permissions(self.request).is_team_admin(active_team)
         ):
             try:
                 membership = TeamMembership.objects.get(
@@ -20,11 +20,11 @@ class IndexView(View):
 
     def get(self, request, *args, **kwargs):
         # Redirect authenticated users to tasks list only on first login
-        # The flag is set in UserLoginView after successful login
+        # The flag is set in UserLoginView after successful login and
+        # removed here, so next click on logo shows index page. Popping
+        # writes the session only when the flag is there
         if request.user.is_authenticated and \
-           request.session.get('redirect_after_login', False):
-            # Clear the flag so next click on logo shows index page
-            request.session['redirect_after_login'] = False
+           request.session.pop('redirect_after_login', False):
             return redirect('tasks:tasks-list')
         content = {
             'taskman': _("TaskMan"),
@@ -1,4 +1,7 @@
-from django.test import TestCase, Client
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from task_manager.tasks.models import Task, ChecklistItem
 from task_manager.user.models import User
@@ -431,3 +434,71 @@ class ChecklistEdgeCaseTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertEqual(data['text'], text_300)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class ChecklistQueryCountTestCase(TestCase):
+    """
+    With permissions resolved once per request, checklist endpoints only
+    run the queries they need.
+    """
+
+    fixtures = ChecklistViewTestCase.fixtures
+
+    def setUp(self):
+        cache.clear()
+        self.task = Task.objects.get(name="first task")
+        self.item = ChecklistItem.objects.create(task=self.task, text='One')
+
+    def _login(self, user):
+        self.client.force_login(user)
+        session = self.client.session
+        session['active_team_uuid'] = str(self.task.team.uuid)
+        session.save()
+
+    def _selects(self, url_name, *args):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse(url_name, args=[self.task.uuid, *args]),
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        return [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT')
+        ]
+
+    def test_toggle_by_author(self):
+        self._login(self.task.author)
+        selects = self._selects('tasks:checklist-toggle', self.item.pk)
+        # session, user, active membership, task, checklist item
+        self.assertEqual(len(selects), 5, selects)
+
+    def test_toggle_by_executor(self):
+        executor = User.objects.create_user(username='checklist_executor')
+        TeamMembership.objects.create(
+            user=executor, team=self.task.team, role='member',
+            status='active',
+        )
+        self.task.executors.add(executor)
+        self._login(executor)
+
+        selects = self._selects('tasks:checklist-toggle', self.item.pk)
+        # session, user, active membership, task, executor EXISTS,
+        # checklist item: the role in the task's team is the active one
+        self.assertEqual(len(selects), 6, selects)
+        self.assertFalse([
+            q for q in selects
+            if q.startswith('SELECT "teams_teammembership"."team_id"')
+        ])
+
+    @override_settings(CACHE_SHARED=True)
+    def test_toggle_with_shared_cache(self):
+        self._login(self.task.author)
+        # Caches the active membership
+        self.client.get(reverse('tasks:tasks-list'))
+        selects = self._selects('tasks:checklist-toggle', self.item.pk)
+        # session, user, task, checklist item
+        self.assertEqual(len(selects), 4, selects)
@@ -0,0 +1,130 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from task_manager.labels.models import Label
+from task_manager.notes.models import Note
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import ChecklistItem, Task
+from task_manager.user.models import User
+
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ConditionalListTest(TestCase):
+    """Tests for ETag revalidation of list pages."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='conditional_user')
+        self.client.force_login(self.user)
+        self.status = Status.objects.create(name='Open', creator=self.user)
+        self.task = Task.objects.create(
+            name='Conditional task', status=self.status, author=self.user
+        )
+        self.tasks_url = reverse('tasks:tasks-list')
+
+    def _revalidate(self, url, response, **extra):
+        return self.client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag'], **extra
+        )
+
+    def test_unchanged_lists_are_not_modified(self):
+        for url in (
+            self.tasks_url,
+            reverse('notes:note-list'),
+            reverse('statuses:statuses-list'),
+            reverse('labels:labels-list'),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('private', response['Cache-Control'])
+                self.assertIn('no-cache', response['Cache-Control'])
+                self.assertEqual(
+                    self._revalidate(url, response).status_code, 304
+                )
+
+    def test_if_modified_since_alone_is_not_honoured(self):
+        response = self.client.get(self.tasks_url)
+        self.assertNotIn('Last-Modified', response)
+        other = Task.objects.create(
+            name='Deleted task', status=self.status, author=self.user
+        )
+        since = http_date(other.updated_at.timestamp() + 60)
+        self.assertContains(
+            self.client.get(self.tasks_url, HTTP_IF_MODIFIED_SINCE=since),
+            'Deleted task',
+        )
+        # A deletion leaves the latest change of the rows as it was
+        other.delete()
+        response = self.client.get(
+            self.tasks_url, HTTP_IF_MODIFIED_SINCE=since
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Deleted task')
+
+    def test_changes_are_modified(self):
+        response = self.client.get(self.tasks_url)
+        self.task.name = 'Renamed task'
+        self.task.save()
+        response = self._revalidate(self.tasks_url, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Renamed task')
+
+    def test_counter_changes_are_modified(self):
+        response = self.client.get(self.tasks_url)
+        # Counters do not bump updated_at
+        ChecklistItem.objects.create(task=self.task, text='Step')
+        self.assertEqual(
+            self._revalidate(self.tasks_url, response).status_code, 200
+        )
+
+    def test_new_rows_are_modified(self):
+        url = reverse('labels:labels-list')
+        response = self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Label.objects.create(name='Fresh', creator=self.user)
+        self.assertEqual(self._revalidate(url, response).status_code, 200)
+
+        url = reverse('notes:note-list')
+        response = self.client.get(url)
+        Note.objects.create(
+            title='Fresh note', content='Text', author=self.user
+        )
+        self.assertEqual(self._revalidate(url, response).status_code, 200)
+
+    def test_query_and_language_change_the_etag(self):
+        response = self.client.get(self.tasks_url)
+        self.assertEqual(self._revalidate(
+            self.tasks_url + '?view_mode=simple', response
+        ).status_code, 200)
+        self.assertEqual(self._revalidate(
+            self.tasks_url, response, HTTP_ACCEPT_LANGUAGE='ru'
+        ).status_code, 200)
+
+    def test_other_users_do_not_share_etags(self):
+        response = self.client.get(reverse('statuses:statuses-list'))
+        other = User.objects.create_user(username='conditional_other')
+        self.client.force_login(other)
+        self.assertEqual(self._revalidate(
+            reverse('statuses:statuses-list'), response
+        ).status_code, 200)
+
+    def test_pending_messages_are_rendered(self):
+        url = reverse('statuses:statuses-list')
+        response = self.client.get(url)
+        # Refused, so nothing changes but the message to show
+        self.client.post(
+            reverse('statuses:statuses-delete', args=[self.status.uuid])
+        )
+        response = self._revalidate(url, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Cannot delete status')
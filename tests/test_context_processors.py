@@ -2,7 +2,9 @@
 
 from unittest.mock import MagicMock, patch
 
+from django.db import connection
 from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
 
 from task_manager.context_processors import (
     team_context,
@@ -116,9 +118,11 @@ class StaticVersionProcessorTestCase(TestCase):
                     )
 
                     result = static_version(MagicMock())
+                    # The version is computed lazily, on first read
+                    version = str(result['STATIC_VERSION'])
 
         self.assertIn('STATIC_VERSION', result)
-        self.assertEqual(result['STATIC_VERSION'], 'dev')
+        self.assertEqual(version, 'dev')
 
 
 class LimitsContextProcessorTestCase(TestCase):
@@ -132,6 +136,12 @@ class LimitsContextProcessorTestCase(TestCase):
             password='testpass123'
         )
 
+    def _limits_context(self, request):
+        """Call limits_context and read its lazy values right away."""
+        context = limits_context(request)
+        bool(context['show_upgrade_hint'])
+        return context
+
     def test_limits_context_unauthenticated(self):
         """Test limits context for unauthenticated user."""
         request = self.factory.get('/')
@@ -155,7 +165,7 @@ class LimitsContextProcessorTestCase(TestCase):
                 'tasks': {'current': 5, 'max': 100},
             }
         ):
-            context = limits_context(request)
+            context = self._limits_context(request)
 
         self.assertIn('usage', context)
         self.assertIn('show_upgrade_hint', context)
@@ -173,9 +183,23 @@ class LimitsContextProcessorTestCase(TestCase):
             'get_usage_summary',
             side_effect=Exception('Service error')
         ):
-            context = limits_context(request)
+            context = self._limits_context(request)
 
-        self.assertEqual(context, {})
+        self.assertEqual(context['usage'], {})
+        self.assertFalse(context['show_upgrade_hint'])
+
+    def test_limits_context_is_lazy(self):
+        """Usage is not loaded until a template reads it."""
+        request = self.factory.get('/')
+        request.user = self.user
+
+        with patch.object(LimitService, 'get_usage_summary') as summary:
+            context = limits_context(request)
+            self.assertFalse(summary.called)
+            summary.return_value = {'tasks': {'current': 1, 'max': 10}}
+            self.assertEqual(context['usage']['tasks']['percent'], 10)
+            self.assertFalse(context['show_upgrade_hint'])
+        self.assertEqual(summary.call_count, 1)
 
     def test_limits_context_shows_upgrade_hint_at_80_percent(self):
         """Test upgrade hint is shown when usage >= 80%."""
@@ -190,7 +214,7 @@ class LimitsContextProcessorTestCase(TestCase):
                 'tasks': {'current': 5, 'max': 100},
             }
         ):
-            context = limits_context(request)
+            context = self._limits_context(request)
 
         self.assertTrue(context['show_upgrade_hint'])
         self.assertEqual(context['usage']['teams']['percent'], 80)
@@ -208,7 +232,7 @@ class LimitsContextProcessorTestCase(TestCase):
                 'tasks': {'current': 5, 'max': 100},
             }
         ):
-            context = limits_context(request)
+            context = self._limits_context(request)
 
         self.assertFalse(context['show_upgrade_hint'])
 
@@ -225,9 +249,61 @@ class LimitsContextProcessorTestCase(TestCase):
                 'tasks': {'current': 5, 'max': 100},
             }
         ):
-            context = limits_context(request)
+            context = self._limits_context(request)
 
         self.assertIn('usage', context)
         # When max=0, percent should be 0
         self.assertEqual(context['usage']['teams']['percent'], 0)
         self.assertEqual(context['usage']['tasks']['percent'], 5)
+
+
+class LazyContextQueryCountTestCase(TestCase):
+    """
+    Pages that do not show the navbar must not pay for the global
+    context: only the session and user lookups of the middleware run.
+    """
+
+    MIDDLEWARE_QUERIES = 2  # session, user
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='lazyuser', password='testpass123'
+        )
+        self.client.force_login(self.user)
+
+    def _assert_middleware_queries_only(self, url, status_code=200):
+        with self.assertNumQueries(self.MIDDLEWARE_QUERIES):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status_code)
+        return response
+
+    def test_service_worker(self):
+        with patch(
+            'task_manager.context_processors.os.path.getmtime',
+            return_value=1234567890.0,
+        ) as getmtime:
+            response = self._assert_middleware_queries_only('/sw.js')
+        self.assertEqual(getmtime.call_count, 1)
+        self.assertNotContains(response, "taskman-dev")
+
+    def test_manifest_does_not_stat_static_files(self):
+        with patch(
+            'task_manager.context_processors.os.path.getmtime'
+        ) as getmtime:
+            self._assert_middleware_queries_only('/manifest.json')
+        self.assertFalse(getmtime.called)
+
+    def test_not_found_page(self):
+        self._assert_middleware_queries_only(
+            '/no-such-page/', status_code=404
+        )
+
+    def test_navbar_loads_notifications_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/tasks/')
+        self.assertEqual(response.status_code, 200)
+        notification_queries = [
+            q['sql'] for q in ctx.captured_queries
+            if 'notifications_notification' in q['sql']
+        ]
+        self.assertEqual(len(notification_queries), 1)
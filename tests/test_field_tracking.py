@@ -0,0 +1,174 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.teams.models import Team, TeamMembership
+from task_manager.user.models import User
+
+
+class FieldTrackingTestCase(TestCase):
+    """Tests for field snapshots on Task, TeamMembership and Status."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='tracking_user', password='testpass123'
+        )
+        self.status = Status.objects.create(name='New', creator=self.user)
+        self.done = Status.objects.create(name='Done', creator=self.user)
+        self.task = Task.objects.create(
+            name='Tracked', author=self.user, status=self.status
+        )
+
+    def test_loaded_task_has_no_changes(self):
+        task = Task.objects.get(pk=self.task.pk)
+        self.assertEqual(task.changed_fields, [])
+        self.assertFalse(task.has_changed('status'))
+        self.assertEqual(task.get_saved_value('status'), self.status.pk)
+
+    def test_assignment_is_tracked_without_queries(self):
+        task = Task.objects.get(pk=self.task.pk)
+        with self.assertNumQueries(0):
+            task.status = self.done
+            task.name = 'Tracked'
+            self.assertTrue(task.has_changed('status'))
+            self.assertEqual(task.changed_fields, ['status'])
+
+    def test_save_updates_snapshot(self):
+        task = Task.objects.get(pk=self.task.pk)
+        task.status = self.done
+        task.save()
+        self.assertEqual(task.changed_fields, [])
+        self.assertEqual(task.get_saved_value('status'), self.done.pk)
+
+    def test_new_instance_counts_as_changed(self):
+        task = Task(name='Unsaved', author=self.user, status=self.status)
+        self.assertTrue(task.has_changed('status'))
+        self.assertIsNone(task.get_saved_value('status'))
+        task.save()
+        self.assertFalse(task.has_changed('status'))
+
+    def test_deferred_field_is_not_changed(self):
+        task = Task.objects.only('name').get(pk=self.task.pk)
+        self.assertFalse(task.has_changed('status'))
+        self.assertEqual(task.status_id, self.status.pk)
+        self.assertEqual(task.get_saved_value('status'), self.status.pk)
+
+    def test_refresh_from_db_resets_snapshot(self):
+        task = Task.objects.get(pk=self.task.pk)
+        Task.objects.filter(pk=task.pk).update(status=self.done)
+        task.refresh_from_db()
+        self.assertEqual(task.changed_fields, [])
+        self.assertEqual(task.get_saved_value('status'), self.done.pk)
+
+    def test_save_does_not_write_counters(self):
+        task = Task.objects.get(pk=self.task.pk)
+        Task.bump_counters(task.pk, checklist_total=2)
+        task.status = self.done
+        with CaptureQueriesContext(connection) as ctx:
+            task.save()
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]['sql']
+        self.assertTrue(sql.startswith('UPDATE'))
+        self.assertIn('"status_id"', sql)
+        self.assertIn('"created_at"', sql)
+        self.assertNotIn('"checklist_total"', sql)
+        task.refresh_from_db()
+        self.assertEqual(task.status, self.done)
+        self.assertEqual(task.checklist_total, 2)
+
+    def test_unchanged_task_is_saved(self):
+        task = Task.objects.get(pk=self.task.pk)
+        with self.assertNumQueries(1):
+            task.save()
+
+    def test_status_and_membership_are_tracked(self):
+        status = Status.objects.get(pk=self.status.pk)
+        status.name = 'Renamed'
+        self.assertEqual(status.changed_fields, ['name'])
+
+        team = Team.objects.create(name='Tracking team')
+        TeamMembership.objects.create(
+            user=self.user, team=team, role='member', status='pending'
+        )
+        membership = TeamMembership.objects.get(team=team)
+        membership.status = 'active'
+        self.assertEqual(membership.changed_fields, ['status'])
+        self.assertEqual(membership.get_saved_value('status'), 'pending')
+
+    def test_unchanged_membership_keeps_active_team_cache(self):
+        team = Team.objects.create(name='Cache team')
+        TeamMembership.objects.create(user=self.user, team=team)
+        membership = TeamMembership.objects.get(team=team)
+        with patch(
+            'task_manager.teams.signals.invalidate_active_team'
+        ) as invalidate:
+            membership.save()
+            invalidate.assert_not_called()
+            membership.role = 'admin'
+            membership.save()
+            invalidate.assert_called_once_with(self.user.pk)
+
+
+class TaskUpdateViewWritesTestCase(TestCase):
+    """The task edit form saves the task without re-reading it."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='tracking_editor', password='testpass123'
+        )
+        self.status = Status.objects.create(name='New', creator=self.user)
+        self.done = Status.objects.create(name='Done', creator=self.user)
+        self.task = Task.objects.create(
+            name='Edited', author=self.user, status=self.status
+        )
+        self.c = Client()
+        self.c.force_login(self.user)
+        self.url = reverse('tasks:task-update', args=[self.task.uuid])
+
+    def _post(self, status):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.c.post(self.url, {
+                'name': 'Edited', 'status': status.pk,
+            })
+        self.assertEqual(response.status_code, 302)
+        return [query['sql'] for query in ctx.captured_queries]
+
+    def test_status_edit_is_a_partial_update(self):
+        queries = self._post(self.done)
+        task_table = Task._meta.db_table
+        updates = [
+            sql for sql in queries if sql.startswith(f'UPDATE "{task_table}"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"status_id"', updates[0])
+        self.assertNotIn('"description"', updates[0])
+        # The stored status is not re-read by primary key before saving
+        reads_by_pk = [
+            sql for sql in queries
+            if sql.startswith('SELECT')
+            and f'WHERE "{task_table}"."id" = ' in sql
+        ]
+        self.assertEqual(reads_by_pk, [])
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, self.done)
+        self.assertEqual(self.task.updated_by, self.user)
+
+    def test_label_edit_is_dated(self):
+        label = Label.objects.create(name='Tracked', creator=self.user)
+        # Edited by the same user before: no column changes this time
+        Task.objects.filter(pk=self.task.pk).update(updated_by=self.user)
+        updated_at = self.task.updated_at
+        response = self.c.post(self.url, {
+            'name': 'Edited', 'status': self.status.pk, 'labels': [label.pk],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.task.refresh_from_db()
+        self.assertEqual(list(self.task.labels.all()), [label])
+        self.assertGreater(self.task.updated_at, updated_at)
@@ -5,20 +5,15 @@ from task_manager.statuses.models import Status
 from task_manager.labels.models import Label
 from task_manager.user.models import User
 from task_manager.teams.models import TeamMembership
+from task_manager.user.preferences import set_preference
 from django.test import TestCase, Client
 from django.urls import reverse
 
 
-def _get_filter_session_keys(session, team):
-    """Helper to get context-aware session keys for filter settings."""
-    if team:
-        suffix = str(team.uuid)
-    else:
-        suffix = 'individual'
-    return (
-        f'task_filter_params_{suffix}',
-        f'task_filter_enabled_{suffix}',
-    )
+def _save_default_filter(user, team, params):
+    """Helper to save params as the default filter in the team context."""
+    suffix = str(team.uuid) if team else 'individual'
+    set_preference(user.pk, f'task_filter_{suffix}', params)
 
 
 class TaskTestCase(TestCase):
@@ -530,13 +525,7 @@ class TaskTestCase(TestCase):
     def test_saved_filter_enabled_context(self):
         """Test that saved filter enabled state is passed to context"""
         # First save a filter as default (using context-aware keys)
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(session, self.team)
-        session[filter_key] = {'status': self.status.id}
-        session[enabled_key] = True
-        # Mark as explicitly saved by user
-        session[f'{filter_key}_explicit'] = True
-        session.save()
+        _save_default_filter(self.user, self.team, {'status': self.status.id})
 
         response = self.c.get(reverse('tasks:tasks-list'), follow=True)
 
@@ -548,11 +537,7 @@ class TaskTestCase(TestCase):
         """Test that saved filter parameters are passed to context"""
         saved_params = {'status': self.status.id, 'executors': self.user.id}
 
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(session, self.team)
-        session[filter_key] = saved_params
-        session[enabled_key] = True
-        session.save()
+        _save_default_filter(self.user, self.team, saved_params)
 
         response = self.c.get(reverse('tasks:tasks-list'), follow=True)
 
@@ -562,13 +547,7 @@ class TaskTestCase(TestCase):
 
     def test_has_saved_filter_false_when_no_saved_params(self):
         """Test that has_saved_filter is False when no saved parameters exist"""
-        # Clear any existing saved filters (using context-aware keys)
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(session, self.team)
-        session.pop(filter_key, None)
-        session.pop(enabled_key, None)
-        session.save()
-
+        # No saved filter in this context
         response = self.c.get(reverse('tasks:tasks-list'))
 
         self.assertEqual(response.status_code, 200)
@@ -589,15 +568,9 @@ class TaskTestCase(TestCase):
             self.skipTest("Not enough statuses")
 
         # Save filter with multiple statuses
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(
-            session, self.team)
-        session[filter_key] = {
+        _save_default_filter(self.user, self.team, {
             'status': [str(s.id) for s in statuses]
-        }
-        session[enabled_key] = True
-        session[f'{filter_key}_explicit'] = True
-        session.save()
+        })
 
         # Visit the page
         response = self.c.get(reverse('tasks:tasks-list'))
@@ -630,15 +603,9 @@ class TaskTestCase(TestCase):
             self.skipTest("Not enough labels")
 
         # Save filter with multiple labels
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(
-            session, self.team)
-        session[filter_key] = {
+        _save_default_filter(self.user, self.team, {
             'labels': [str(lbl.id) for lbl in labels_list]
-        }
-        session[enabled_key] = True
-        session[f'{filter_key}_explicit'] = True
-        session.save()
+        })
 
         # Visit the page
         response = self.c.get(reverse('tasks:tasks-list'))
@@ -672,15 +639,9 @@ class TaskTestCase(TestCase):
             self.skipTest("Not enough team members")
 
         # Save filter with multiple authors
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(
-            session, self.team)
-        session[filter_key] = {
+        _save_default_filter(self.user, self.team, {
             'author': [str(u.id) for u in team_users]
-        }
-        session[enabled_key] = True
-        session[f'{filter_key}_explicit'] = True
-        session.save()
+        })
 
         # Visit the page
         response = self.c.get(reverse('tasks:tasks-list'))
@@ -719,15 +680,9 @@ class TaskTestCase(TestCase):
         status1, status2 = statuses[0], statuses[1]
 
         # Save filter with multiple statuses
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(
-            session, self.team)
-        session[filter_key] = {
+        _save_default_filter(self.user, self.team, {
             'status': [str(status1.id), str(status2.id)]
-        }
-        session[enabled_key] = True
-        session[f'{filter_key}_explicit'] = True
-        session.save()
+        })
 
         # Get the page with saved filter applied
         response = self.c.get(
@@ -743,11 +698,7 @@ class TaskTestCase(TestCase):
 
     def test_has_saved_filter_true_with_saved_params(self):
         """Test that has_saved_filter is True when saved parameters exist"""
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(session, self.team)
-        session[filter_key] = {'status': self.status.id}
-        session[enabled_key] = True
-        session.save()
+        _save_default_filter(self.user, self.team, {'status': self.status.id})
 
         response = self.c.get(reverse('tasks:tasks-list'), follow=True)
 
@@ -757,13 +708,10 @@ class TaskTestCase(TestCase):
 
     def test_saved_filter_enabled_false_when_not_enabled(self):
         """Test saved_filter_enabled is False when filter is not enabled"""
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(session, self.team)
-        session[filter_key] = {'status': self.status.id}
-        session[enabled_key] = False
-        # Not explicitly saved by user
-        session[f'{filter_key}_explicit'] = False
-        session.save()
+        if not self.team:
+            self.skipTest("Team mode required")
+        # Saved in the individual context only
+        _save_default_filter(self.user, None, {'status': self.status.id})
 
         response = self.c.get(reverse('tasks:tasks-list'))
 
@@ -774,11 +722,7 @@ class TaskTestCase(TestCase):
     def test_saved_filter_with_active_params_count(self):
         """Test active_filter_count when saved filter is active"""
         # Save filter parameters and enable it (using context-aware keys)
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(session, self.team)
-        session[filter_key] = {'status': self.status.id}
-        session[enabled_key] = True
-        session.save()
+        _save_default_filter(self.user, self.team, {'status': self.status.id})
 
         # Request without new filter params (should apply saved filter)
         response = self.c.get(reverse('tasks:tasks-list'), follow=True)
@@ -1587,3 +1531,88 @@ class TaskTestCase(TestCase):
                 set(result.values_list('id', flat=True)),
                 set(filtered_tasks.values_list('id', flat=True))
             )
+
+
+class TaskFilterExistsTestCase(TestCase):
+    """To-many filters use EXISTS, so rows are unique without DISTINCT."""
+
+    def setUp(self):
+        from task_manager.tasks.models import ChecklistItem
+
+        self.user = User.objects.create_user(
+            username='exists_user', password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='exists_other', password='testpass123'
+        )
+        status = Status.objects.create(name='New', creator=self.user)
+        self.red = Label.objects.create(name='red', creator=self.user)
+        self.blue = Label.objects.create(name='blue', creator=self.user)
+
+        self.both = Task.objects.create(
+            name='both labels', author=self.user, status=status
+        )
+        self.both.labels.set([self.red, self.blue])
+        self.both.executors.set([self.user, self.other])
+        ChecklistItem.objects.create(task=self.both, text='one')
+        ChecklistItem.objects.create(task=self.both, text='two')
+
+        self.plain = Task.objects.create(
+            name='no labels', author=self.user, status=status
+        )
+        self.c = Client()
+        self.c.force_login(self.user)
+
+    def _list(self, params):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.c.get(reverse('tasks:tasks-list'), params)
+        for query in ctx.captured_queries:
+            self.assertNotIn('DISTINCT', query['sql'])
+        return [task.pk for task in response.context['object_list']]
+
+    def test_multi_value_filters_return_each_task_once(self):
+        params = {
+            'labels': [self.red.pk, self.blue.pk],
+            'executors': [self.user.pk],
+            'has_checklist': 'on',
+            'my_tasks': 'on',
+        }
+        self.assertEqual(self._list(params), [self.both.pk])
+
+    def test_exclude_modes(self):
+        self.assertEqual(
+            self._list({'labels': [self.red.pk], 'labels_exclude': 'on'}),
+            [self.plain.pk],
+        )
+        self.assertEqual(
+            self._list({
+                'executors': [self.user.pk], 'executors_exclude': 'on',
+            }),
+            [self.plain.pk],
+        )
+        self.assertEqual(
+            self._list({'my_tasks': 'on', 'my_tasks_exclude': 'on'}), []
+        )
+
+
+class TaskFilterBenchmarkCommandTestCase(TestCase):
+    """Tests for the benchmark_task_filter management command."""
+
+    def test_benchmark_runs_and_rolls_back(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        task_count = Task.objects.count()
+        out = StringIO()
+        call_command(
+            'benchmark_task_filter', tasks=60, repeat=1, stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn('Seeded 60 tasks', output)
+        for name in ('executors', 'labels exclude', 'my tasks', 'combined'):
+            self.assertIn(name, output)
+        self.assertEqual(Task.objects.count(), task_count)
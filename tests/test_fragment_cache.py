@@ -0,0 +1,146 @@
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import ChecklistItem, Task
+from task_manager.teams.models import Team, TeamMembership
+from task_manager.user.models import User
+
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class NavbarFragmentTest(TestCase):
+    """Tests for the cached team switcher, settings menu and bell."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='navbar_user')
+        self.team = Team.objects.create(name='Navbar team', password='pwd')
+        TeamMembership.objects.create(
+            user=self.user, team=self.team, role='admin', status='active'
+        )
+        self.client.force_login(self.user)
+        self.url = reverse('statuses:statuses-list')
+
+    def test_team_switcher_is_cached(self):
+        self.assertContains(self.client.get(self.url), 'Navbar team')
+        # update() sends no signals, so the cached switcher is still used
+        Team.objects.filter(pk=self.team.pk).update(name='Hidden')
+        self.assertContains(self.client.get(self.url), 'Navbar team')
+
+    def test_team_changes_refresh_the_switcher(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.name = 'Renamed team'
+            self.team.save()
+        self.assertContains(self.client.get(self.url), 'Renamed team')
+
+        other = Team.objects.create(name='Joined team', password='pwd')
+        with self.captureOnCommitCallbacks(execute=True):
+            TeamMembership.objects.create(
+                user=self.user, team=other, role='member', status='active'
+            )
+        self.assertContains(self.client.get(self.url), 'Joined team')
+
+    def test_menus_follow_the_language(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE='ru')
+        self.assertContains(response, 'Язык')
+
+    def test_forms_in_fragments_work_in_other_sessions(self):
+        self.client.get(self.url)
+        # Another session has another CSRF secret
+        client = self.client_class(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        content = client.get(self.url).content.decode()
+        token = re.search(
+            r'action="%s"[^>]*>\s*<input type="hidden" '
+            r'name="csrfmiddlewaretoken" value="([^"]+)"'
+            % reverse('set_language'),
+            content,
+        ).group(1)
+        response = client.post(
+            reverse('set_language'),
+            {'language': 'en', 'csrfmiddlewaretoken': token},
+        )
+        self.assertEqual(response.status_code, 302)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TaskRowFragmentTest(TestCase):
+    """Tests for the cached rows of the task list."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='row_user')
+        self.client.force_login(self.user)
+        self.status = Status.objects.create(name='Open', creator=self.user)
+        self.label = Label.objects.create(name='Urgent', creator=self.user)
+        self.task = Task.objects.create(
+            name='Row task', status=self.status, author=self.user
+        )
+        self.url = reverse('tasks:tasks-list')
+
+    def _row_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        return response, [
+            query['sql'] for query in queries
+            if 'tasks_task_labels' in query['sql']
+            or 'tasks_task_executors' in query['sql']
+        ]
+
+    def test_cached_rows_are_not_prefetched(self):
+        response, queries = self._row_queries()
+        self.assertTrue(queries)
+        response, queries = self._row_queries()
+        self.assertEqual(queries, [])
+        self.assertContains(response, 'Row task')
+
+    def test_task_edits_refresh_the_row(self):
+        self.client.get(self.url)
+        self.task.name = 'Edited task'
+        self.task.save()
+        self.assertContains(self.client.get(self.url), 'Edited task')
+
+    def test_label_and_executor_changes_refresh_the_row(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.labels.add(self.label)
+        self.assertContains(self.client.get(self.url), 'Urgent')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.executor_tasks.add(self.task)
+        self.assertContains(
+            self.client.get(self.url), 'bi-arrow-right-short'
+        )
+
+    def test_checklist_changes_refresh_the_row(self):
+        self.client.get(self.url)
+        ChecklistItem.objects.create(task=self.task, text='Step')
+        self.assertContains(self.client.get(self.url), '0/1')
+
+    def test_renames_refresh_the_row(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.status.name = 'Renamed status'
+            self.status.save()
+        self.assertContains(self.client.get(self.url), 'Renamed status')
+
+    def test_rows_follow_the_view_mode(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url + '?view_mode=simple')
+        self.assertContains(response, 'simple-task-item')
+        self.assertNotContains(response, 'shadow-sm task-card')
@@ -330,22 +330,20 @@ class LimitServiceChecklistTest(TestCase):
 
     def test_can_add_checklist_item(self):
         """Can add checklist item when task has 0 items."""
-        result = self.service.can_add_checklist_item(self.task)
+        with self.assertNumQueries(0):
+            result = self.service.can_add_checklist_item(self.task)
         self.assertTrue(result.allowed)
         self.assertEqual(result.current, 0)
 
     def test_cannot_exceed_checklist_limit(self):
         """Cannot add more than 20 checklist items."""
         # Create 20 checklist items
-        items = [
-            ChecklistItem(
+        for i in range(20):
+            ChecklistItem.objects.create(
                 task=self.task,
                 text=f'Item {i}',
                 position=i
             )
-            for i in range(20)
-        ]
-        ChecklistItem.objects.bulk_create(items)
 
         result = self.service.can_add_checklist_item(self.task)
         self.assertFalse(result.allowed)
@@ -354,15 +352,12 @@ class LimitServiceChecklistTest(TestCase):
     def test_checklist_limit_19_still_allowed(self):
         """19 checklist items still allowed."""
         # Create 19 checklist items
-        items = [
-            ChecklistItem(
+        for i in range(19):
+            ChecklistItem.objects.create(
                 task=self.task,
                 text=f'Item {i}',
                 position=i
             )
-            for i in range(19)
-        ]
-        ChecklistItem.objects.bulk_create(items)
 
         result = self.service.can_add_checklist_item(self.task)
         self.assertTrue(result.allowed)
@@ -708,15 +703,12 @@ class LimitCheckInViewsTest(TestCase):
         )
 
         # Create 20 checklist items
-        items = [
-            ChecklistItem(
+        for i in range(20):
+            ChecklistItem.objects.create(
                 task=task,
                 text=f'Item {i}',
                 position=i
             )
-            for i in range(20)
-        ]
-        ChecklistItem.objects.bulk_create(items)
 
         # Try to add another item
         response = self.c.post(
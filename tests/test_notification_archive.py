@@ -0,0 +1,138 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from task_manager.notifications import partitions
+from task_manager.notifications.models import (
+    Notification,
+    NotificationArchive,
+)
+from task_manager.user.models import User
+
+
+class PartitionHelpersTest(TestCase):
+    """Tests for the month helpers of notification partitions."""
+
+    def test_month_start(self):
+        self.assertEqual(
+            partitions.month_start(timezone.now().replace(
+                year=2026, month=3, day=17
+            )),
+            date(2026, 3, 1),
+        )
+
+    def test_add_months_crosses_years(self):
+        self.assertEqual(
+            partitions.add_months(date(2026, 11, 1), 3), date(2027, 2, 1)
+        )
+        self.assertEqual(
+            partitions.add_months(date(2026, 1, 1), -1), date(2025, 12, 1)
+        )
+
+    def test_partition_name(self):
+        self.assertEqual(
+            partitions.partition_name(Notification, date(2026, 3, 1)),
+            'notifications_notification_p2026_03',
+        )
+
+    def test_archive_has_the_columns_of_notifications(self):
+        # Partitions can only move between tables with the same columns
+        def columns(model):
+            return [field.column for field in model._meta.concrete_fields]
+        self.assertEqual(columns(NotificationArchive), columns(Notification))
+
+
+class ArchiveNotificationsTest(TestCase):
+    """Tests for moving old notifications to the archive."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='archive_user')
+        now = timezone.now().replace(microsecond=0)
+        self.old = self._notify('Old', now - timedelta(days=200))
+        self.new = self._notify('New', now - timedelta(days=10))
+
+    def _notify(self, message, created_at, updated_at=None):
+        notification = Notification.objects.create(
+            recipient=self.user,
+            notification_type=Notification.NotificationType.TASK_ASSIGNED,
+            message_key='Task {task_name}',
+            message_params={'task_name': message},
+            group_key='task:1',
+            count=2,
+        )
+        # auto_now_add ignores an explicit created_at
+        Notification.objects.filter(pk=notification.pk).update(
+            created_at=created_at, updated_at=updated_at or created_at
+        )
+        notification.refresh_from_db()
+        return notification
+
+    def test_archive_rows_moves_old_notifications(self):
+        moved = partitions.archive_rows(
+            timezone.now() - timedelta(days=180), batch_size=1
+        )
+        self.assertEqual(moved, 1)
+        self.assertQuerySetEqual(
+            Notification.objects.all(), [self.new.pk], lambda n: n.pk
+        )
+        archived = NotificationArchive.objects.get()
+        for field in Notification._meta.concrete_fields:
+            self.assertEqual(
+                getattr(archived, field.attname),
+                getattr(self.old, field.attname),
+            )
+        self.assertEqual(archived.get_message(), 'Task Old')
+
+    def test_active_coalesced_notifications_stay_live(self):
+        now = timezone.now()
+        active = self._notify(
+            'Active', now - timedelta(days=200), updated_at=now
+        )
+        moved = partitions.archive_rows(
+            now - timedelta(days=180), batch_size=10
+        )
+        self.assertEqual(moved, 1)
+        self.assertTrue(Notification.objects.filter(pk=active.pk).exists())
+
+        # Once read, it is archived like the others
+        Notification.objects.filter(pk=active.pk).update(is_read=True)
+        moved = partitions.archive_rows(
+            now - timedelta(days=180), batch_size=10
+        )
+        self.assertEqual(moved, 1)
+        self.assertFalse(Notification.objects.filter(pk=active.pk).exists())
+
+    def test_command_archives_and_reports(self):
+        out = StringIO()
+        call_command('archive_notifications', verbosity=2, stdout=out)
+        self.assertIn('Archived 1 notification(s).', out.getvalue())
+        self.assertTrue(NotificationArchive.objects.filter(
+            pk=self.old.pk
+        ).exists())
+        self.assertFalse(Notification.objects.filter(
+            pk=self.old.pk
+        ).exists())
+
+    def test_command_drops_archived_past_retention(self):
+        call_command('archive_notifications', days=5, verbosity=0)
+        out = StringIO()
+        call_command(
+            'archive_notifications',
+            days=5,
+            retention_days=100,
+            verbosity=2,
+            stdout=out,
+        )
+        self.assertIn('Deleted 1 archived notification(s).', out.getvalue())
+        self.assertQuerySetEqual(
+            NotificationArchive.objects.all(), [self.new.pk], lambda n: n.pk
+        )
+
+    def test_partition_command_keeps_plain_tables_on_sqlite(self):
+        out = StringIO()
+        call_command('partition_notifications', verbosity=2, stdout=out)
+        self.assertIn('stay in a plain table', out.getvalue())
+        self.assertFalse(partitions.is_partitioned(Notification))
@@ -0,0 +1,167 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.notifications import pubsub, services
+from task_manager.notifications.models import Notification
+from task_manager.teams.models import Team
+from task_manager.user.models import User
+
+
+class PubSubTest(TestCase):
+    """Tests for the in-process notification pub/sub."""
+
+    async def test_publish_wakes_subscribers_of_the_user(self):
+        with pubsub.Subscription(-1) as mine, \
+                pubsub.Subscription(-2) as other:
+            thread = threading.Thread(target=pubsub.publish, args=([-1],))
+            thread.start()
+            thread.join()
+            self.assertTrue(await mine.wait(1))
+            self.assertFalse(await other.wait(0.01))
+
+    async def test_changes_are_collapsed(self):
+        with pubsub.Subscription(-1) as subscription:
+            pubsub.publish([-1])
+            pubsub.publish([-1])
+            self.assertTrue(await subscription.wait(1))
+            self.assertFalse(await subscription.wait(0.01))
+
+    async def test_subscription_is_removed_on_exit(self):
+        with pubsub.Subscription(-1):
+            self.assertIn(-1, pubsub._subscriptions)
+        self.assertNotIn(-1, pubsub._subscriptions)
+
+    def test_new_notifications_are_published_on_commit(self):
+        user = User.objects.create_user(username='pubsub_user')
+        with patch.object(pubsub, 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                services.notify_team_invited(
+                    Team.objects.create(name='Pubsub team'), user
+                )
+            publish.assert_called_once_with({user.pk})
+
+
+@override_settings(
+    NOTIFICATION_LIVE_UPDATES=True,
+    NOTIFICATION_STREAM_HEARTBEAT=0.05,
+    NOTIFICATION_LONGPOLL_TIMEOUT=0.05,
+)
+class LiveNotificationViewsTest(TestCase):
+    """Tests for the notification stream and long poll."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='live_user', password='pass123'
+        )
+
+    def _notify(self, message='Live'):
+        return Notification.objects.create(
+            recipient=self.user,
+            notification_type=Notification.NotificationType.TEAM_INVITED,
+            message=message,
+        )
+
+    async def _events(self, response, count):
+        """The next count events of a stream, heartbeats included."""
+        content = response.streaming_content
+        return [(await anext(content)).decode() for _ in range(count)]
+
+    def test_disabled_by_default(self):
+        self.client.force_login(self.user)
+        with self.settings(NOTIFICATION_LIVE_UPDATES=False):
+            for name in ('notifications:stream', 'notifications:poll'):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 404)
+
+    def test_requires_login(self):
+        response = self.client.get(reverse('notifications:poll'))
+        self.assertEqual(response.status_code, 302)
+
+    async def test_stream_pushes_changes(self):
+        await sync_to_async(self._notify)()
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse('notifications:stream')
+        )
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        retry, first = await self._events(response, 2)
+        self.assertTrue(retry.startswith('retry: '))
+        self.assertTrue(first.startswith('event: update\n'))
+        data = json.loads(first.split('data: ', 1)[1])
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['notifications'], [])
+
+        notification = await sync_to_async(self._notify)('Pushed')
+        pubsub.publish([self.user.pk])
+        update, = await self._events(response, 1)
+        data = json.loads(update.split('data: ', 1)[1])
+        self.assertEqual(data['count'], 2)
+        # Latest first; older ones may be repeated
+        self.assertEqual(data['notifications'][0]['id'], notification.pk)
+        self.assertEqual(data['notifications'][0]['message'], 'Pushed')
+
+    async def test_stream_sends_heartbeats(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse('notifications:stream')
+        )
+        events = await self._events(response, 3)
+        self.assertEqual(events[2], ': heartbeat\n\n')
+
+    async def test_stream_ends_after_max_age(self):
+        await self.async_client.aforce_login(self.user)
+        with self.settings(NOTIFICATION_STREAM_MAX_AGE=0.2):
+            response = await self.async_client.get(
+                reverse('notifications:stream')
+            )
+            events = [part async for part in response.streaming_content]
+        self.assertEqual(events[-1], b': heartbeat\n\n')
+        self.assertNotIn(self.user.pk, pubsub._subscriptions)
+
+    async def test_poll_answers_at_once_when_count_differs(self):
+        await sync_to_async(self._notify)()
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse('notifications:poll'), {'count': 0}
+        )
+        data = response.json()
+        self.assertEqual(data['count'], 1)
+        self.assertIn('since', data)
+
+    def _wake_poll(self):
+        deadline = time.monotonic() + 5
+        while self.user.pk not in pubsub._subscriptions:
+            if time.monotonic() > deadline:
+                return
+            time.sleep(0.01)
+        pubsub.publish([self.user.pk])
+
+    async def test_poll_waits_for_a_change(self):
+        await sync_to_async(self._notify)()
+        await self.async_client.aforce_login(self.user)
+        params = {'count': 1, 'since': timezone.now().isoformat()}
+        # Woken by another thread, as by a request committing a change
+        waker = threading.Thread(target=self._wake_poll)
+        waker.start()
+        started = time.monotonic()
+        with self.settings(NOTIFICATION_LONGPOLL_TIMEOUT=5):
+            response = await self.async_client.get(
+                reverse('notifications:poll'), params
+            )
+        waker.join()
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(response.json()['count'], 1)
+
+    async def test_poll_times_out_without_changes(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse('notifications:poll'), {'count': 0}
+        )
+        self.assertEqual(response.json()['notifications'], [])
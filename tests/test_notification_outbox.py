@@ -0,0 +1,189 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from task_manager.notifications import outbox, services
+from task_manager.notifications.models import Notification, NotificationOutbox
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.teams.models import Team, TeamMembership
+from task_manager.user.models import User
+
+
+@override_settings(
+    NOTIFICATION_DELIVERY='outbox',
+    NOTIFICATION_OUTBOX_MAX_ATTEMPTS=3,
+    NOTIFICATION_OUTBOX_RETRY_DELAY=10,
+)
+class NotificationOutboxTest(TestCase):
+    """Tests for deferred notification delivery through the outbox."""
+
+    def setUp(self):
+        self.actor = User.objects.create_user(
+            username='outbox_actor', password='pass123'
+        )
+        self.status = Status.objects.create(name='Outbox', creator=self.actor)
+        self.executors = [
+            User.objects.create_user(
+                username=f'outbox_executor_{i}', password='pass123'
+            )
+            for i in range(3)
+        ]
+        self.task = Task.objects.create(
+            name='Outbox task', status=self.status, author=self.actor,
+        )
+        self.task.executors.add(*self.executors)
+
+    def _deliver(self):
+        out = StringIO()
+        call_command(
+            'deliver_notifications', '--once', verbosity=2, stdout=out
+        )
+        return out.getvalue()
+
+    def _enqueue_status_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            services.notify_task_status_changed(self.task, self.actor)
+        return NotificationOutbox.objects.get()
+
+    def test_request_only_queues_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertNumQueries(0):
+                created = services.notify_task_status_changed(
+                    self.task, self.actor
+                )
+        self.assertEqual(created, [])
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+        with self.assertNumQueries(1):
+            callbacks[0]()
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_str_shows_the_notification_type(self):
+        entry = self._enqueue_status_change()
+        self.assertEqual(str(entry), 'task_status_changed - pending')
+
+    def test_worker_materializes_notifications(self):
+        self._enqueue_status_change()
+        output = self._deliver()
+
+        self.assertIn('Delivered 1, retried 0, dead 0', output)
+        self.assertFalse(NotificationOutbox.objects.exists())
+        self.assertEqual(
+            set(Notification.objects.values_list('recipient_id', flat=True)),
+            {user.pk for user in self.executors},
+        )
+        notification = Notification.objects.first()
+        self.assertEqual(
+            notification.get_message(),
+            "Status of task 'Outbox task' has been changed",
+        )
+
+    def test_recipients_are_checked_on_delivery(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            services.notify_team_deleted(
+                Team(name='Gone'), self.executors
+            )
+        self.executors[0].delete()
+        self._deliver()
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_team_admins_are_resolved_by_worker(self):
+        team = Team.objects.create(name='Outbox team')
+        TeamMembership.objects.create(
+            user=self.executors[0], team=team, role='admin', status='active'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            services.notify_team_join_request(team, self.actor)
+        TeamMembership.objects.create(
+            user=self.executors[1], team=team, role='admin', status='active'
+        )
+        self._deliver()
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_failed_entry_is_retried_later(self):
+        entry = self._enqueue_status_change()
+        with patch.object(services, 'deliver', side_effect=ValueError('x')):
+            with self.assertLogs(outbox.logger, 'WARNING'):
+                output = self._deliver()
+        self.assertIn('retried 1', output)
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, NotificationOutbox.Status.PENDING)
+        self.assertEqual(entry.attempts, 1)
+        self.assertIn('ValueError', entry.last_error)
+        self.assertGreater(entry.available_at, timezone.now())
+        self.assertFalse(Notification.objects.exists())
+
+        # Not due yet
+        self.assertEqual(outbox.claim_batch(10), [])
+
+    def test_entry_is_dead_after_max_attempts(self):
+        entry = self._enqueue_status_change()
+        with patch.object(services, 'deliver', side_effect=ValueError('x')):
+            for _ in range(3):
+                NotificationOutbox.objects.filter(pk=entry.pk).update(
+                    available_at=timezone.now()
+                )
+                with self.assertLogs(outbox.logger, 'WARNING'):
+                    self._deliver()
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, NotificationOutbox.Status.DEAD)
+        self.assertEqual(entry.attempts, 3)
+        self.assertEqual(outbox.claim_batch(10), [])
+
+    def test_retry_delay_doubles(self):
+        self.assertEqual(
+            [outbox.retry_delay(n) for n in (1, 2, 3)], [10, 20, 40]
+        )
+
+    def test_claimed_entry_is_skipped_until_lease_expires(self):
+        entry = self._enqueue_status_change()
+        claimed = outbox.claim_batch(10)
+        self.assertEqual([e.pk for e in claimed], [entry.pk])
+        self.assertEqual(outbox.claim_batch(10), [])
+
+        NotificationOutbox.objects.filter(pk=entry.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        reclaimed = outbox.claim_batch(10)
+        self.assertEqual([e.pk for e in reclaimed], [entry.pk])
+        self.assertNotEqual(reclaimed[0].claim_token, claimed[0].claim_token)
+
+        # The first worker lost its claim and leaves the entry alone
+        self.assertEqual(
+            outbox.process(claimed[0]), NotificationOutbox.Status.PROCESSING
+        )
+        self.assertTrue(
+            NotificationOutbox.objects.filter(pk=entry.pk).exists()
+        )
+        self.assertFalse(Notification.objects.exists())
+
+    def test_batch_size_limits_claim(self):
+        for _ in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                services.notify_task_completed(self.task, self.actor)
+        self.assertEqual(len(outbox.claim_batch(2)), 2)
+        self.assertEqual(len(outbox.claim_batch(2)), 1)
+
+    def test_executor_signal_defers_user_lookup(self):
+        user = User.objects.create_user(
+            username='outbox_new', password='pass123'
+        )
+        self.task._actor = self.actor
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.executors.add(user)
+        self.assertFalse(Notification.objects.exists())
+        self._deliver()
+        self.assertTrue(
+            Notification.objects.filter(
+                recipient=user,
+                notification_type=Notification.NotificationType.TASK_ASSIGNED,
+            ).exists()
+        )
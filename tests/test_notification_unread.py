@@ -0,0 +1,180 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.notifications import services, unread
+from task_manager.notifications.models import Notification
+from task_manager.notifications.unread import get_unread_count
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.user.models import User
+
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'notification-unread-tests',
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, CACHE_SHARED=True)
+class UnreadCounterTest(TestCase):
+    """Tests for the cached unread notification count."""
+
+    def setUp(self):
+        cache.clear()
+        self.actor = User.objects.create_user(
+            username='unread_actor', password='pass123'
+        )
+        self.user = User.objects.create_user(
+            username='unread_user', password='pass123'
+        )
+        self.status = Status.objects.create(name='Unread', creator=self.actor)
+        self.task = Task.objects.create(
+            name='Unread task', status=self.status, author=self.actor,
+        )
+        self.task.executors.add(self.user)
+
+    def _notify(self, count=1):
+        return Notification.objects.bulk_create([
+            Notification(
+                recipient=self.user,
+                notification_type=Notification.NotificationType.TASK_ASSIGNED,
+                message=f'Test {i}',
+            )
+            for i in range(count)
+        ])
+
+    def test_count_is_cached(self):
+        self._notify(12)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_unread_count(self.user.pk), 12)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user.pk), 12)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_count_is_not_cached_per_process(self):
+        get_unread_count(self.user.pk)
+        # Delivered and marked read in other processes
+        first, _ = self._notify(2)
+        Notification.objects.filter(pk=first.pk).update(is_read=True)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_new_notifications_increment_count(self):
+        get_unread_count(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            services.notify_task_completed(self.task, self.actor)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_coalesced_notification_keeps_count(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            services.notify_task_status_changed(self.task, self.actor)
+            services.notify_task_status_changed(self.task, self.actor)
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            services.notify_task_status_changed(self.task, self.actor)
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_count_not_cached_is_not_incremented(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            services.notify_task_completed(self.task, self.actor)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_count_made_before_a_commit_is_not_read(self):
+        # A read misses and counts, then a notification is committed
+        # before the read caches its count
+        key = unread._cache_key(self.user.pk)
+        count = unread._count_unread(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            services.notify_task_completed(self.task, self.actor)
+        cache.set(key, count)
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_mark_read_decrements_once(self):
+        notification, _ = self._notify(2)
+        get_unread_count(self.user.pk)
+        c = Client()
+        c.force_login(self.user)
+        url = reverse('notifications:mark-read', args=[notification.pk])
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                c.post(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_mark_all_read_drops_count(self):
+        self._notify(3)
+        get_unread_count(self.user.pk)
+        c = Client()
+        c.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            c.post(reverse('notifications:mark-all-read'))
+        self.assertEqual(get_unread_count(self.user.pk), 0)
+
+    def test_bell_runs_no_query_on_cache_hit(self):
+        self._notify(11)
+        c = Client()
+        c.force_login(self.user)
+        c.get(reverse('tasks:tasks-list'))
+        with CaptureQueriesContext(connection) as ctx:
+            response = c.get(reverse('tasks:tasks-list'))
+        self.assertEqual(response.context['unread_notifications_count'], 11)
+        self.assertFalse([
+            q for q in ctx.captured_queries
+            if Notification._meta.db_table in q['sql']
+        ])
+
+
+class UnreadListViewTest(TestCase):
+    """Tests for the JSON list behind the notification dropdown."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='dropdown_user', password='pass123'
+        )
+        self.c = Client()
+        self.url = reverse('notifications:unread')
+
+    def test_lists_latest_ten_with_true_count(self):
+        Notification.objects.bulk_create([
+            Notification(
+                recipient=self.user,
+                notification_type=Notification.NotificationType.TEAM_DELETED,
+                message=f'Test {i}',
+                is_read=i == 0,
+            )
+            for i in range(13)
+        ])
+        self.c.force_login(self.user)
+        data = self.c.get(self.url).json()
+        self.assertEqual(data['count'], 12)
+        self.assertEqual(len(data['notifications']), 10)
+        first = data['notifications'][0]
+        self.assertEqual(
+            set(first), {'id', 'message', 'count', 'icon', 'action_url', 'time'}
+        )
+        self.assertEqual(first['icon'], 'bi-trash text-danger')
+
+    def test_other_users_notifications_are_not_listed(self):
+        other = User.objects.create_user(
+            username='dropdown_other', password='pass123'
+        )
+        Notification.objects.create(
+            recipient=other,
+            notification_type=Notification.NotificationType.TEAM_DELETED,
+            message='Not mine',
+        )
+        self.c.force_login(self.user)
+        self.assertEqual(
+            self.c.get(self.url).json(), {'count': 0, 'notifications': []}
+        )
+
+    def test_requires_login(self):
+        response = self.c.get(self.url)
+        self.assertEqual(response.status_code, 302)
@@ -1,14 +1,22 @@
 from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase, Client
 from django.urls import reverse
-from django.utils import timezone
+from django.utils import timezone, translation
 
 from task_manager.user.models import User
 from task_manager.teams.models import Team, TeamMembership
 from task_manager.tasks.models import Task
 from task_manager.statuses.models import Status
-from task_manager.notifications.models import Notification
+from task_manager.notifications.models import (
+    Notification,
+    NotificationDigest,
+    message_template,
+)
 from task_manager.notifications import services
 
 
@@ -98,6 +106,44 @@ class NotificationModelTest(TestCase):
         self.assertEqual(notifications[0], notif2)
         self.assertEqual(notifications[1], notif1)
 
+    def test_get_message_translates_the_key_per_language(self):
+        """Test get_message() renders message_key in the active language."""
+        notif = Notification.objects.create(
+            recipient=self.user,
+            notification_type=Notification.NotificationType.TASK_ASSIGNED,
+            message_key="Status of task '{task_name}' has been changed",
+            message_params={'task_name': 'Docs'},
+        )
+        with translation.override('en'):
+            self.assertEqual(
+                notif.get_message(), "Status of task 'Docs' has been changed"
+            )
+        with translation.override('ru'):
+            self.assertEqual(
+                notif.get_message(), "Статус задачи 'Docs' изменён"
+            )
+
+    def test_get_message_caches_templates(self):
+        """Test the translated template is looked up once per language."""
+        notif = Notification(
+            message_key='Cached {name}', message_params={'name': 'x'}
+        )
+        message_template.cache_clear()
+        with translation.override('en'):
+            notif.get_message()
+            notif.get_message()
+        with translation.override('ru'):
+            notif.get_message()
+        info = message_template.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 2))
+
+    def test_get_message_falls_back_to_legacy_message(self):
+        """Test params that do not fit the key use the legacy message."""
+        notif = Notification(
+            message_key='Hello {name}', message_params={}, message='Legacy'
+        )
+        self.assertEqual(notif.get_message(), 'Legacy')
+
 
 class NotificationServicesTest(TestCase):
     """Tests for notification service functions."""
@@ -131,7 +177,9 @@ class NotificationServicesTest(TestCase):
             notification_type=Notification.NotificationType.TASK_ASSIGNED,
         ).first()
         self.assertIsNotNone(notif)
-        self.assertIn('Test Task', notif.message)
+        self.assertIn('Test Task', notif.get_message())
+        # Rendered from message_key, no pre-rendered copy is stored
+        self.assertEqual(notif.message, '')
 
     def test_notify_task_assigned_skip_self(self):
         """Test notify_task_assigned skips when assignee == actor."""
@@ -393,6 +441,280 @@ class NotificationServicesTest(TestCase):
         self.assertIsNotNone(notif)
 
 
+class NotificationFanOutTest(TestCase):
+    """Fan-out costs a fixed number of queries whatever the team size."""
+
+    def setUp(self):
+        self.actor = User.objects.create_user(
+            username='fanout_actor', password='pass123'
+        )
+        self.status = Status.objects.create(
+            name='Fan-out', creator=self.actor
+        )
+        self.team = Team.objects.create(name='Fan-out team')
+
+    def _users(self, count, prefix):
+        return [
+            User.objects.create_user(
+                username=f'{prefix}_{i}', password='pass123'
+            )
+            for i in range(count)
+        ]
+
+    def _team_with_admins(self, count):
+        admins = self._users(count, f'admin{count}')
+        TeamMembership.objects.bulk_create([
+            TeamMembership(
+                user=admin, team=self.team, role='admin', status='active'
+            )
+            for admin in admins
+        ])
+        return admins
+
+    def _task_with_executors(self, count):
+        task = Task.objects.create(
+            name=f'Task {count}', status=self.status,
+            author=self.actor, team=self.team,
+        )
+        task.executors.add(*self._users(count, f'executor{count}'))
+        return task
+
+    def test_status_change_queries_do_not_grow(self):
+        for count in (2, 20):
+            task = self._task_with_executors(count)
+            author = User.objects.create_user(
+                username=f'author_{count}', password='pass123'
+            )
+            Task.objects.filter(pk=task.pk).update(author=author)
+            task.author_id = author.pk
+            # Recipients, unread rows to coalesce with, INSERT
+            with self.assertNumQueries(3):
+                created = services.notify_task_status_changed(
+                    task, self.actor
+                )
+            with self.assertNumQueries(2):
+                services.notify_task_completed(task, self.actor)
+            self.assertEqual(len(created), count + 1)
+
+    def test_status_change_skips_actor_and_duplicates(self):
+        task = self._task_with_executors(3)
+        task.executors.add(self.actor)
+        created = services.notify_task_status_changed(
+            task, task.executors.exclude(pk=self.actor.pk).first()
+        )
+        recipients = [notif.recipient_id for notif in created]
+        self.assertEqual(len(recipients), len(set(recipients)))
+        self.assertEqual(recipients.count(self.actor.pk), 1)
+        self.assertEqual(len(recipients), 3)
+
+    def test_team_admin_fan_out_queries_do_not_grow(self):
+        applicant = User.objects.create_user(
+            username='applicant', password='pass123'
+        )
+        for count in (2, 20):
+            self._team_with_admins(count)
+            with self.assertNumQueries(2):
+                services.notify_team_join_request(self.team, applicant)
+            with self.assertNumQueries(2):
+                services.notify_team_member_joined(self.team, applicant)
+
+    def test_team_deleted_with_loaded_members_only_inserts(self):
+        members = self._users(15, 'member')
+        with self.assertNumQueries(1):
+            services.notify_team_deleted(self.team, members)
+        self.assertEqual(
+            Notification.objects.filter(
+                notification_type=Notification.NotificationType.TEAM_DELETED
+            ).count(),
+            15,
+        )
+
+    def test_assigned_resolves_primary_keys_in_one_query(self):
+        task = self._task_with_executors(0)
+        users = self._users(10, 'assignee')
+        pk_set = {user.pk for user in users} | {self.actor.pk, 999999}
+        with self.assertNumQueries(2):
+            created = services.notify_task_assigned(task, pk_set, self.actor)
+        self.assertEqual(
+            {notif.recipient_id for notif in created},
+            {user.pk for user in users},
+        )
+
+    def test_executor_signal_writes_one_insert(self):
+        task = self._task_with_executors(0)
+        task._actor = self.actor
+        users = self._users(10, 'signal')
+        with self.assertNumQueries(4):
+            # Existing executors SELECT and m2m INSERT by Django, then
+            # recipient lookup and one notification INSERT
+            task.executors.add(*users)
+        self.assertEqual(
+            Notification.objects.filter(
+                notification_type=Notification.NotificationType.TASK_ASSIGNED
+            ).count(),
+            10,
+        )
+
+
+class NotificationCoalescingTest(TestCase):
+    """Repeated status changes update one unread notification."""
+
+    def setUp(self):
+        self.actor = User.objects.create_user(
+            username='coalesce_actor', password='pass123'
+        )
+        self.author = User.objects.create_user(
+            username='coalesce_author', password='pass123'
+        )
+        self.status = Status.objects.create(
+            name='Coalesce', creator=self.author
+        )
+        self.task = Task.objects.create(
+            name='Flipping task', status=self.status, author=self.author,
+        )
+
+    def _status_notifications(self):
+        return Notification.objects.filter(
+            recipient=self.author,
+            notification_type=Notification.NotificationType.TASK_STATUS_CHANGED,
+        )
+
+    def test_repeats_update_unread_row(self):
+        for _ in range(3):
+            services.notify_task_status_changed(self.task, self.actor)
+        notification = self._status_notifications().get()
+        self.assertEqual(notification.count, 3)
+        self.assertEqual(notification.group_key, f'task:{self.task.pk}')
+        self.assertGreater(notification.updated_at, notification.created_at)
+
+    def test_latest_message_is_kept(self):
+        services.notify_task_status_changed(self.task, self.actor)
+        self.task.name = 'Renamed task'
+        services.notify_task_status_changed(self.task, self.actor)
+        notification = self._status_notifications().get()
+        self.assertEqual(
+            notification.get_message(),
+            "Status of task 'Renamed task' has been changed",
+        )
+
+    def test_read_row_is_not_reused(self):
+        services.notify_task_status_changed(self.task, self.actor)
+        self._status_notifications().update(is_read=True)
+        services.notify_task_status_changed(self.task, self.actor)
+        self.assertEqual(self._status_notifications().count(), 2)
+
+    def test_other_task_is_not_coalesced(self):
+        other = Task.objects.create(
+            name='Other task', status=self.status, author=self.author,
+        )
+        services.notify_task_status_changed(self.task, self.actor)
+        services.notify_task_status_changed(other, self.actor)
+        self.assertEqual(self._status_notifications().count(), 2)
+
+    def test_row_outside_window_is_not_reused(self):
+        services.notify_task_status_changed(self.task, self.actor)
+        self._status_notifications().update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        with self.settings(NOTIFICATION_COALESCE_WINDOW=600):
+            services.notify_task_status_changed(self.task, self.actor)
+        self.assertEqual(self._status_notifications().count(), 2)
+
+    def test_window_zero_disables_coalescing(self):
+        with self.settings(NOTIFICATION_COALESCE_WINDOW=0):
+            services.notify_task_status_changed(self.task, self.actor)
+            services.notify_task_status_changed(self.task, self.actor)
+        self.assertEqual(self._status_notifications().count(), 2)
+
+    def test_count_shown_in_dropdown(self):
+        for _ in range(4):
+            services.notify_task_status_changed(self.task, self.actor)
+        c = Client()
+        c.force_login(self.author)
+        response = c.get(reverse('tasks:tasks-list'))
+        self.assertEqual(response.context['unread_notifications_count'], 1)
+        data = c.get(reverse('notifications:unread')).json()
+        self.assertEqual(data['notifications'][0]['count'], 4)
+
+
+class NotificationDigestTest(TestCase):
+    """Low-priority notifications are summarized for users in digest mode."""
+
+    def setUp(self):
+        self.actor = User.objects.create_user(
+            username='digest_actor', password='pass123'
+        )
+        self.reader = User.objects.create_user(
+            username='digest_reader', password='pass123',
+            digest_notifications=True,
+        )
+        self.regular = User.objects.create_user(
+            username='digest_regular', password='pass123'
+        )
+        self.status = Status.objects.create(
+            name='Digest', creator=self.actor
+        )
+        self.task = Task.objects.create(
+            name='Digest task', status=self.status, author=self.actor,
+        )
+        self.task.executors.add(self.reader, self.regular)
+
+    def _send(self, **kwargs):
+        out = StringIO()
+        call_command(
+            'send_notification_digests', verbosity=2, stdout=out, **kwargs
+        )
+        return out.getvalue()
+
+    def test_low_priority_types_are_held_back(self):
+        services.notify_task_status_changed(self.task, self.actor)
+        services.notify_task_completed(self.task, self.actor)
+        self.assertFalse(
+            Notification.objects.filter(recipient=self.reader).exists()
+        )
+        self.assertEqual(
+            Notification.objects.filter(recipient=self.regular).count(), 2
+        )
+        self.assertEqual(NotificationDigest.objects.get().count, 2)
+
+    def test_other_types_are_delivered(self):
+        services.notify_task_unassigned(self.task, [self.reader], self.actor)
+        self.assertTrue(
+            Notification.objects.filter(recipient=self.reader).exists()
+        )
+        self.assertFalse(NotificationDigest.objects.exists())
+
+    def test_due_digest_becomes_one_notification(self):
+        for _ in range(3):
+            services.notify_task_completed(self.task, self.actor)
+        self.assertIn('Sent 0', self._send())
+
+        NotificationDigest.objects.update(
+            started_at=timezone.now() - timedelta(hours=2)
+        )
+        self.assertIn('Sent 1', self._send())
+
+        digest = Notification.objects.get(recipient=self.reader)
+        self.assertEqual(
+            digest.notification_type, Notification.NotificationType.DIGEST
+        )
+        self.assertEqual(
+            digest.get_message(), 'New updates on your tasks and teams: 3'
+        )
+        self.assertFalse(NotificationDigest.objects.exists())
+
+    def test_digest_mode_in_profile_form(self):
+        c = Client()
+        c.force_login(self.regular)
+        response = c.post(
+            reverse('user:user-update', args=[self.regular.username]),
+            {'username': 'digest_regular', 'digest_notifications': 'on'},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.regular.refresh_from_db()
+        self.assertTrue(self.regular.digest_notifications)
+
+
 class NotificationSignalsTest(TestCase):
     """Integration tests for notification signals."""
 
@@ -721,7 +1043,7 @@ class NotificationViewsTest(TestCase):
         self.assertRedirects(response, '/tasks/')
 
     def test_context_processor_has_unread(self):
-        """Test context processor provides unread_notifications."""
+        """Test context processor provides unread_notifications_count."""
         Notification.objects.create(
             recipient=self.user,
             notification_type=Notification.NotificationType.TASK_ASSIGNED,
@@ -730,8 +1052,9 @@ class NotificationViewsTest(TestCase):
         )
         self.c.force_login(self.user)
         response = self.c.get(reverse('tasks:tasks-list'))
-        self.assertIn('unread_notifications', response.context)
         self.assertIn('unread_notifications_count', response.context)
+        # The list itself is loaded by the dropdown
+        self.assertNotIn('unread_notifications', response.context)
 
     def test_unauthenticated_mark_read_redirects(self):
         """Test unauthenticated POST to mark-read redirects to login."""
@@ -780,8 +1103,8 @@ class NotificationViewsTest(TestCase):
         response = self.c.get(reverse('tasks:tasks-list'))
         self.assertEqual(response.context['unread_notifications_count'], 10)
 
-    def test_unread_count_with_eleven_shows_ten(self):
-        """Test unread_notifications_count shows 10 when 11 exist."""
+    def test_unread_count_with_eleven(self):
+        """Test unread_notifications_count is not capped at 10."""
         for i in range(11):
             Notification.objects.create(
                 recipient=self.user,
@@ -791,7 +1114,7 @@ class NotificationViewsTest(TestCase):
             )
         self.c.force_login(self.user)
         response = self.c.get(reverse('tasks:tasks-list'))
-        self.assertEqual(len(response.context['unread_notifications']), 10)
+        self.assertEqual(response.context['unread_notifications_count'], 11)
 
 
 class NotificationTemplateTest(TestCase):
@@ -824,8 +1147,8 @@ class NotificationTemplateTest(TestCase):
         # Check badge element is not present
         self.assertNotContains(response, 'id="notificationBadge"')
 
-    def test_notification_message_displayed(self):
-        """Test notification message displayed in dropdown."""
+    def test_notification_message_loaded_by_dropdown(self):
+        """Test notification message is loaded by the dropdown only."""
         Notification.objects.create(
             recipient=self.user,
             notification_type=Notification.NotificationType.TASK_ASSIGNED,
@@ -833,7 +1156,14 @@ class NotificationTemplateTest(TestCase):
             is_read=False,
         )
         response = self.c.get(reverse('tasks:tasks-list'))
-        self.assertContains(response, 'Test message here')
+        self.assertNotContains(response, 'Test message here')
+        self.assertContains(response, reverse('notifications:unread'))
+
+        response = self.c.get(reverse('notifications:unread'))
+        self.assertEqual(
+            response.json()['notifications'][0]['message'],
+            'Test message here',
+        )
 
     def test_showing_last_10_shown(self):
         """Test 'Showing last 10 notifications' shown with 10+."""
@@ -951,3 +1281,133 @@ class NotificationCleanupCommandTest(TestCase):
         out = io.StringIO()
         call_command('cleanup_notifications', verbosity=2, stdout=out)
         self.assertIn('No read notifications', out.getvalue())
+
+    def _old(self, notification_type, days, is_read=True):
+        notification = Notification.objects.create(
+            recipient=self.user,
+            notification_type=notification_type,
+            message='Aged',
+            is_read=is_read,
+        )
+        Notification.objects.filter(pk=notification.pk).update(
+            created_at=timezone.now() - timedelta(days=days)
+        )
+        return notification
+
+    def test_type_retention(self):
+        """Test --type-days keeps or drops read notifications by type."""
+        digest = self._old(Notification.NotificationType.DIGEST, 10)
+        deleted_team = self._old(Notification.NotificationType.TEAM_DELETED, 10)
+        call_command(
+            'cleanup_notifications',
+            type_days=[('digest', 7), ('task_assigned', 60)],
+        )
+        remaining = set(Notification.objects.values_list('pk', flat=True))
+        self.assertNotIn(digest.pk, remaining)
+        # Other types keep the default 30 days
+        self.assertIn(deleted_team.pk, remaining)
+        # task_assigned is kept for 60 days now
+        self.assertIn(self.old_read.pk, remaining)
+
+    def test_type_days_from_command_line(self):
+        """Test TYPE=DAYS values are parsed and checked."""
+        digest = self._old(Notification.NotificationType.DIGEST, 10)
+        call_command('cleanup_notifications', '--type-days', 'digest=7')
+        self.assertFalse(Notification.objects.filter(pk=digest.pk).exists())
+        with self.assertRaises(CommandError):
+            call_command('cleanup_notifications', '--type-days', 'nope=7')
+
+    def test_unread_retention(self):
+        """Test --unread-days deletes old unread notifications."""
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('cleanup_notifications', unread_days=35)
+        self.assertFalse(
+            Notification.objects.filter(pk=self.old_unread.pk).exists()
+        )
+        self.assertTrue(
+            Notification.objects.filter(pk=self.new_read.pk).exists()
+        )
+
+    def test_deletes_in_batches_without_loading_rows(self):
+        """Test each batch is one SELECT of ids and one range DELETE."""
+        for _ in range(2):
+            self._old(Notification.NotificationType.TASK_ASSIGNED, 40)
+        out = StringIO()
+        # 3 batches, then one SELECT that finds nothing
+        with self.assertNumQueries(7):
+            call_command(
+                'cleanup_notifications', batch_size=1, verbosity=3,
+                stdout=out,
+            )
+        self.assertIn('Deleted 3 notification(s) in 3 batch(es).',
+                      out.getvalue())
+        self.assertIn('Batch 2:', out.getvalue())
+        self.assertEqual(
+            set(Notification.objects.values_list('pk', flat=True)),
+            {self.old_unread.pk, self.new_read.pk},
+        )
+
+    def test_max_seconds_stops_and_reports_resume_point(self):
+        """Test --max-seconds stops between batches and can be resumed."""
+        second = self._old(Notification.NotificationType.TASK_ASSIGNED, 40)
+        out = StringIO()
+        with patch(
+            'task_manager.management.commands.cleanup_notifications.'
+            'time.monotonic',
+            side_effect=[0, 0, 10],
+        ):
+            call_command(
+                'cleanup_notifications', batch_size=1, max_seconds=5,
+                verbosity=2, stdout=out,
+            )
+        self.assertIn('Deleted 1 notification(s)', out.getvalue())
+        self.assertIn(
+            f'resume with --start-after {self.old_read.pk}', out.getvalue()
+        )
+        self.assertTrue(Notification.objects.filter(pk=second.pk).exists())
+
+        call_command('cleanup_notifications', start_after=self.old_read.pk)
+        self.assertFalse(Notification.objects.filter(pk=second.pk).exists())
+
+
+class NotificationCompactCommandTest(TestCase):
+    """Tests for compact_notifications management command."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='compact_user')
+
+    def _notify(self, **fields):
+        return Notification.objects.create(
+            recipient=self.user,
+            notification_type=Notification.NotificationType.TEAM_INVITED,
+            **fields,
+        )
+
+    def test_clears_messages_rebuilt_from_key(self):
+        """Test legacy messages are cleared only where the key renders."""
+        keyed = self._notify(
+            message_key='Team {team_name}',
+            message_params={'team_name': 'A'},
+            message='Team A',
+        )
+        broken = self._notify(
+            message_key='Team {team_name}',
+            message_params={},
+            message='Team B',
+        )
+        legacy = self._notify(message='Only legacy')
+        out = StringIO()
+        call_command(
+            'compact_notifications', batch_size=1, verbosity=2, stdout=out
+        )
+        self.assertIn(
+            'Compacted 1 notification(s) in notifications_notification.',
+            out.getvalue(),
+        )
+        keyed.refresh_from_db()
+        broken.refresh_from_db()
+        legacy.refresh_from_db()
+        self.assertEqual(keyed.message, '')
+        self.assertEqual(keyed.get_message(), 'Team A')
+        self.assertEqual(broken.message, 'Team B')
+        self.assertEqual(legacy.message, 'Only legacy')
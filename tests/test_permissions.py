@@ -186,3 +186,96 @@ class PermissionsTestCase(TestCase):
             str(messages[0]),
             _("You don't have permissions to manage team members."
               " Only team admin can do this."))
+
+
+class PermissionResolverTestCase(TestCase):
+    """Tests for the request-scoped PermissionResolver."""
+
+    def setUp(self):
+        from task_manager.statuses.models import Status
+        from task_manager.tasks.models import Task
+
+        self.author = User.objects.create_user(username='resolver_author')
+        self.executor = User.objects.create_user(
+            username='resolver_executor'
+        )
+        self.admin = User.objects.create_user(username='resolver_admin')
+        self.outsider = User.objects.create_user(
+            username='resolver_outsider'
+        )
+        self.team = Team.objects.create(name='Resolver team', password='pwd')
+        for user, role in ((self.author, 'member'),
+                           (self.executor, 'member'),
+                           (self.admin, 'admin')):
+            TeamMembership.objects.create(
+                user=user, team=self.team, role=role, status='active'
+            )
+        status = Status.objects.create(name='New', team=self.team)
+        self.task = Task.objects.create(
+            name='Resolver task', author=self.author, team=self.team,
+            status=status,
+        )
+        self.task.executors.add(self.executor)
+
+    def _resolver(self, user):
+        from task_manager.permissions import PermissionResolver
+        return PermissionResolver(user)
+
+    def test_task_permissions(self):
+        cases = [
+            (self.author, True, True),
+            (self.executor, True, False),
+            (self.admin, True, True),
+            (self.outsider, False, False),
+        ]
+        for user, can_edit, can_delete in cases:
+            with self.subTest(user=user.username):
+                resolver = self._resolver(user)
+                self.assertEqual(resolver.can_edit_task(self.task), can_edit)
+                self.assertEqual(
+                    resolver.can_delete_task(self.task), can_delete
+                )
+
+    def test_roles_and_executors_are_loaded_once(self):
+        resolver = self._resolver(self.executor)
+        with self.assertNumQueries(2):
+            resolver.can_edit_task(self.task)
+            resolver.can_edit_task(self.task)
+            resolver.can_delete_task(self.task)
+            self.assertFalse(resolver.is_team_admin(self.team))
+
+    def test_author_check_needs_no_query(self):
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                self._resolver(self.author).can_delete_task(self.task)
+            )
+
+    def test_active_team_role_is_reused(self):
+        from django.test import RequestFactory
+        from task_manager.permissions import get_permissions
+
+        request = RequestFactory().get('/')
+        request.user = self.admin
+        request.active_team = self.team
+        request.active_team_role = 'admin'
+        resolver = get_permissions(request)
+        with self.assertNumQueries(0):
+            self.assertTrue(resolver.is_team_admin(self.team))
+            self.assertTrue(resolver.can_delete_task(self.task))
+
+    def test_other_teams_are_read_from_memberships(self):
+        from django.test import RequestFactory
+        from task_manager.permissions import get_permissions
+
+        other = Team.objects.create(name='Other team', password='pwd')
+        TeamMembership.objects.create(
+            user=self.admin, team=other, role='admin', status='active'
+        )
+        request = RequestFactory().get('/')
+        request.user = self.admin
+        request.active_team = other
+        request.active_team_role = 'admin'
+        with self.assertNumQueries(1):
+            self.assertTrue(
+                get_permissions(request).is_team_admin(self.team)
+            )
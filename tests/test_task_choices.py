@@ -0,0 +1,127 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.choices import choice_catalog
+from task_manager.tasks.filters import TaskFilter
+from task_manager.tasks.forms import TaskForm
+from task_manager.tasks.models import Task
+from task_manager.teams.models import Team, TeamMembership
+from task_manager.user.models import User
+
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+CHOICE_TABLES = ('statuses_status', 'labels_label', 'user_user')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TaskChoiceCatalogTest(TestCase):
+    """Tests for the cached choices of the task filter and form."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='catalog_admin')
+        self.member = User.objects.create_user(username='catalog_member')
+        self.team = Team.objects.create(name='Catalog team', password='pwd')
+        for user, role in ((self.user, 'admin'), (self.member, 'member')):
+            TeamMembership.objects.create(
+                user=user, team=self.team, role=role, status='active'
+            )
+        self.status = Status.objects.create(
+            name='Open', team=self.team, creator=self.user
+        )
+        self.label = Label.objects.create(
+            name='Urgent', team=self.team, creator=self.user
+        )
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.request.active_team = self.team
+
+    def _choice_queries(self, render):
+        with CaptureQueriesContext(connection) as queries:
+            render()
+        return [
+            query['sql'] for query in queries
+            if any(table in query['sql'] for table in CHOICE_TABLES)
+        ]
+
+    def test_catalog_of_the_team(self):
+        catalog = choice_catalog(self.request)
+        self.assertEqual(catalog['statuses'], [(self.status.pk, 'Open')])
+        self.assertEqual(catalog['labels'], [(self.label.pk, 'Urgent')])
+        self.assertEqual(
+            sorted(catalog['executors']),
+            sorted([
+                (self.user.pk, 'catalog_admin'),
+                (self.member.pk, 'catalog_member'),
+            ]),
+        )
+        self.assertEqual(catalog['member_count'], 2)
+
+    def test_authors_include_former_members_with_tasks(self):
+        former = User.objects.create_user(username='catalog_former')
+        Task.objects.create(
+            name='Left behind', status=self.status, author=former,
+            team=self.team,
+        )
+        self.assertIn(
+            (former.pk, 'catalog_former'),
+            choice_catalog(self.request)['authors'],
+        )
+        self.assertNotIn(
+            (former.pk, 'catalog_former'),
+            choice_catalog(self.request)['executors'],
+        )
+
+    def test_filter_and_form_render_choices_from_the_cache(self):
+        str(TaskFilter({}, request=self.request).form)
+        self.assertEqual(self._choice_queries(
+            lambda: str(TaskFilter({}, request=self.request).form)
+        ), [])
+        self.assertEqual(self._choice_queries(
+            lambda: str(TaskForm(request=self.request))
+        ), [])
+
+    def test_selected_choices_are_kept(self):
+        form = TaskFilter(
+            {'status': [self.status.pk]}, request=self.request
+        ).form
+        self.assertIn(
+            f'<option value="{self.status.pk}" selected>Open</option>',
+            str(form['status']),
+        )
+
+    def test_form_still_validates_against_the_team(self):
+        other = Status.objects.create(name='Elsewhere', creator=self.user)
+        form = TaskForm(
+            {'name': 'New task', 'status': other.pk}, request=self.request
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn('status', form.errors)
+
+    def test_changes_refresh_the_catalog(self):
+        choice_catalog(self.request)
+        with self.captureOnCommitCallbacks(execute=True):
+            Label.objects.create(
+                name='Later', team=self.team, creator=self.user
+            )
+        self.assertIn(
+            'Later',
+            dict(choice_catalog(self.request)['labels']).values(),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.member.username = 'renamed_member'
+            self.member.save()
+        self.assertIn(
+            'renamed_member',
+            dict(choice_catalog(self.request)['executors']).values(),
+        )
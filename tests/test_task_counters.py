@@ -0,0 +1,123 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from task_manager.notes.models import Note
+from task_manager.tasks.models import Task, ChecklistItem
+from task_manager.user.models import User
+
+
+class TaskCountersTestCase(TestCase):
+    """Tests for the denormalized notes/checklist counters on Task."""
+
+    fixtures = [
+        "tests/fixtures/test_users.json",
+        "tests/fixtures/test_teams.json",
+        "tests/fixtures/test_teams_memberships.json",
+        "tests/fixtures/test_statuses.json",
+        "tests/fixtures/test_tasks.json",
+        "tests/fixtures/test_labels.json",
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(username='me')
+        self.task = Task.objects.get(name="first task")
+        self.other_task = Task.objects.exclude(pk=self.task.pk).first()
+
+    def _counters(self, task):
+        task.refresh_from_db()
+        return task.notes_count, task.checklist_total, task.checklist_done
+
+    def test_checklist_create_toggle_delete(self):
+        item = ChecklistItem.objects.create(task=self.task, text="One")
+        ChecklistItem.objects.create(task=self.task, text="Two", is_done=True)
+        self.assertEqual(self._counters(self.task), (0, 2, 1))
+
+        item = ChecklistItem.objects.get(pk=item.pk)
+        item.is_done = True
+        item.save()
+        self.assertEqual(self._counters(self.task), (0, 2, 2))
+
+        # Saving again without a change must not count twice
+        item.save()
+        self.assertEqual(self._counters(self.task), (0, 2, 2))
+
+        item.delete()
+        self.assertEqual(self._counters(self.task), (0, 1, 1))
+
+    def test_concurrent_toggles_count_once(self):
+        item = ChecklistItem.objects.create(task=self.task, text="One")
+        first = ChecklistItem.objects.get(pk=item.pk)
+        second = ChecklistItem.objects.get(pk=item.pk)
+        self.assertTrue(first.toggle())
+        # Loaded as not done too, but the row is done already
+        self.assertFalse(second.toggle())
+        self.assertTrue(second.is_done)
+        self.assertEqual(self._counters(self.task), (0, 1, 1))
+
+        self.assertTrue(first.toggle())
+        self.assertEqual(self._counters(self.task), (0, 1, 0))
+
+    def test_note_create_reassign_delete(self):
+        note = Note.objects.create(
+            title="Note", content="Text", author=self.user, task=self.task
+        )
+        self.assertEqual(self._counters(self.task)[0], 1)
+
+        note = Note.objects.get(pk=note.pk)
+        note.task = self.other_task
+        note.save()
+        self.assertEqual(self._counters(self.task)[0], 0)
+        self.assertEqual(self._counters(self.other_task)[0], 1)
+
+        note.delete()
+        self.assertEqual(self._counters(self.other_task)[0], 0)
+
+    def test_stale_task_save_keeps_counters(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        ChecklistItem.objects.create(task=self.task, text="One")
+        stale.name = "renamed"
+        stale.save()
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.name, "renamed")
+        self.assertEqual(self.task.checklist_total, 1)
+
+    def test_toggle_view_returns_updated_counters(self):
+        item = ChecklistItem.objects.create(task=self.task, text="One")
+        ChecklistItem.objects.create(task=self.task, text="Two")
+        client = Client()
+        client.force_login(self.task.author)
+
+        response = client.post(reverse(
+            'tasks:checklist-toggle', args=[self.task.uuid, item.id]
+        ))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['total'], data['done']), (2, 1))
+
+        response = client.post(reverse(
+            'tasks:checklist-delete', args=[self.task.uuid, item.id]
+        ))
+        data = response.json()
+        self.assertEqual((data['total'], data['done']), (1, 0))
+
+    def test_repair_command_fixes_drift(self):
+        ChecklistItem.objects.create(task=self.task, text="One", is_done=True)
+        Note.objects.create(
+            title="Note", content="Text", author=self.user, task=self.task
+        )
+        Task.objects.filter(pk=self.task.pk).update(
+            notes_count=5, checklist_total=0, checklist_done=3
+        )
+
+        out = StringIO()
+        call_command('repair_task_counters', '--dry-run', stdout=out)
+        self.assertIn('Found 1 task(s)', out.getvalue())
+        self.assertEqual(self._counters(self.task), (5, 0, 3))
+
+        out = StringIO()
+        call_command('repair_task_counters', stdout=out)
+        self.assertIn('Repaired 1 task(s)', out.getvalue())
+        self.assertEqual(self._counters(self.task), (1, 1, 1))
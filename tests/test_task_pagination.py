@@ -0,0 +1,285 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.tasks.pagination import decode_cursor, encode_cursor
+from task_manager.tasks.views import SORT_OPTIONS
+from task_manager.user.models import User
+from task_manager.user.preferences import get_preference
+
+
+class CursorTokenTestCase(TestCase):
+    """Tests for encoding and decoding cursor tokens."""
+
+    def test_roundtrip_datetime_value(self):
+        value = timezone.now()
+        token = encode_cursor('-created_at', value, 42)
+        self.assertEqual(
+            decode_cursor(token, '-created_at'), (value, 42, False)
+        )
+
+    def test_roundtrip_backwards_flag(self):
+        token = encode_cursor('name', 'abc', 7, backwards=True)
+        self.assertEqual(decode_cursor(token, 'name'), ('abc', 7, True))
+
+    def test_token_for_other_sort_is_rejected(self):
+        token = encode_cursor('name', 'abc', 7)
+        self.assertIsNone(decode_cursor(token, '-name'))
+
+    def test_garbage_token_is_rejected(self):
+        self.assertIsNone(decode_cursor('not-a-cursor', 'name'))
+        self.assertIsNone(decode_cursor('', 'name'))
+
+
+@override_settings(TASK_LIST_CURSOR_THRESHOLD=100)
+class TaskCursorPaginationTestCase(TestCase):
+    """Tests for keyset pagination of the task list."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='cursor_user', password='testpass123'
+        )
+        self.status = Status.objects.create(name='New', creator=self.user)
+        self.c = Client()
+        self.c.force_login(self.user)
+        self.url = reverse('tasks:tasks-list')
+
+    def _create_tasks(self, count):
+        now = timezone.now()
+        tasks = Task.objects.bulk_create([
+            Task(
+                name=f'Task {i % 7}',
+                author=self.user,
+                status=self.status,
+            )
+            for i in range(count)
+        ])
+        # Give tasks distinct and duplicate timestamps to test tie-breaks
+        for i, task in enumerate(tasks):
+            Task.objects.filter(pk=task.pk).update(
+                created_at=now - timedelta(minutes=i // 3),
+                updated_at=now - timedelta(minutes=i // 2),
+            )
+        return tasks
+
+    def _walk_forward(self, params):
+        """Follow next cursors and return ids in the order shown."""
+        seen = []
+        response = self.c.get(self.url, {**params, 'cursor': ''})
+        while True:
+            page = response.context['page_obj']
+            seen.extend(task.pk for task in page)
+            if not page.has_next():
+                return seen
+            response = self.c.get(
+                self.url, {**params, 'cursor': page.next_cursor}
+            )
+
+    def test_small_list_uses_page_numbers(self):
+        self._create_tasks(60)
+        response = self.c.get(self.url)
+        self.assertFalse(response.context['cursor_mode'])
+        self.assertEqual(response.context['task_count'], 60)
+        self.assertEqual(response.context['paginator'].num_pages, 2)
+
+    @override_settings(TASK_LIST_CURSOR_THRESHOLD=50)
+    def test_large_list_switches_to_cursor_mode(self):
+        self._create_tasks(60)
+        response = self.c.get(self.url)
+        self.assertTrue(response.context['cursor_mode'])
+        self.assertIsNone(response.context['task_count'])
+        self.assertEqual(len(response.context['page_obj']), 50)
+        self.assertTrue(response.context['page_obj'].has_next())
+        self.assertContains(response, 'cursor=')
+
+    @override_settings(TASK_LIST_CURSOR_THRESHOLD=50)
+    def test_explicit_page_param_keeps_page_numbers(self):
+        self._create_tasks(60)
+        response = self.c.get(self.url, {'page': 2})
+        self.assertFalse(response.context['cursor_mode'])
+        self.assertEqual(response.context['page_obj'].number, 2)
+
+    def test_cursor_walk_matches_full_ordering_for_every_sort(self):
+        self._create_tasks(120)
+        for sort in SORT_OPTIONS:
+            with self.subTest(sort=sort):
+                expected = list(
+                    self.c.get(self.url, {'sort': sort, 'page': 1})
+                    .context['filter'].qs.values_list('pk', flat=True)
+                )
+                self.assertEqual(
+                    self._walk_forward({'sort': sort}), expected
+                )
+
+    def test_cursor_walk_with_null_updated_at(self):
+        tasks = self._create_tasks(70)
+        Task.objects.filter(
+            pk__in=[task.pk for task in tasks[::4]]
+        ).update(updated_at=None)
+        for sort in ('updated_at', '-updated_at'):
+            with self.subTest(sort=sort):
+                seen = self._walk_forward({'sort': sort})
+                self.assertEqual(len(seen), 70)
+                self.assertEqual(len(set(seen)), 70)
+
+    def test_previous_cursor_returns_previous_page(self):
+        self._create_tasks(120)
+        first = self.c.get(self.url, {'cursor': ''}).context['page_obj']
+        second = self.c.get(
+            self.url, {'cursor': first.next_cursor}
+        ).context['page_obj']
+        back = self.c.get(
+            self.url, {'cursor': second.previous_cursor}
+        ).context['page_obj']
+        self.assertEqual(
+            [task.pk for task in back], [task.pk for task in first]
+        )
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_cursor_page_does_not_count(self):
+        self._create_tasks(120)
+        first = self.c.get(self.url, {'cursor': ''}).context['page_obj']
+        with CaptureQueriesContext(connection) as ctx:
+            self.c.get(self.url, {'cursor': first.next_cursor})
+        # A paginator count is an unbounded COUNT(*) over the scoped list
+        count_queries = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT COUNT(*)')
+            and '"tasks_task"."team_id" IS NULL' in q['sql']
+            and 'LIMIT' not in q['sql']
+        ]
+        self.assertEqual(count_queries, [])
+
+    def test_invalid_cursor_starts_from_first_page(self):
+        self._create_tasks(60)
+        response = self.c.get(self.url, {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['cursor_mode'])
+        self.assertFalse(response.context['page_obj'].has_previous())
+
+    def test_cursor_not_saved_with_default_filter(self):
+        self._create_tasks(3)
+        self.c.get(self.url, {
+            'cursor': '', 'status': self.status.pk, 'save_as_default': 'on',
+        })
+        saved = get_preference(self.user.pk, 'task_filter_individual')
+        self.assertNotIn('cursor', saved)
+
+
+@override_settings(TASK_LIST_CURSOR_THRESHOLD=10000)
+class TaskListLinksTestCase(TestCase):
+    """Tests for the elided page range and links precomputed by the view."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='links_user', password='testpass123'
+        )
+        self.status = Status.objects.create(name='New', creator=self.user)
+        Task.objects.bulk_create([
+            Task(name=f'Task {i}', author=self.user, status=self.status)
+            for i in range(1000)
+        ])
+        self.c = Client()
+        self.c.force_login(self.user)
+        self.url = reverse('tasks:tasks-list')
+
+    def test_page_range_is_elided(self):
+        response = self.c.get(self.url, {'page': 10, 'search': 'task'})
+        numbers = [link['number'] for link in response.context['page_links']]
+        self.assertEqual(numbers, [1, None, 8, 9, 10, 11, 12, None, 20])
+        current = [
+            link for link in response.context['page_links']
+            if link.get('current')
+        ]
+        self.assertEqual(current[0]['number'], 10)
+        self.assertContains(response, '&hellip;', count=2)
+        self.assertNotContains(response, 'page=15')
+
+    def test_page_links_keep_filters_and_replace_page(self):
+        response = self.c.get(self.url, {
+            'page': 2, 'search': 'task', 'sort': 'name',
+        })
+        context = response.context
+        self.assertEqual(
+            context['previous_page_url'], '?search=task&sort=name&page=1'
+        )
+        self.assertEqual(
+            context['next_page_url'], '?search=task&sort=name&page=3'
+        )
+        self.assertEqual(
+            context['page_links'][-1]['url'], '?search=task&sort=name&page=20'
+        )
+
+    def test_sort_links_reset_position(self):
+        response = self.c.get(self.url, {'page': 3, 'search': 'task'})
+        links = {
+            link['url']: link for link in response.context['sort_links']
+        }
+        self.assertIn('?search=task&sort=name', links)
+        self.assertTrue(links['?search=task&sort=-created_at']['active'])
+        self.assertTrue(links['?search=task&sort=-created_at']['descending'])
+        self.assertFalse(links['?search=task&sort=name']['descending'])
+
+    def test_toolbar_links_keep_position(self):
+        response = self.c.get(self.url, {
+            'page': 3, 'search': 'task', 'view_mode': 'simple',
+        })
+        context = response.context
+        self.assertEqual(
+            context['view_mode_toggle_url'], '?page=3&search=task'
+        )
+        self.assertEqual(
+            context['show_filter_url'],
+            '?page=3&search=task&view_mode=simple&show_filter=1',
+        )
+        self.assertEqual(
+            context['open_filter_url'], '?view_mode=simple&show_filter=1'
+        )
+        self.assertEqual(
+            context['reset_filter_url'],
+            '?search=task&view_mode=simple&reset_default=1',
+        )
+
+    def test_cursor_links(self):
+        first = self.c.get(self.url, {'cursor': '', 'search': 'task'})
+        page = first.context['page_obj']
+        self.assertEqual(
+            first.context['next_page_url'],
+            f'?search=task&cursor={page.next_cursor}',
+        )
+        self.assertFalse(first.context['previous_page_url'])
+        self.assertNotIn('page_links', first.context)
+
+        second = self.c.get(self.url, {
+            'cursor': page.next_cursor, 'search': 'task',
+        })
+        self.assertEqual(
+            second.context['first_page_url'], '?search=task&cursor='
+        )
+
+
+class TaskListRenderBenchmarkCommandTestCase(TestCase):
+    """Tests for the benchmark_task_list_render management command."""
+
+    def test_benchmark_runs_and_rolls_back(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        task_count = Task.objects.count()
+        out = StringIO()
+        call_command(
+            'benchmark_task_list_render', tasks=120, repeat=1, stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn('Seeded 120 tasks', output)
+        for name in ('first page', 'middle simple', 'cursor'):
+            self.assertIn(name, output)
+        self.assertEqual(Task.objects.count(), task_count)
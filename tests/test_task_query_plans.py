@@ -0,0 +1,141 @@
+import json
+from unittest import skipUnless
+
+from django.db import connection, transaction
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.tasks.views import SORT_OPTIONS, SEARCH_SORT_OPTIONS
+from task_manager.teams.models import Team, TeamMembership
+from task_manager.user.models import User
+
+
+TASK_TABLE = Task._meta.db_table
+
+
+def _sqlite_plan_problems(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        details = [row[-1] for row in cursor.fetchall()]
+    problems = []
+    for detail in details:
+        # "SCAN tasks_task" without an index is a full table scan
+        if detail.startswith(f'SCAN {TASK_TABLE}') and 'INDEX' not in detail:
+            problems.append(detail)
+        if 'USE TEMP B-TREE' in detail:
+            problems.append(detail)
+    return problems
+
+
+def _postgres_plan_nodes(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _postgres_plan_nodes(child)
+
+
+def _postgres_plan_problems(sql):
+    # Tiny test tables make sequential scans and sorts the cheapest plan,
+    # so disable both: whatever is still planned has no index to use
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('SET LOCAL enable_sort = off')
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    problems = []
+    for node in _postgres_plan_nodes(plan[0]['Plan']):
+        node_type = node['Node Type']
+        if node_type == 'Seq Scan' and node['Relation Name'] == TASK_TABLE:
+            problems.append(node_type)
+        if node_type in ('Sort', 'Incremental Sort'):
+            problems.append(f"{node_type} {node.get('Sort Key')}")
+    return problems
+
+
+PLAN_PROBLEMS = {
+    'postgresql': _postgres_plan_problems,
+    'sqlite': _sqlite_plan_problems,
+}
+
+
+def plan_problems(sql):
+    """
+    Run EXPLAIN for a query and return the plan steps that scan the whole
+    task table or sort rows instead of reading them from an index.
+    """
+    return PLAN_PROBLEMS[connection.vendor](sql)
+
+
+@skipUnless(
+    connection.vendor in PLAN_PROBLEMS,
+    'Query plans are only checked on PostgreSQL and SQLite',
+)
+class TaskListQueryPlanTestCase(TestCase):
+    """
+    The task list query for each scope and sort must be served by the
+    composite indexes on Task: no full scan of tasks, no sort step.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='plan_user', password='testpass123'
+        )
+        self.team = Team.objects.create(name='Plan team')
+        TeamMembership.objects.create(
+            user=self.user, team=self.team, role='admin', status='active'
+        )
+        self.status = Status.objects.create(name='New', creator=self.user)
+        Task.objects.bulk_create([
+            Task(
+                name=f'Task {i}', author=self.user, status=self.status,
+                team=self.team if i % 2 else None,
+            )
+            for i in range(20)
+        ])
+        self.c = Client()
+        self.c.force_login(self.user)
+        self.url = reverse('tasks:tasks-list')
+
+    def _list_query(self, params):
+        """Return the SQL of the query that loads the task list page."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.c.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        list_queries = [
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith('SELECT')
+            and f'FROM "{TASK_TABLE}"' in query['sql']
+            and 'ORDER BY' in query['sql']
+        ]
+        self.assertEqual(len(list_queries), 1, list_queries)
+        return list_queries[0]
+
+    def _switch_team(self, team):
+        session = self.c.session
+        if team:
+            session['active_team_uuid'] = str(team.uuid)
+        else:
+            session.pop('active_team_uuid', None)
+        session.save()
+
+    def _assert_plans(self, extra_params):
+        for sort in SORT_OPTIONS:
+            if sort in SEARCH_SORT_OPTIONS:
+                continue
+            with self.subTest(sort=sort, **extra_params):
+                sql = self._list_query({'sort': sort, **extra_params})
+                self.assertEqual(plan_problems(sql), [], sql)
+
+    def test_personal_scope_uses_indexes(self):
+        self._switch_team(None)
+        self._assert_plans({'page': 1})
+        self._assert_plans({'cursor': ''})
+
+    def test_team_scope_uses_indexes(self):
+        self._switch_team(self.team)
+        self._assert_plans({'page': 1})
+        self._assert_plans({'cursor': ''})
@@ -0,0 +1,103 @@
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.user.models import User
+from task_manager.user.preferences import set_preference
+
+
+class TaskListLayoutTestCase(TestCase):
+    """Tests for server-side layout selection and the rows fragment."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='rows_user', password='testpass123'
+        )
+        self.status = Status.objects.create(name='New', creator=self.user)
+        self.label = Label.objects.create(name='urgent', creator=self.user)
+        for i in range(3):
+            task = Task.objects.create(
+                name=f'Row task {i}', author=self.user, status=self.status
+            )
+            task.labels.add(self.label)
+            task.executors.add(self.user)
+        self.c = Client()
+        self.c.force_login(self.user)
+        self.list_url = reverse('tasks:tasks-list')
+        self.rows_url = reverse('tasks:tasks-rows')
+
+    def _m2m_queries(self, params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.c.get(self.list_url, params)
+        self.assertEqual(response.status_code, 200)
+        return [
+            query['sql'] for query in ctx.captured_queries
+            if 'tasks_task_labels' in query['sql']
+            or 'tasks_task_executors' in query['sql']
+        ]
+
+    def test_full_layout_renders_cards_only(self):
+        response = self.c.get(self.list_url)
+        self.assertEqual(response.context['view_mode'], 'full')
+        self.assertTemplateUsed(response, 'tasks/partials/task_row_full.html')
+        self.assertTemplateNotUsed(
+            response, 'tasks/partials/task_row_simple.html'
+        )
+        self.assertContains(response, 'urgent')
+        self.assertEqual(len(self._m2m_queries({})), 2)
+
+    def test_simple_layout_skips_labels_and_executors(self):
+        response = self.c.get(self.list_url, {'view_mode': 'simple'})
+        self.assertEqual(response.context['view_mode'], 'simple')
+        self.assertTemplateUsed(
+            response, 'tasks/partials/task_row_simple.html'
+        )
+        self.assertTemplateNotUsed(
+            response, 'tasks/partials/task_row_full.html'
+        )
+        self.assertEqual(self._m2m_queries({'view_mode': 'simple'}), [])
+
+    def test_unknown_view_mode_falls_back_to_full(self):
+        response = self.c.get(self.list_url, {'view_mode': 'table'})
+        self.assertEqual(response.context['view_mode'], 'full')
+
+    def test_rows_fragment_has_no_page_layout(self):
+        response = self.c.get(self.rows_url, {'view_mode': 'simple'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'tasks/partials/task_rows.html')
+        self.assertTemplateNotUsed(response, 'base.html')
+        self.assertContains(response, 'Row task 0')
+        self.assertNotContains(response, 'filter-form')
+        self.assertNotContains(response, '<html')
+
+    @override_settings(TASK_LIST_CURSOR_THRESHOLD=2)
+    def test_rows_fragment_follows_cursor(self):
+        Task.objects.bulk_create([
+            Task(name=f'Bulk {i}', author=self.user, status=self.status)
+            for i in range(50)
+        ])
+        first = self.c.get(self.list_url, {'cursor': ''})
+        page = first.context['page_obj']
+        self.assertContains(first, 'data-next-url=')
+
+        response = self.c.get(self.rows_url, {'cursor': page.next_cursor})
+        shown = {task.pk for task in response.context['page_obj']}
+        self.assertTrue(shown)
+        self.assertFalse(shown & {task.pk for task in page})
+
+    def test_rows_fragment_ignores_saved_filter_redirect(self):
+        set_preference(self.user.pk, 'task_filter_individual', {
+            'status': [str(self.status.pk)]
+        })
+
+        self.assertEqual(self.c.get(self.list_url).status_code, 302)
+        self.assertEqual(self.c.get(self.rows_url).status_code, 200)
+
+    def test_rows_fragment_requires_login(self):
+        self.c.logout()
+        response = self.c.get(self.rows_url)
+        self.assertEqual(response.status_code, 302)
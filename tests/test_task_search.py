@@ -0,0 +1,138 @@
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.tasks.search import (
+    FTS_TABLE,
+    ensure_sqlite_search_index,
+    search_tasks,
+)
+from task_manager.user.models import User
+
+
+class TaskSearchTestCase(TestCase):
+    """Tests for full-text task search and relevance sorting."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='search_user', password='testpass123'
+        )
+        self.status = Status.objects.create(name='New', creator=self.user)
+        self.c = Client()
+        self.c.force_login(self.user)
+        self.url = reverse('tasks:tasks-list')
+
+    def _task(self, name, description=''):
+        return Task.objects.create(
+            name=name, description=description,
+            author=self.user, status=self.status,
+        )
+
+    def _search(self, query):
+        return set(
+            search_tasks(Task.objects.all(), query)
+            .values_list('name', flat=True)
+        )
+
+    def test_matches_name_and_description(self):
+        self._task('Deploy backend', 'Roll out the release')
+        self._task('Write docs', 'Describe the deploy process')
+        self._task('Unrelated')
+        self.assertEqual(
+            self._search('deploy'), {'Deploy backend', 'Write docs'}
+        )
+
+    def test_prefix_case_insensitive_and_all_words(self):
+        self._task('Database migration', 'Postgres upgrade')
+        self._task('Database backup')
+        self.assertEqual(self._search('DATA'), {
+            'Database migration', 'Database backup'
+        })
+        self.assertEqual(
+            self._search('datab postgr'), {'Database migration'}
+        )
+
+    def test_cyrillic_query(self):
+        self._task('Обновить сервер', 'Перезапуск')
+        self.assertEqual(self._search('сервер'), {'Обновить сервер'})
+
+    def test_query_syntax_characters_are_ignored(self):
+        self._task('Fix login')
+        self.assertEqual(self._search('"login" (fix*'), {'Fix login'})
+        self.assertEqual(self._search('"*()'), set())
+
+    def test_index_follows_update_and_delete(self):
+        task = self._task('Old title')
+        task.name = 'New title'
+        task.save()
+        self.assertEqual(self._search('old'), set())
+        self.assertEqual(self._search('new'), {'New title'})
+
+        Task.objects.filter(pk=task.pk).update(description='bulk text')
+        self.assertEqual(self._search('bulk'), {'New title'})
+
+        task.delete()
+        self.assertEqual(self._search('new'), set())
+
+    def test_relevance_sort_puts_name_matches_first(self):
+        in_description = self._task('Other', 'mentions invoice once')
+        in_name = self._task('Invoice export')
+        response = self.c.get(
+            self.url, {'search': 'invoice', 'sort': '-search_rank'}
+        )
+        self.assertEqual(response.context['current_sort'], '-search_rank')
+        self.assertEqual(
+            [task.pk for task in response.context['object_list']],
+            [in_name.pk, in_description.pk],
+        )
+
+    def test_rank_is_read_from_the_one_match(self):
+        self._task('Deploy backend')
+        queryset = search_tasks(Task.objects.all(), 'deploy')
+        self.assertEqual(str(queryset.query).count(' MATCH '), 1)
+        self.assertGreater(queryset.get().search_rank, 0)
+
+    def test_relevance_sort_without_search_falls_back(self):
+        self._task('Anything')
+        response = self.c.get(self.url, {'sort': '-search_rank'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['current_sort'], '-created_at')
+        self.assertNotIn('-search_rank', response.context['sort_options'])
+
+    @override_settings(TASK_LIST_CURSOR_THRESHOLD=5)
+    def test_relevance_sort_with_cursor_pagination(self):
+        for i in range(12):
+            self._task(f'Report {i}', 'report ' * (i % 4))
+        params = {'search': 'report', 'sort': '-search_rank'}
+        seen = []
+        response = self.c.get(self.url, {**params, 'cursor': ''})
+        while True:
+            page = response.context['page_obj']
+            seen.extend(task.pk for task in page)
+            if not page.has_next():
+                break
+            response = self.c.get(
+                self.url, {**params, 'cursor': page.next_cursor}
+            )
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(len(set(seen)), 12)
+
+    @override_settings(TASK_SEARCH_BACKEND='basic')
+    def test_basic_backend_matches_substrings(self):
+        self._task('Preprocessing')
+        self.assertEqual(self._search('process'), {'Preprocessing'})
+
+    def test_missing_triggers_are_restored(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TRIGGER {FTS_TABLE}_ai')
+        self._task('Written without trigger')
+        self.assertEqual(self._search('trigger'), set())
+
+        ensure_sqlite_search_index(connection)
+        self.assertEqual(
+            self._search('trigger'), {'Written without trigger'}
+        )
+        self._task('Written with trigger')
+        self.assertEqual(len(self._search('written')), 2)
@@ -3,6 +3,7 @@ from task_manager.user.models import User
 from task_manager.teams.models import TeamMembership, Team
 from task_manager.statuses.models import Status
 from task_manager.labels.models import Label
+from task_manager.user.preferences import get_preference
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.utils.translation import gettext as _
@@ -10,16 +11,10 @@ from django.contrib.messages import get_messages
 import uuid
 
 
-def _get_filter_session_keys(session, team):
-    """Helper to get context-aware session keys for filter settings."""
-    if team:
-        suffix = str(team.uuid)
-    else:
-        suffix = 'individual'
-    return (
-        f'task_filter_params_{suffix}',
-        f'task_filter_enabled_{suffix}',
-    )
+def _get_saved_filter(user, team):
+    """Helper to get the default filter saved in the team context."""
+    suffix = str(team.uuid) if team else 'individual'
+    return get_preference(user.pk, f'task_filter_{suffix}', {})
 
 
 class TaskTestCase(TestCase):
@@ -1074,21 +1069,16 @@ class TaskTestCase(TestCase):
 
     # ========== SAVED FILTER TESTS ==========
 
-    def test_save_filter_to_session(self):
-        """Check that filter is saved to session when checkbox is checked"""
+    def test_save_filter_as_preference(self):
+        """Check that filter is saved as default when checkbox is checked"""
         response = self.c.get(
             reverse('tasks:tasks-list') + '?status=1&save_as_default=1',
             follow=True
         )
         self.assertEqual(response.status_code, 200)
 
-        # Check session contains saved filter (using context-aware keys)
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(session, self.team)
-        self.assertIn(filter_key, session)
-        self.assertIn(enabled_key, session)
-        self.assertTrue(session[enabled_key])
-        self.assertIn('status', session[filter_key])
+        # Check saved filter (context-aware)
+        self.assertIn('status', _get_saved_filter(self.user, self.team))
 
     def test_save_filter_shows_success_message(self):
         """Check that success message is shown when filter is saved"""
@@ -1156,10 +1146,8 @@ class TaskTestCase(TestCase):
             follow=True
         )
 
-        # Verify it's saved (using context-aware keys)
-        session = self.c.session
-        filter_key, enabled_key = _get_filter_session_keys(session, self.team)
-        self.assertIn(filter_key, session)
+        # Verify it's saved (context-aware)
+        self.assertTrue(_get_saved_filter(self.user, self.team))
 
         # Reset the filter
         self.c.get(
@@ -1167,10 +1155,8 @@ class TaskTestCase(TestCase):
             follow=True
         )
 
-        # Check session is cleared
-        session = self.c.session
-        self.assertNotIn(filter_key, session)
-        self.assertNotIn(enabled_key, session)
+        # Check saved filter is cleared
+        self.assertEqual(_get_saved_filter(self.user, self.team), {})
 
     def test_reset_default_with_show_filter_keeps_panel_open(self):
         # Save a filter
@@ -1246,9 +1232,7 @@ class TaskTestCase(TestCase):
         query_params = '?status=1&show_filter=1&save_as_default=1'
         self.c.get(url + query_params, follow=True)
 
-        session = self.c.session
-        filter_key, _ = _get_filter_session_keys(session, self.team)
-        saved_params = session.get(filter_key, {})
+        saved_params = _get_saved_filter(self.user, self.team)
 
         # Service params should NOT be in saved filter
         self.assertNotIn('show_filter', saved_params)
@@ -1263,9 +1247,7 @@ class TaskTestCase(TestCase):
         query_params = '?status=1&executors=&save_as_default=1'
         self.c.get(url + query_params, follow=True)
 
-        session = self.c.session
-        filter_key, _ = _get_filter_session_keys(session, self.team)
-        saved_params = session.get(filter_key, {})
+        saved_params = _get_saved_filter(self.user, self.team)
 
         # Non-empty param should be saved
         self.assertIn('status', saved_params)
@@ -1312,9 +1294,7 @@ class TaskTestCase(TestCase):
         params = '?status=1&executors=1&self_tasks=on&save_as_default=1'
         self.c.get(url + params, follow=True)
 
-        session = self.c.session
-        filter_key, _ = _get_filter_session_keys(session, self.team)
-        saved_params = session.get(filter_key, {})
+        saved_params = _get_saved_filter(self.user, self.team)
 
         self.assertIn('status', saved_params)
         self.assertIn('executors', saved_params)
@@ -1322,7 +1302,7 @@ class TaskTestCase(TestCase):
 
     def test_saved_filter_persists_across_requests(self):
         """Check that saved filter persists
-          in session across multiple requests"""
+          across multiple requests"""
         # Save filter
         self.c.get(
             reverse('tasks:tasks-list') + '?status=1&save_as_default=1',
@@ -1377,10 +1357,7 @@ class TaskTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        # Check session contains saved filter (using context-aware keys)
-        session = self.c.session
-        filter_key, _ = _get_filter_session_keys(session, self.team)
-        saved_params = session.get(filter_key, {})
+        saved_params = _get_saved_filter(self.user, self.team)
 
         # view_mode should NOT be in saved filter params
         self.assertNotIn('view_mode', saved_params)
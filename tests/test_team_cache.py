@@ -0,0 +1,208 @@
+from unittest.mock import patch
+
+import fakeredis
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager import team_cache
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.teams.models import Team, TeamMembership
+from task_manager.user.models import User
+
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TeamCacheTest(TestCase):
+    """Tests for generation-keyed team cache entries."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cache_user')
+        self.team = Team.objects.create(name='Cache team', password='pwd')
+        self.scope = team_cache.team_scope(self.team.pk)
+
+    def test_bump_on_commit_changes_generation(self):
+        generation = team_cache.get_generation(self.scope)
+        self.assertEqual(team_cache.get_generation(self.scope), generation)
+        with self.captureOnCommitCallbacks(execute=True):
+            team_cache.bump_generation(self.scope)
+            # Not before the change is visible to readers
+            self.assertEqual(
+                team_cache.get_generation(self.scope), generation
+            )
+        self.assertEqual(
+            team_cache.get_generation(self.scope), generation + 1
+        )
+
+    def test_get_or_set_recomputes_after_bump(self):
+        values = iter([1, 2])
+        self.assertEqual(
+            team_cache.get_or_set(self.scope, 'value', values.__next__), 1
+        )
+        self.assertEqual(
+            team_cache.get_or_set(self.scope, 'value', values.__next__), 1
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            team_cache.bump_generation(self.scope)
+        self.assertEqual(
+            team_cache.get_or_set(self.scope, 'value', values.__next__), 2
+        )
+
+    def test_scopes_are_independent(self):
+        other = team_cache.user_scope(self.user.pk)
+        team_cache.get_or_set(self.scope, 'value', lambda: 'team')
+        self.assertEqual(
+            team_cache.get_or_set(other, 'value', lambda: 'user'), 'user'
+        )
+
+    def test_none_is_cached(self):
+        calls = []
+        for _ in range(2):
+            team_cache.get_or_set(
+                self.scope, 'none', lambda: calls.append(1)
+            )
+        self.assertEqual(len(calls), 1)
+
+    def _changes_generation(self, scope, change):
+        generation = team_cache.get_generation(scope)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        return team_cache.get_generation(scope) != generation
+
+    def test_team_rows_bump_the_team(self):
+        self.assertTrue(self._changes_generation(
+            self.scope,
+            lambda: Status.objects.create(
+                name='Cached', team=self.team, creator=self.user
+            ),
+        ))
+        self.assertTrue(self._changes_generation(
+            self.scope,
+            lambda: TeamMembership.objects.create(
+                user=self.user, team=self.team, role='member'
+            ),
+        ))
+
+    def test_memberships_bump_the_member(self):
+        self.assertTrue(self._changes_generation(
+            team_cache.user_scope(self.user.pk),
+            lambda: TeamMembership.objects.create(
+                user=self.user, team=self.team, role='member'
+            ),
+        ))
+
+    def test_personal_rows_bump_the_owner(self):
+        scope = team_cache.user_scope(self.user.pk)
+        label = Label.objects.create(name='Mine', creator=self.user)
+        self.assertTrue(self._changes_generation(scope, label.delete))
+        self.assertFalse(self._changes_generation(
+            self.scope,
+            lambda: Label.objects.create(name='Mine', creator=self.user),
+        ))
+
+    def test_executor_changes_bump_the_team_of_the_task(self):
+        status = Status.objects.create(
+            name='Open', team=self.team, creator=self.user
+        )
+        task = Task.objects.create(
+            name='Cached task', status=status, author=self.user,
+            team=self.team,
+        )
+        self.assertTrue(self._changes_generation(
+            self.scope, lambda: task.executors.add(self.user)
+        ))
+        self.assertTrue(self._changes_generation(
+            self.scope, self.user.executor_tasks.clear
+        ))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CachedListViewsTest(TestCase):
+    """Tests for list views served from the team cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cached_views')
+        self.client.force_login(self.user)
+
+    def test_status_list_is_cached_until_a_status_changes(self):
+        status = Status.objects.create(name='Before', creator=self.user)
+        url = reverse('statuses:statuses-list')
+        self.assertContains(self.client.get(url), 'Before')
+
+        # update() sends no signals, so the cached list is still used
+        Status.objects.filter(pk=status.pk).update(name='Hidden')
+        self.assertContains(self.client.get(url), 'Before')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Status.objects.create(name='Another', creator=self.user)
+        response = self.client.get(url)
+        self.assertContains(response, 'Hidden')
+        self.assertContains(response, 'Another')
+
+    def test_label_list_is_cached(self):
+        Label.objects.create(name='Cached label', creator=self.user)
+        url = reverse('labels:labels-list')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        # Only counted, for the ETag (see conditional.py)
+        self.assertFalse([
+            query for query in queries
+            if 'labels_label' in query['sql']
+            and not query['sql'].startswith('SELECT COUNT(')
+        ])
+        self.assertContains(response, 'Cached label')
+        self.assertEqual(len(response.context['label_list']), 1)
+
+
+class SharedCacheTest(TestCase):
+    """
+    Generations kept in a Redis-protocol server are shared by processes:
+    each process below is its own cache client of one fakeredis server.
+    """
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        self.scope = team_cache.team_scope(1)
+
+    def _process_cache(self):
+        with override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                'LOCATION': 'redis://shared',
+                'OPTIONS': {
+                    'connection_class': fakeredis.FakeConnection,
+                    'server': self.server,
+                },
+            },
+        }):
+            return caches.create_connection('default')
+
+    def test_bumps_reach_other_processes(self):
+        reader, writer = self._process_cache(), self._process_cache()
+        self.assertIsNot(reader, writer)
+        with patch.object(team_cache, 'cache', reader):
+            self.assertEqual(
+                team_cache.get_or_set(self.scope, 'names', lambda: 'old'),
+                'old',
+            )
+        with patch.object(team_cache, 'cache', writer):
+            with self.captureOnCommitCallbacks(execute=True):
+                team_cache.bump_generation(self.scope)
+        with patch.object(team_cache, 'cache', reader):
+            self.assertEqual(
+                team_cache.get_or_set(self.scope, 'names', lambda: 'new'),
+                'new',
+            )
@@ -1,7 +1,9 @@
-from django.test import TestCase, RequestFactory
-from unittest.mock import Mock, patch
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from unittest.mock import Mock
 from task_manager.middleware.team_middleware import ActiveTeamMiddleware
-from task_manager.teams.models import TeamMembership
+from task_manager.teams.models import Team, TeamMembership
+from task_manager.user.models import User
 
 
 class ActiveTeamMiddlewareTest(TestCase):
@@ -32,49 +34,153 @@ class ActiveTeamMiddlewareTest(TestCase):
         # active_team should be none
         self.assertIsNone(request.active_team)
 
-    @patch('task_manager.middleware.team_middleware.TeamMembership.objects.get')
-    def test_authenticated_valid_team(self, mock_get):
-        # test case: user logged in and has valid team
+    def _team_request(self, user, team_uuid):
         request = self.factory.get('/')
-        request.user = Mock()
-        request.user.is_authenticated = True
-        request.session = {
-            'active_team_uuid': '550e8400-e29b-41d4-a716-446655440030'
-        }
+        request.user = user
+        request.session = {'active_team_uuid': str(team_uuid)}
+        return request
 
-        # mock database returning a membership with a team
-        mock_membership = Mock()
-        mock_team = Mock()
-        mock_membership.team = mock_team
-        mock_get.return_value = mock_membership
+    def test_authenticated_valid_team(self):
+        # test case: user logged in and has valid team
+        user = User.objects.create_user(username='middleware_member')
+        team = Team.objects.create(name='Middleware team', password='pwd')
+        TeamMembership.objects.create(
+            user=user, team=team, role='admin', status='active'
+        )
+        request = self._team_request(user, team.uuid)
 
         self.middleware.process_request(request)
 
-        # active_team should be the mocked team
-        self.assertEqual(request.active_team, mock_team)
-        # verify get was called with correct args
-        mock_get.assert_called_with(
-            team__uuid='550e8400-e29b-41d4-a716-446655440030',
-            user=request.user,
-            status='active'
-        )
+        # active_team should be the membership's team, with the role
+        self.assertEqual(request.active_team, team)
+        self.assertEqual(request.active_team.uuid, team.uuid)
+        self.assertEqual(request.active_team.name, team.name)
+        self.assertEqual(request.active_team_role, 'admin')
 
-    @patch('task_manager.middleware.team_middleware.TeamMembership.objects.get')
-    def test_authenticated_invalid_team(self, mock_get):
+    def test_authenticated_invalid_team(self):
         # test case: team in session does not exist (triggers exception)
-        request = self.factory.get('/')
-        request.user = Mock()
-        request.user.is_authenticated = True
-        request.session = {
-            'active_team_uuid': '550e8400-e29b-41d4-a716-446655440099'
-        }
-
-        # mock database raising DoesNotExist
-        mock_get.side_effect = TeamMembership.DoesNotExist
+        user = User.objects.create_user(username='middleware_member')
+        request = self._team_request(
+            user, '550e8400-e29b-41d4-a716-446655440099'
+        )
 
         self.middleware.process_request(request)
 
         # active_team should be none
         self.assertIsNone(request.active_team)
+        self.assertIsNone(request.active_team_role)
         # verify session key was removed
         self.assertNotIn('active_team_uuid', request.session)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class ActiveTeamFreshnessTest(TestCase):
+    """With a per-process cache the membership is read on every request."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = ActiveTeamMiddleware(get_response=Mock())
+        self.user = User.objects.create_user(username='fresh_member')
+        self.team = Team.objects.create(name='Fresh team', password='pwd')
+        self.membership = TeamMembership.objects.create(
+            user=self.user, team=self.team, role='admin', status='active'
+        )
+
+    def _resolve(self):
+        request = self.factory.get('/')
+        request.user = self.user
+        request.session = {'active_team_uuid': str(self.team.uuid)}
+        self.middleware.process_request(request)
+        return request
+
+    def test_membership_costs_one_query(self):
+        self._resolve()
+        with self.assertNumQueries(1):
+            request = self._resolve()
+        self.assertEqual(request.active_team.pk, self.team.pk)
+        self.assertEqual(request.active_team_role, 'admin')
+
+    def test_role_change_applies_at_once(self):
+        self._resolve()
+        # update() sends no signals: nothing could invalidate a cache
+        TeamMembership.objects.filter(pk=self.membership.pk).update(
+            role='member'
+        )
+        self.assertEqual(self._resolve().active_team_role, 'member')
+
+    def test_membership_removal_applies_at_once(self):
+        self._resolve()
+        TeamMembership.objects.filter(pk=self.membership.pk).delete()
+        self.assertIsNone(self._resolve().active_team)
+
+    def test_team_rename_applies_at_once(self):
+        self._resolve()
+        Team.objects.filter(pk=self.team.pk).update(name='Renamed team')
+        self.assertEqual(self._resolve().active_team.name, 'Renamed team')
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    },
+    CACHE_SHARED=True,
+)
+class ActiveTeamCacheTest(TestCase):
+    """With a shared cache the membership is cached and invalidated."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = ActiveTeamMiddleware(get_response=Mock())
+        self.user = User.objects.create_user(username='cached_member')
+        self.team = Team.objects.create(name='Cached team', password='pwd')
+        self.membership = TeamMembership.objects.create(
+            user=self.user, team=self.team, role='admin', status='active'
+        )
+
+    def _resolve(self):
+        request = self.factory.get('/')
+        request.user = self.user
+        request.session = {'active_team_uuid': str(self.team.uuid)}
+        self.middleware.process_request(request)
+        return request
+
+    def test_second_request_costs_no_query(self):
+        self._resolve()
+        with self.assertNumQueries(0):
+            request = self._resolve()
+        self.assertEqual(request.active_team.pk, self.team.pk)
+        self.assertEqual(request.active_team_role, 'admin')
+
+    def test_role_change_invalidates_on_commit(self):
+        self._resolve()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.membership.role = 'member'
+            self.membership.save()
+            # Not before the change is visible to other requests
+            self.assertEqual(self._resolve().active_team_role, 'admin')
+        self.assertEqual(self._resolve().active_team_role, 'member')
+
+    def test_membership_removal_invalidates(self):
+        self._resolve()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.membership.delete()
+        self.assertIsNone(self._resolve().active_team)
+
+    def test_team_rename_invalidates(self):
+        self._resolve()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.name = 'Renamed team'
+            self.team.save()
+        self.assertEqual(self._resolve().active_team.name, 'Renamed team')
+
+    def test_team_delete_invalidates(self):
+        self._resolve()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.delete()
+        self.assertIsNone(self._resolve().active_team)
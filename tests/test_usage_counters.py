@@ -0,0 +1,185 @@
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.limit_service import LimitService
+from task_manager.models import UsageCounter
+from task_manager.notes.models import Note
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.teams.models import Team, TeamMembership
+from task_manager.usage import count_usage, find_usage_drift
+from task_manager.user.models import User
+
+
+class UsageCountersTestCase(TestCase):
+    """Tests for the materialized usage counters behind LimitService."""
+
+    fixtures = [
+        "tests/fixtures/test_users.json",
+        "tests/fixtures/test_teams.json",
+        "tests/fixtures/test_teams_memberships.json",
+        "tests/fixtures/test_statuses.json",
+        "tests/fixtures/test_tasks.json",
+        "tests/fixtures/test_labels.json",
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(username='me')
+        self.other = User.objects.exclude(pk=self.user.pk).first()
+        self.team = Team.objects.create(name='Usage team', password='pwd')
+        TeamMembership.objects.create(
+            user=self.user, team=self.team, role='admin', status='active'
+        )
+        self.status = Status.objects.create(name='Open', creator=self.user)
+
+    def _user_count(self, resource, user=None):
+        return LimitService(user or self.user)._user_usage(resource)[resource]
+
+    def _team_count(self, resource):
+        return LimitService(self.user)._team_usage(
+            self.team, resource
+        )[resource]
+
+    def assertInSync(self):
+        changed, created = find_usage_drift(apps.get_model)
+        self.assertEqual((changed, created), ([], []))
+
+    def test_fixtures_and_setup_are_counted(self):
+        self.assertInSync()
+        self.assertEqual(
+            self._user_count('tasks'),
+            Task.objects.filter(author=self.user).count(),
+        )
+
+    def test_task_create_move_delete(self):
+        tasks_before = self._user_count('tasks')
+        task = Task.objects.create(
+            name='Counted', author=self.user, status=self.status
+        )
+        self.assertEqual(self._user_count('tasks'), tasks_before + 1)
+        self.assertEqual(self._team_count('tasks'), 0)
+
+        task = Task.objects.get(pk=task.pk)
+        task.team = self.team
+        task.save()
+        self.assertEqual(self._user_count('tasks'), tasks_before + 1)
+        self.assertEqual(self._team_count('tasks'), 1)
+
+        task.author = self.other
+        task.save(update_fields=['author'])
+        self.assertEqual(self._user_count('tasks'), tasks_before)
+
+        task.delete()
+        self.assertEqual(self._team_count('tasks'), 0)
+        self.assertInSync()
+
+    def test_personal_and_team_resources(self):
+        Label.objects.create(name='Mine', creator=self.user)
+        Label.objects.create(name='Ours', creator=self.user, team=self.team)
+        Status.objects.create(name='Ours', creator=self.user, team=self.team)
+        note = Note.objects.create(content='Text', author=self.user)
+
+        self.assertEqual(self._team_count('team_labels'), 1)
+        self.assertEqual(self._team_count('team_statuses'), 1)
+        self.assertEqual(self._user_count('personal_notes'), 1)
+
+        note = Note.objects.get(pk=note.pk)
+        note.team = self.team
+        note.save()
+        self.assertEqual(self._user_count('personal_notes'), 0)
+        self.assertEqual(self._team_count('team_notes'), 1)
+        self.assertInSync()
+
+    def test_membership_role_and_status(self):
+        membership = TeamMembership.objects.create(
+            user=self.other, team=self.team, role='member', status='pending'
+        )
+        teams_before = self._user_count('teams', self.other)
+        self.assertEqual(self._team_count('team_members'), 1)
+
+        membership = TeamMembership.objects.get(pk=membership.pk)
+        membership.status = 'active'
+        membership.role = 'admin'
+        membership.save()
+        self.assertEqual(self._team_count('team_members'), 2)
+        self.assertEqual(
+            self._user_count('teams', self.other), teams_before + 1
+        )
+
+        membership.delete()
+        self.assertEqual(self._team_count('team_members'), 1)
+        self.assertEqual(self._user_count('teams', self.other), teams_before)
+        self.assertInSync()
+
+    def test_bulk_create_is_counted(self):
+        Status.objects.bulk_create([
+            Status(name=f'Bulk {i}', creator=self.user, team=self.team)
+            for i in range(3)
+        ])
+        self.assertEqual(self._team_count('team_statuses'), 3)
+        self.assertInSync()
+
+    def test_team_delete_removes_team_counters(self):
+        Task.objects.create(
+            name='Team task', author=self.user, team=self.team,
+            status=self.status,
+        )
+        team_pk = self.team.pk
+        self.team.delete()
+        self.assertFalse(UsageCounter.objects.filter(team_id=team_pk).exists())
+        self.assertInSync()
+
+    def test_checks_and_summary_read_counters_once(self):
+        service = LimitService(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            service.get_usage_summary()
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn(
+            'task_manager_usagecounter', ctx.captured_queries[0]['sql']
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            service.get_team_usage_summary(self.team)
+            service.can_create_task()
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_limits_context_does_not_count_resources(self):
+        c = Client()
+        c.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            c.get(reverse('user:user-list'))
+        count_queries = [
+            q['sql'] for q in ctx.captured_queries
+            if 'COUNT(' in q['sql'] and 'tasks_task' in q['sql']
+        ]
+        self.assertEqual(count_queries, [])
+
+    def test_reconcile_command_fixes_drift(self):
+        Task.objects.filter(author=self.user).update(author=self.other)
+        UsageCounter.objects.filter(
+            team=self.team, resource='team_members'
+        ).delete()
+
+        out = StringIO()
+        call_command('reconcile_usage_counters', '--dry-run', stdout=out)
+        self.assertIn('Found 3 drifted', out.getvalue())
+
+        out = StringIO()
+        call_command('reconcile_usage_counters', stdout=out)
+        self.assertIn('Repaired 3 drifted', out.getvalue())
+        self.assertInSync()
+        self.assertEqual(self._user_count('tasks'), 0)
+        self.assertEqual(self._team_count('team_members'), 1)
+
+    def test_count_usage_skips_ownerless_rows(self):
+        Label.objects.create(name='Orphan', creator=None)
+        self.assertNotIn(
+            ('user', None, 'personal_labels'), count_usage(apps.get_model)
+        )
@@ -0,0 +1,145 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.statuses.models import Status
+from task_manager.user import preferences
+from task_manager.user.models import User, UserPreference
+from task_manager.user.preferences import (
+    delete_preference,
+    get_preference,
+    set_preference,
+)
+
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, CACHE_SHARED=True)
+class UserPreferenceTest(TestCase):
+    """Tests for preferences read through the cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='pref_user')
+
+    def test_preferences_are_read_once(self):
+        UserPreference.objects.create(
+            user=self.user, key='theme', value='dark'
+        )
+        self.assertEqual(get_preference(self.user.pk, 'theme'), 'dark')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_preference(self.user.pk, 'theme'), 'dark')
+            self.assertIsNone(get_preference(self.user.pk, 'missing'))
+
+    def test_changes_are_read_after_commit(self):
+        self.assertIsNone(get_preference(self.user.pk, 'theme'))
+        with self.captureOnCommitCallbacks(execute=True):
+            set_preference(self.user.pk, 'theme', 'dark')
+        self.assertEqual(get_preference(self.user.pk, 'theme'), 'dark')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_preference(self.user.pk, 'theme')
+        self.assertIsNone(get_preference(self.user.pk, 'theme'))
+        self.assertFalse(UserPreference.objects.exists())
+
+    def test_deleting_a_missing_preference_keeps_the_cache(self):
+        get_preference(self.user.pk, 'theme')
+        with self.captureOnCommitCallbacks() as callbacks:
+            delete_preference(self.user.pk, 'theme')
+        self.assertEqual(callbacks, [])
+
+    def test_deleting_does_not_trust_the_cache(self):
+        get_preference(self.user.pk, 'theme')
+        # Saved by another process since the preferences were cached
+        UserPreference.objects.create(
+            user=self.user, key='theme', value='dark'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_preference(self.user.pk, 'theme')
+        self.assertFalse(UserPreference.objects.exists())
+
+    def test_preferences_loaded_before_a_commit_are_not_read(self):
+        # A read misses and loads, then a change is committed before the
+        # read caches what it loaded
+        key = preferences._cache_key(self.user.pk)
+        loaded = preferences._load_preferences(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            set_preference(self.user.pk, 'theme', 'dark')
+        cache.set(key, loaded)
+        self.assertEqual(get_preference(self.user.pk, 'theme'), 'dark')
+
+    @override_settings(CACHE_SHARED=False)
+    def test_preferences_are_not_cached_per_process(self):
+        get_preference(self.user.pk, 'theme')
+        UserPreference.objects.create(
+            user=self.user, key='theme', value='dark'
+        )
+        self.assertEqual(get_preference(self.user.pk, 'theme'), 'dark')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SessionWritesTest(TestCase):
+    """Tests that browsing lists does not write the session."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='session_user')
+        self.status = Status.objects.create(name='Open', creator=self.user)
+        self.client.force_login(self.user)
+        self.url = reverse('tasks:tasks-list')
+
+    def _session_writes(self, *args, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(*args, **kwargs)
+        return response, [
+            query['sql'] for query in queries
+            if 'django_session' in query['sql']
+            and not query['sql'].startswith('SELECT')
+        ]
+
+    def test_default_filter_is_a_preference(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response, writes = self._session_writes(self.url, {
+                'status': self.status.pk, 'save_as_default': 'on',
+            })
+        self.assertEqual(writes, [])
+        self.assertEqual(
+            get_preference(self.user.pk, 'task_filter_individual'),
+            {'status': [str(self.status.pk)]},
+        )
+
+        response, writes = self._session_writes(self.url)
+        self.assertEqual(writes, [])
+        self.assertRedirects(
+            response, f'{self.url}?status={self.status.pk}',
+            fetch_redirect_response=False,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response, writes = self._session_writes(
+                self.url, {'reset_default': '1'}
+            )
+        self.assertEqual(writes, [])
+        self.assertIsNone(
+            get_preference(self.user.pk, 'task_filter_individual')
+        )
+
+    def test_browsing_lists_writes_no_session(self):
+        for url in (
+            self.url,
+            reverse('statuses:statuses-list'),
+            reverse('labels:labels-list'),
+            reverse('notes:note-list'),
+            reverse('index'),
+        ):
+            with self.subTest(url=url):
+                response, writes = self._session_writes(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(writes, [])